@@ -0,0 +1,214 @@
+import java.io.*;
+import java.util.*;
+
+import edu.stanford.nlp.ling.Label;
+import edu.stanford.nlp.trees.Tree;
+import edu.stanford.nlp.trees.TreeReader;
+import edu.stanford.nlp.trees.TreeReaderFactory;
+import edu.stanford.nlp.trees.tregex.TregexMatcher;
+import edu.stanford.nlp.trees.tregex.TregexPattern;
+import edu.stanford.nlp.trees.tregex.TregexPatternCompiler;
+import edu.stanford.nlp.util.IdentityHashSet;
+
+/**
+ * A long-running Tregex process for corpkit, so that the JVM only starts
+ * once. Requests come in on stdin, either trees as text:
+ *
+ *   BATCH npatterns nlines
+ *   options separated by spaces, a tab, then the pattern   (npatterns lines)
+ *   bracketed trees                                        (nlines lines)
+ *
+ * or files and directories to read trees from:
+ *
+ *   FILES npatterns npaths
+ *   options separated by spaces, a tab, then the pattern   (npatterns lines)
+ *   paths                                                  (npaths lines)
+ *
+ * For each pattern, in order, the reply is either "RESULT n" followed by n
+ * lines of output, formatted as TregexPattern's command line tool would, or
+ * "ERROR message". The reply ends with "DONE".
+ *
+ * Supported options: -o -t -u -s -w -n -C -f, and -spans, which prints
+ * each match as tab separated fields: file, tree number, first leaf, leaf
+ * after the last, the match and the whole sentence.
+ */
+public class TregexServer {
+
+  public static void main(String[] args) throws IOException {
+    BufferedReader in = new BufferedReader(new InputStreamReader(System.in, "UTF-8"));
+    PrintWriter out = new PrintWriter(new BufferedWriter(new OutputStreamWriter(System.out, "UTF-8")));
+    TregexPatternCompiler compiler = new TregexPatternCompiler();
+    TreeReaderFactory trf = new TregexPattern.TRegexTreeReaderFactory();
+    out.println("READY");
+    out.flush();
+
+    String header;
+    while ((header = in.readLine()) != null) {
+      String[] bits = header.split(" ");
+      if (bits.length != 3 || !(bits[0].equals("BATCH") || bits[0].equals("FILES"))) {
+        out.println("ERROR bad request");
+        out.println("DONE");
+        out.flush();
+        continue;
+      }
+      int npatterns = Integer.parseInt(bits[1]);
+      int nlines = Integer.parseInt(bits[2]);
+      String[] options = new String[npatterns];
+      String[] patterns = new String[npatterns];
+      for (int i = 0; i < npatterns; i++) {
+        String line = in.readLine();
+        int tab = line.indexOf('\t');
+        options[i] = line.substring(0, tab);
+        patterns[i] = line.substring(tab + 1);
+      }
+
+      List<Tree> trees = new ArrayList<Tree>();
+      List<String> sources = new ArrayList<String>();
+      if (bits[0].equals("BATCH")) {
+        StringBuilder text = new StringBuilder();
+        for (int i = 0; i < nlines; i++) {
+          text.append(in.readLine()).append('\n');
+        }
+        readTrees(trf, new StringReader(text.toString()), "", trees, sources);
+      } else {
+        List<File> files = new ArrayList<File>();
+        for (int i = 0; i < nlines; i++) {
+          listFiles(new File(in.readLine()), files);
+        }
+        for (File file : files) {
+          Reader reader = new InputStreamReader(new FileInputStream(file), "UTF-8");
+          try {
+            readTrees(trf, reader, file.getPath(), trees, sources);
+          } finally {
+            reader.close();
+          }
+        }
+      }
+
+      for (int i = 0; i < npatterns; i++) {
+        List<String> lines = new ArrayList<String>();
+        try {
+          search(compiler.compile(patterns[i]), trees, sources, options[i], lines);
+        } catch (Exception e) {
+          out.println("ERROR " + String.valueOf(e.getMessage()).replace('\n', ' '));
+          continue;
+        }
+        out.println("RESULT " + lines.size());
+        for (String line : lines) {
+          out.println(line);
+        }
+      }
+      out.println("DONE");
+      out.flush();
+    }
+  }
+
+  static void readTrees(TreeReaderFactory trf, Reader text, String source,
+                        List<Tree> trees, List<String> sources) throws IOException {
+    TreeReader reader = trf.newTreeReader(text);
+    Tree tree;
+    while ((tree = reader.readTree()) != null) {
+      trees.add(tree);
+      sources.add(source);
+    }
+  }
+
+  /**
+   * Files under a path, in order, as Tregex's DiskTreebank would read them
+   */
+  static void listFiles(File path, List<File> files) {
+    if (!path.isDirectory()) {
+      files.add(path);
+      return;
+    }
+    File[] children = path.listFiles();
+    if (children == null) {
+      return;
+    }
+    Arrays.sort(children);
+    for (File child : children) {
+      listFiles(child, files);
+    }
+  }
+
+  static String words(Tree tree) {
+    StringBuilder sb = new StringBuilder();
+    for (Label leaf : tree.yield()) {
+      if (sb.length() > 0) {
+        sb.append(' ');
+      }
+      sb.append(leaf.value());
+    }
+    return sb.toString();
+  }
+
+  /**
+   * Search trees the way TregexPattern's TRegexTreeVisitor does
+   */
+  static void search(TregexPattern pattern, List<Tree> trees, List<String> sources,
+                     String options, List<String> lines) {
+    Set<String> opts = new HashSet<String>(Arrays.asList(options.split(" ")));
+    boolean once = opts.contains("-o");
+    boolean words = opts.contains("-t");
+    boolean label = opts.contains("-u");
+    boolean whole = opts.contains("-w");
+    boolean number = opts.contains("-n");
+    boolean count = opts.contains("-C");
+    boolean filenames = opts.contains("-f");
+    boolean spans = opts.contains("-spans");
+
+    int total = 0;
+    int treeNumber = 0;
+    for (int i = 0; i < trees.size(); i++) {
+      Tree tree = trees.get(i);
+      String source = sources.get(i);
+      // trees are numbered from 1 in each file
+      treeNumber = i > 0 && source.equals(sources.get(i - 1)) ? treeNumber + 1 : 1;
+      TregexMatcher matcher = pattern.matcher(tree);
+      Set<Tree> seen = new IdentityHashSet<Tree>();
+      Map<Tree, Integer> leafIndex = null;
+      String sentence = null;
+      while (matcher.find()) {
+        Tree match = matcher.getMatch();
+        if (once && !seen.add(match)) {
+          continue;
+        }
+        total++;
+        if (count) {
+          continue;
+        }
+        Tree shown = whole && !spans ? tree : match;
+        String text;
+        if (label) {
+          text = shown.label().value();
+        } else if (words) {
+          text = words(shown);
+        } else {
+          text = shown.toString();
+        }
+        if (spans) {
+          if (leafIndex == null) {
+            leafIndex = new IdentityHashMap<Tree, Integer>();
+            for (Tree leaf : tree.getLeaves()) {
+              leafIndex.put(leaf, leafIndex.size());
+            }
+            sentence = words(tree);
+          }
+          List<Tree> leaves = match.getLeaves();
+          int start = leafIndex.get(leaves.get(0));
+          int end = leafIndex.get(leaves.get(leaves.size() - 1)) + 1;
+          lines.add(source + "\t" + treeNumber + "\t" + start + "\t"
+                    + end + "\t" + text + "\t" + sentence);
+          continue;
+        }
+        if (filenames) {
+          lines.add("# " + source);
+        }
+        lines.add(number ? treeNumber + ": " + text : text);
+      }
+    }
+    if (count) {
+      lines.add(String.valueOf(total));
+    }
+  }
+}
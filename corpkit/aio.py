@@ -0,0 +1,143 @@
+"""
+corpkit: interrogate corpora from asyncio code without blocking the event loop
+
+Needs Python 3.5 or newer. Usually used through
+:func:`~corpkit.corpus.Corpus.ainterrogate` and
+:func:`~corpkit.corpus.Corpus.ainterrogate_stream`.
+"""
+
+import asyncio
+
+class SubcorpusResult(object):
+    """
+    Results for one finished subcorpus of a running interrogation
+
+    :ivar name: Name of the subcorpus
+    :ivar results: ``{name: Counter}``. When using `subcorpora` to group by
+                   metadata, the counts so far for each metadata value found
+                   in this subcorpus
+    :ivar concordance: New concordance lines as a `DataFrame`, or `None`
+    """
+
+    def __init__(self, name, results, concordance):
+        self.name = name
+        self.results = results
+        self.concordance = concordance
+
+    def __repr__(self):
+        nconc = 0 if self.concordance is None else len(self.concordance)
+        return "<%s: %s, %d results, %d conc lines>" % \
+            (self.__class__.__name__, self.name,
+             sum(len(v) for v in self.results.values()), nconc)
+
+class InterrogationStream(object):
+    """
+    An interrogation running in an executor, which can be iterated over with
+    ``async for`` to get a :class:`SubcorpusResult` as each subcorpus finishes.
+
+    >>> stream = corpus.ainterrogate_stream({'w': r'^c'}, conc=True)
+    >>> async for part in stream:
+    ...     show(part.results, part.concordance)
+    >>> interro = await stream.result()
+
+    Cancelling the task that is waiting on the stream, or calling
+    :func:`cancel`, stops the interrogation after the file being searched.
+
+    :param corpus: Corpus to interrogate
+    :type corpus: :class:`corpkit.corpus.Corpus`
+
+    :param executor: Where to run the interrogation (default: the event loop's
+                     thread pool). With a ``ProcessPoolExecutor``, there are
+                     no partial results, and a started interrogation can't
+                     be cancelled.
+    :type executor: `concurrent.futures.Executor`
+    """
+
+    def __init__(self, corpus, args=(), kwargs=None, executor=None):
+        import threading
+        self.corpus = corpus
+        self.args = args
+        self.kwargs = dict(kwargs or {})
+        self.executor = executor
+        self.stopper = threading.Event()
+        self.future = None
+        self.queue = None
+        self.finished = False
+
+    def start(self):
+        """
+        Start interrogating, if not started already
+        """
+        import functools
+        from concurrent.futures import ProcessPoolExecutor
+        if self.future is not None:
+            return self
+        loop = asyncio.get_event_loop()
+        self.queue = asyncio.Queue()
+        kwargs = dict(self.kwargs)
+        if not isinstance(self.executor, ProcessPoolExecutor):
+            def on_subcorpus(name, results, concordance):
+                part = SubcorpusResult(name, results, concordance)
+                loop.call_soon_threadsafe(self.queue.put_nowait, part)
+            kwargs['on_subcorpus'] = on_subcorpus
+            kwargs['cancel'] = self.stopper
+        job = functools.partial(self.corpus.interrogate, *self.args, **kwargs)
+        self.future = loop.run_in_executor(self.executor, job)
+        self.future.add_done_callback(lambda _: self.queue.put_nowait(None))
+        return self
+
+    def cancel(self):
+        """
+        Stop the interrogation
+        """
+        self.stopper.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def __aiter__(self):
+        self.start()
+        return self
+
+    async def __anext__(self):
+        if self.finished:
+            raise StopAsyncIteration
+        try:
+            part = await self.start().queue.get()
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+        if part is None:
+            self.finished = True
+            # raise any error from the interrogation
+            if not self.future.cancelled():
+                self.future.result()
+            raise StopAsyncIteration
+        return part
+
+    async def result(self):
+        """
+        Wait for the whole interrogation
+
+        :returns: :class:`corpkit.interrogation.Interrogation`, or `None`
+                  if cancelled
+        """
+        try:
+            return await self.start().future
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+
+    async def __aenter__(self):
+        return self.start()
+
+    async def __aexit__(self, *args):
+        if self.future is not None and not self.future.done():
+            self.cancel()
+
+async def ainterrogate(corpus, *args, **kwargs):
+    """
+    Interrogate `corpus` in an executor, see :class:`InterrogationStream`
+    """
+    executor = kwargs.pop('executor', None)
+    stream = InterrogationStream(corpus, args, kwargs, executor=executor)
+    return await stream.result()
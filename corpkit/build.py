@@ -562,99 +562,197 @@ def make_no_id_corpus(pth, newpth, metadata_mode=False, speaker_segmentation=Fal
             except:
                 pass
 
-def get_all_metadata_fields(corpus, include_speakers=False):
+def scan_file_metadata(path):
     """
-    Get a list of metadata fields in a corpus
+    Get the metadata of a CONLL file, reading it once: each field's values,
+    and which sentences have each value
+
+    :returns: `dict` with ``fields``, field names and sorted `list` of
+              values, ``sents``, field names, then values as
+              :func:`~corpkit.conll.parse_conll` gives them, then
+              ``[first, last]`` ranges of sentence numbers, and ``nsents``,
+              the number of sentences
+    """
+    from corpkit.process import saferead
+    fields = {}
+    sents = {}
+    data = saferead(path)[0].strip('\n')
+    chunks = data.split('\n\n')
+    # sentences are numbered as parse_conll numbers them
+    for count, sent in enumerate(chunks, start=1):
+        here = {}
+        for line in sent.split('\n'):
+            if not line.startswith('#'):
+                continue
+            line = line.lstrip('# ')
+            if '=' not in line:
+                continue
+            field, value = line.split('=', 1)
+            here.setdefault(field, set()).add(value)
+            if field not in ('parse', 'sent_id'):
+                fields.setdefault(field, set()).add(value.strip())
+        for field, values in here.items():
+            if field in ('parse', 'sent_id'):
+                continue
+            ranges = sents.setdefault(field, {}).setdefault(','.join(values), [])
+            if ranges and ranges[-1][1] == count - 1:
+                ranges[-1][1] = count
+            else:
+                ranges.append([count, count])
+    return {'fields': {k: sorted(v) for k, v in fields.items()},
+            'sents': sents,
+            'nsents': len(chunks) if data else 0}
 
-    This could take a while for very little infor
+def list_corpus_files(path):
     """
-    from corpkit.corpus import Corpus
-    from corpkit.constants import OPENER, PYTHON_VERSION, MAX_METADATA_FIELDS
+    Get the (non-hidden) files in or at a path
 
-    # allow corpus object
-    if not isinstance(corpus, Corpus):
-        corpus = Corpus(corpus, print_info=False)
-    if not corpus.datatype == 'conll':
-        return []
+    :returns: `list` of ``(relative path, full path)`` tuples, with ``/`` as
+              separator in the relative path
+    """
+    import os
+    if os.path.isfile(path):
+        return [(os.path.basename(path), path)]
+    out = []
+    for root, dirs, fs in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        for f in sorted(fs):
+            if f.startswith('.'):
+                continue
+            full = os.path.join(root, f)
+            out.append((os.path.relpath(full, path).replace(os.sep, '/'), full))
+    return out
+
+def scan_corpus_metadata(path, previous=None, processes=None):
+    """
+    Read metadata fields and values from every file in a corpus in a single,
+    parallel pass
 
-    path = getattr(corpus, 'path', corpus)
+    :param previous: Results of an earlier scan. Files whose size and
+                     modification time haven't changed aren't read again.
+    :type previous: `dict`
+
+    :param processes: Number of processes to read files with (default: one
+                      per CPU)
+    :type processes: `int`
 
-    fs = []
+    :returns: `dict` of relative paths and their ``mtime`` and ``size``,
+              plus the keys from :func:`scan_file_metadata`
+    """
     import os
-    for root, dirnames, filenames in os.walk(path):
-        for filename in filenames:
-            fs.append(os.path.join(root, filename))
+    import multiprocessing
+    previous = previous or {}
+    records = {}
+    todo = []
+    for rel, full in list_corpus_files(path):
+        stat = os.stat(full)
+        old = previous.get(rel)
+        if old and old.get('mtime') == stat.st_mtime and old.get('size') == stat.st_size \
+               and 'sents' in old:
+            records[rel] = old
+        else:
+            todo.append((rel, full, stat))
+
+    paths = [full for _, full, _ in todo]
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    processes = min(processes, len(paths))
+    if processes > 1:
+        pool = multiprocessing.Pool(processes)
+        try:
+            results = pool.map(scan_file_metadata, paths,
+                               chunksize=max(1, len(paths) // (processes * 4)))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [scan_file_metadata(f) for f in paths]
 
-    badfields = ['parse', 'sent_id']
-    if not include_speakers:
-        badfields.append('speaker')
+    for (rel, _, stat), record in zip(todo, results):
+        record.update({'mtime': stat.st_mtime, 'size': stat.st_size})
+        records[rel] = record
+    return records
 
-    fields = set()
-    for f in fs:
-        if PYTHON_VERSION == 2:
-            from corpkit.process import saferead
-            lines = saferead(f)[0].splitlines()
-        else:
-            with OPENER(f, 'rb') as fo:
-                lines = fo.read().decode('utf-8', errors='ignore')
-                lines = lines.strip('\n')
-                lines = lines.splitlines()
+def metadata_changed(path, records):
+    """
+    Check if files in a corpus have been added, removed or changed since
+    they were scanned by :func:`scan_corpus_metadata`
+    """
+    import os
+    files = list_corpus_files(path)
+    if len(files) != len(records):
+        return True
+    for rel, full in files:
+        old = records.get(rel)
+        if not old or 'sents' not in old:
+            return True
+        stat = os.stat(full)
+        if old.get('mtime') != stat.st_mtime or old.get('size') != stat.st_size:
+            return True
+    return False
 
-        lines = [l[2:].split('=', 1)[0] for l in lines if l.startswith('# ') \
-                 if not l.startswith('# sent_id')]
-        for l in lines:
-            if l not in fields and l not in badfields:
-                fields.add(l)
-        if len(fields) > MAX_METADATA_FIELDS:
-            break
-    return list(fields)
+def merge_metadata(records, include_speakers=True):
+    """
+    Combine per-file results of :func:`scan_corpus_metadata`
 
-def get_names(filepath, speakid):
+    :returns: `dict` of field names and sorted `list` of values
     """
-    Get a list of speaker names from a file
+    fields = {}
+    for record in records.values():
+        for field, values in record['fields'].items():
+            if field == 'speaker' and not include_speakers:
+                continue
+            fields.setdefault(field, set()).update(values)
+    return {k: sorted(v) for k, v in fields.items()}
+
+def typed_fields(fields):
     """
-    import re
-    from corpkit.process import saferead
-    txt, enc = saferead(filepath)
-    res = re.findall(speakid, txt)
-    if res:
-        return sorted(list(set([i.strip() for i in res])))
+    Work out the type of each metadata field from its values, and put the
+    values of numeric and date fields in order, so that ranges of them can
+    be found by bisection
+
+    :param fields: Output of :func:`merge_metadata`
+    :type fields: `dict`
+
+    :returns: `dict` of field names and values, and `dict` of field names
+              and types (see :func:`corpkit.conll.metadata_type`)
+    """
+    from corpkit.conll import metadata_type, typed_value
+    types = {}
+    out = {}
+    for field, values in fields.items():
+        types[field] = metadata_type(values)
+        if types[field] != 'str':
+            values = sorted(values, key=lambda v: (typed_value(v, types[field]) is None,
+                                                   typed_value(v, types[field]), v))
+        out[field] = values
+    return out, types
+
+def get_all_metadata_fields(corpus, include_speakers=False):
+    """
+    Get a list of metadata fields in a corpus
+    """
+    from corpkit.corpus import Corpus
+
+    # allow corpus object
+    if not isinstance(corpus, Corpus):
+        corpus = Corpus(corpus, print_info=False)
+    if not corpus.datatype == 'conll':
+        return []
+
+    path = getattr(corpus, 'path', corpus)
+    records = scan_corpus_metadata(path)
+    return list(merge_metadata(records, include_speakers=include_speakers))
 
 def get_speaker_names_from_parsed_corpus(corpus, feature='speaker'):
     """
-    Use regex to get speaker names from parsed data without parsing it
+    Get the values of a metadata field from parsed data without parsing it
     """
     import os
-    import re
-    from corpkit.constants import MAX_METADATA_VALUES
-
     path = corpus.path if hasattr(corpus, 'path') else corpus
-    
-    list_of_files = []
-    names = []
-
-    # i am not really sure why we need multiline here
-    # is it because start of line char is just matching
-    speakid = re.compile(r'^# %s=(.*)' % re.escape(feature), re.MULTILINE)
-    
-    # if passed a dir, do it for every file
-    if os.path.isdir(path):
-        for (root, dirs, fs) in os.walk(path):
-            for f in fs:
-                list_of_files.append(os.path.join(root, f))
-    elif os.path.isfile(path):
-        list_of_files.append(path)
-
-    for filepath in list_of_files:
-        res = get_names(filepath, speakid)
-        if not res:
-            continue
-        for i in res:
-            if i not in names:
-                names.append(i)
-        if len(names) > MAX_METADATA_VALUES:
-            break
-    return list(sorted(set(names)))
+    if not os.path.exists(path):
+        return []
+    return merge_metadata(scan_corpus_metadata(path)).get(feature, [])
 
 def rename_all_files(dirs_to_do):
     """
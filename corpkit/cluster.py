@@ -0,0 +1,579 @@
+"""
+corpkit: interrogate a corpus spread over several machines
+
+Each machine runs a worker daemon over its own copy (or shard) of a
+parsed corpus::
+
+    corpkit worker --data data/mycorpus-parsed --listen 0.0.0.0:6000
+
+and an interrogation is spread over the daemons with::
+
+    corpus.interrogate({'w': 'any'}, cluster=['host1:6000', 'host2:6000'])
+
+Daemons and coordinators check each other with a shared secret, given as
+``--authkey`` and ``authkey`` or in the ``CORPKIT_AUTHKEY`` environment
+variable. A daemon started without one makes one and prints it.
+
+Files are named by their path relative to the corpus root, so any daemon
+holding a file can search it. If a daemon goes away, the files it had not
+finished are searched again by another daemon that has them.
+"""
+
+from __future__ import print_function
+from multiprocessing import AuthenticationError
+from corpkit.constants import STRINGTYPE
+
+# file extensions a worker will serve
+EXTENSIONS = ('.conll', '.conllu')
+
+# seconds to wait for a daemon or coordinator to answer
+TIMEOUT = 30
+
+# seconds between the messages a busy daemon sends, so that coordinators
+# can tell it apart from one that has hung
+HEARTBEAT = 5
+
+def parse_address(address, default_host='127.0.0.1'):
+    """
+    Turn ``'host:port'``, ``':port'`` or ``port`` into a ``(host, port)`` tuple
+    """
+    if isinstance(address, tuple):
+        return address[0], int(address[1])
+    address = str(address)
+    if ':' not in address:
+        return default_host, int(address)
+    host, port = address.rsplit(':', 1)
+    return host or default_host, int(port)
+
+def get_authkey(authkey=None):
+    """
+    Get the shared secret daemons and coordinators use to check each other,
+    from the argument or the ``CORPKIT_AUTHKEY`` environment variable
+    """
+    import os
+    authkey = authkey or os.environ.get('CORPKIT_AUTHKEY')
+    if authkey and isinstance(authkey, STRINGTYPE) and not isinstance(authkey, bytes):
+        authkey = authkey.encode('utf-8')
+    return authkey or None
+
+def set_timeout(conn, timeout):
+    """
+    Make reads from a connection fail with `OSError` after `timeout`
+    seconds, or never if `timeout` is 0
+    """
+    import os
+    import socket
+    import struct
+    if os.name == 'nt' or not hasattr(socket, 'SO_RCVTIMEO'):
+        return
+    sock = socket.fromfd(conn.fileno(), socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO,
+                        struct.pack('ll', int(timeout), int(timeout % 1 * 1000000)))
+    finally:
+        sock.close()
+
+def connect(address, authkey, timeout=TIMEOUT):
+    """
+    Connect to a daemon, giving up if it can't be reached or doesn't answer
+    within `timeout` seconds
+
+    :returns: :class:`multiprocessing.connection.Connection`
+    """
+    import os
+    import socket
+    from multiprocessing.connection import Connection, answer_challenge, deliver_challenge
+    sock = socket.create_connection(address, timeout=timeout)
+    try:
+        sock.settimeout(None)
+        conn = Connection(os.dup(sock.fileno()))
+    finally:
+        sock.close()
+    try:
+        set_timeout(conn, timeout)
+        answer_challenge(conn, authkey)
+        deliver_challenge(conn, authkey)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+def list_files(data):
+    """
+    Find the CONLL files under a corpus directory
+
+    :returns: `dict` of paths relative to `data`, with ``/`` as separator,
+              and their sizes
+    """
+    import os
+    files = {}
+    for root, dirs, fs in os.walk(data):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for f in fs:
+            if f.startswith('.') or not f.endswith(EXTENSIONS):
+                continue
+            path = os.path.join(root, f)
+            rel = os.path.relpath(path, data).replace(os.sep, '/')
+            files[rel] = os.path.getsize(path)
+    return files
+
+class WorkerServer(object):
+    """
+    Serve searches of the files under `data` to coordinators.
+
+    Requests and replies are tuples sent over a
+    :mod:`multiprocessing.connection`:
+
+    * ``('files',)``: reply ``('files', {relpath: size})``
+    * ``('search', tasks, kwargs, compact)``: `tasks` are ``(index, category,
+      relpath, filename)``. One ``('result', index, res, conc_res, tokens)`` is sent
+      for each file as it finishes, then ``('done',)``. Until then,
+      ``('alive',)`` is sent every `HEARTBEAT` seconds
+    * ``('stop',)``: shut the daemon down
+
+    Errors are sent back as ``('error', message)``.
+
+    :param data: Path to the parsed corpus on this machine
+    :type data: `str`
+
+    :param address: Where to listen, as ``(host, port)`` or ``'host:port'``
+    :type address: `tuple`/`str`
+
+    :param authkey: Shared secret for the connection. If not given, and not
+                    in ``CORPKIT_AUTHKEY``, a random one is made and printed
+    :type authkey: `bytes`/`str`
+
+    :param processes: Number of worker processes (default: one per core)
+    :type processes: `int`
+
+    :param cache_size: Number of parsed files each process keeps in memory
+    :type cache_size: `int`
+    """
+
+    def __init__(self, data, address=('127.0.0.1', 6000), authkey=None,
+                 processes=None, cache_size=64, quiet=False):
+        import os
+        import threading
+        from multiprocessing.connection import Listener
+        from corpkit.multiprocess import WorkerPool
+
+        self.data = os.path.abspath(data)
+        if not os.path.isdir(self.data):
+            raise ValueError('Corpus not found: %s' % data)
+        self.address = parse_address(address)
+        self.authkey = get_authkey(authkey)
+        # anyone who can connect could otherwise send pickles to unpickle
+        self.made_authkey = self.authkey is None
+        if self.made_authkey:
+            import binascii
+            self.authkey = binascii.hexlify(os.urandom(16))
+        self.quiet = quiet
+        self.pool = WorkerPool(processes, cache_size=cache_size)
+        # one search at a time, so workers never mix up two vocabularies
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        # connections are checked in their own threads, so that a client
+        # that never answers can't hold up the others
+        self.listener = Listener(self.address)
+        # the real port, if port 0 was asked for
+        self.address = self.listener.address
+
+    def serve_forever(self):
+        """
+        Accept connections until a ``('stop',)`` request arrives
+        """
+        import threading
+        if not self.quiet:
+            print('Serving %s on %s:%d' % (self.data, self.address[0], self.address[1]))
+        if self.made_authkey:
+            print('Authkey: %s' % self.authkey.decode('ascii'))
+        try:
+            while not self.stopped.is_set():
+                try:
+                    conn = self.listener.accept()
+                except (IOError, OSError, EOFError):
+                    # failed handshakes, or the listener closing on stop
+                    continue
+                thread = threading.Thread(target=self.handle, args=(conn,))
+                thread.daemon = True
+                thread.start()
+        finally:
+            self.close()
+
+    def handle(self, conn):
+        """
+        Answer the requests made over one connection
+        """
+        import traceback
+        from multiprocessing.connection import answer_challenge, deliver_challenge
+        try:
+            try:
+                set_timeout(conn, TIMEOUT)
+                deliver_challenge(conn, self.authkey)
+                answer_challenge(conn, self.authkey)
+                # coordinators may wait a while between requests
+                set_timeout(conn, 0)
+            except Exception:
+                return
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, IOError, OSError):
+                    return
+                try:
+                    if request[0] == 'files':
+                        conn.send(('files', list_files(self.data)))
+                    elif request[0] == 'search':
+                        self.search(conn, *request[1:])
+                    elif request[0] == 'stop':
+                        conn.send(('done',))
+                        self.stop()
+                        return
+                    else:
+                        conn.send(('error', 'Unknown request: %s' % repr(request[0])))
+                except (EOFError, IOError, OSError):
+                    return
+                except Exception:
+                    conn.send(('error', traceback.format_exc()))
+        finally:
+            conn.close()
+
+    def search(self, conn, tasks, kwargs, compact=True):
+        """
+        Search files for a coordinator, sending each result back as it finishes
+        """
+        import os
+        available = list_files(self.data)
+        local = []
+        for index, category, rel, filename in tasks:
+            if rel not in available:
+                raise ValueError('File not on this worker: %s' % rel)
+            local.append((index, category, os.path.join(self.data, *rel.split('/')), filename))
+        import threading
+        sending = threading.Lock()
+        finished = threading.Event()
+
+        def heartbeat():
+            while not finished.wait(HEARTBEAT):
+                with sending:
+                    try:
+                        conn.send(('alive',))
+                    except (IOError, OSError, EOFError):
+                        return
+
+        beating = threading.Thread(target=heartbeat)
+        beating.daemon = True
+        beating.start()
+        try:
+            with self.lock:
+                for index, res, conc_res, tokens in self.pool.run(local, kwargs, compact=compact):
+                    with sending:
+                        conn.send(('result', index, res, conc_res, tokens))
+        finally:
+            finished.set()
+            beating.join()
+        conn.send(('done',))
+
+    def stop(self):
+        """
+        Stop accepting connections
+        """
+        import socket
+        if self.stopped.is_set():
+            return
+        self.stopped.set()
+        # wake up the accept() call
+        try:
+            socket.create_connection(self.address, timeout=TIMEOUT).close()
+        except (IOError, OSError):
+            pass
+
+    def close(self):
+        self.stopped.set()
+        self.listener.close()
+        self.pool.close()
+
+def serve(data, listen='127.0.0.1:6000', authkey=None, processes=None,
+          cache_size=64, quiet=False):
+    """
+    Run a worker daemon until it is stopped. See :class:`WorkerServer`.
+    """
+    server = WorkerServer(data, address=listen, authkey=authkey, processes=processes,
+                          cache_size=cache_size, quiet=quiet)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.close()
+
+class RemoteFile(object):
+    """
+    A file that exists on one or more workers
+    """
+    level = 'f'
+    datatype = 'conll'
+
+    def __init__(self, path):
+        self.path = path
+        self.name = path.rsplit('/', 1)[-1]
+
+    def __repr__(self):
+        return "<%s instance: %s>" % (self.__class__.__name__, self.name)
+
+class RemoteSubcorpus(object):
+    """
+    A subcorpus built from the file lists of workers
+    """
+    level = 's'
+    datatype = 'conll'
+    singlefile = False
+
+    def __init__(self, path, files):
+        self.path = path
+        self.name = path
+        self.files = files
+
+    def __getitem__(self, key):
+        return self.files[key]
+
+    def __repr__(self):
+        return "<%s instance: %s>" % (self.__class__.__name__, self.name)
+
+class RemoteCorpus(object):
+    """
+    A corpus that only exists on workers, so that a coordinator does not
+    need a copy. Subcorpora are the top-level folders on the workers.
+    """
+    level = 'c'
+    datatype = 'conll'
+    singlefile = False
+
+    def __init__(self, name, paths):
+        from collections import defaultdict
+        self.name = name.rstrip('/').rsplit('/', 1)[-1]
+        self.path = self.name
+        folders = defaultdict(list)
+        flat = []
+        for path in sorted(paths):
+            if '/' in path:
+                folders[path.split('/', 1)[0]].append(RemoteFile(path))
+            else:
+                flat.append(RemoteFile(path))
+        if folders:
+            self.subcorpora = [RemoteSubcorpus(k, v) for k, v in sorted(folders.items())]
+            self.files = None
+        else:
+            self.subcorpora = []
+            self.files = flat
+
+    def __getitem__(self, key):
+        return self.subcorpora[key]
+
+    def __repr__(self):
+        return "<%s instance: %s>" % (self.__class__.__name__, self.name)
+
+class Cluster(object):
+    """
+    Worker daemons that an interrogation can be spread over.
+
+    :param addresses: ``'host:port'`` for each daemon
+    :type addresses: `list`
+
+    :param authkey: Shared secret, as given to the daemons, or from
+                    ``CORPKIT_AUTHKEY``
+    :type authkey: `bytes`/`str`
+
+    :param timeout: Seconds to wait for a daemon to answer before treating
+                    it as gone
+    :type timeout: `int`
+    """
+
+    def __init__(self, addresses, authkey=None, timeout=TIMEOUT):
+        if isinstance(addresses, (STRINGTYPE, tuple)):
+            addresses = [addresses]
+        self.addresses = [parse_address(a) for a in addresses]
+        self.authkey = get_authkey(authkey)
+        self.timeout = timeout
+        if not self.addresses:
+            raise ValueError('No workers given.')
+        if self.authkey is None:
+            raise ValueError('An authkey is needed: pass authkey or set CORPKIT_AUTHKEY.')
+
+    def connect(self, address):
+        return connect(address, self.authkey, timeout=self.timeout)
+
+    def request(self, address, *request):
+        """
+        Make one request, returning the first reply
+        """
+        conn = self.connect(address)
+        try:
+            conn.send(request)
+            reply = conn.recv()
+        finally:
+            conn.close()
+        if reply[0] == 'error':
+            raise RuntimeError('Error on worker %s:%d:\n%s' % (address[0], address[1], reply[1]))
+        return reply
+
+    def files(self):
+        """
+        Ask each worker which files it has. Workers that can't be reached
+        are left out.
+
+        :returns: `dict` of ``{(host, port): {relpath: size}}``
+        """
+        listing = {}
+        for address in self.addresses:
+            try:
+                listing[address] = self.request(address, 'files')[1]
+            except (IOError, OSError, EOFError, AuthenticationError):
+                continue
+        if not listing:
+            raise IOError('None of the workers could be reached.')
+        return listing
+
+    def corpus(self, name):
+        """
+        Make a :class:`RemoteCorpus` out of the files the workers have
+        """
+        paths = set()
+        for files in self.files().values():
+            paths.update(files)
+        return RemoteCorpus(name, paths)
+
+    def stop(self):
+        """
+        Shut down every worker daemon that can be reached
+        """
+        for address in self.addresses:
+            try:
+                self.request(address, 'stop')
+            except (IOError, OSError, EOFError, AuthenticationError):
+                continue
+
+    def _run_batch(self, number, address, batch, kwargs, compact, out):
+        """
+        Send one batch of files to a worker, and put what comes back on `out`
+        """
+        try:
+            conn = self.connect(address)
+            try:
+                conn.send(('search', batch, kwargs, compact))
+                while True:
+                    reply = conn.recv()
+                    if reply[0] == 'alive':
+                        continue
+                    if reply[0] == 'done':
+                        return
+                    out.put((number, address, reply))
+                    if reply[0] == 'error':
+                        return
+            finally:
+                conn.close()
+        except (IOError, OSError, EOFError, AuthenticationError) as err:
+            out.put((number, address, ('failed', str(err))))
+
+    def search(self, tasks, pipeline_kwargs, compact=True, telemetry=None):
+        """
+        Search files on the workers that have them, sending each worker no
+        more than its share of the bytes. When a worker fails, its
+        unfinished files go to the other workers that have them.
+
+        :param tasks: ``(index, category, relpath, filename)`` for each file,
+                      where `filename` is what concordance lines will show
+        :type tasks: `list`
+
+        :param pipeline_kwargs: Arguments for :func:`corpkit.conll.pipeline`
+        :type pipeline_kwargs: `dict`
+
+        :param telemetry: Counters to add each finished file to
+        :type telemetry: :class:`corpkit.telemetry.Telemetry`
+
+        :returns: A generator of ``(res, conc_res)`` for each file, in index order
+        """
+        import threading
+        try:
+            from queue import Queue
+        except ImportError:
+            from Queue import Queue
+        from corpkit.multiprocess import VocabDecoder, from_columns, unpicklable
+        from corpkit.telemetry import count_matches
+
+        if not tasks:
+            return
+
+        # workers without every argument would search differently
+        unsent = unpicklable(pipeline_kwargs)
+        if unsent:
+            raise ValueError("Can't send %s to worker daemons." % ', '.join(unsent))
+
+        kwargs = dict(pipeline_kwargs)
+        kwargs['maxconc'] = (kwargs.get('maxconc', (False, 0))[0], 0)
+
+        listing = self.files()
+        holders = {}
+        sizes = {}
+        for index, _, rel, _ in tasks:
+            holders[index] = [a for a in self.addresses if rel in listing.get(a, {})]
+            if not holders[index]:
+                raise ValueError('No worker has %s.' % rel)
+            sizes[index] = max(listing[a][rel] for a in holders[index])
+        tasks = {t[0]: t for t in tasks}
+        alive = set(listing)
+        load = dict.fromkeys(alive, 0)
+        out = Queue()
+        batches = {}
+
+        def assign(indices):
+            """
+            Give each file to the least loaded living worker that has it
+            """
+            plan = {}
+            for index in sorted(indices, key=lambda i: sizes[i], reverse=True):
+                options = [a for a in holders[index] if a in alive]
+                if not options:
+                    raise RuntimeError('No working worker has %s.' % tasks[index][2])
+                address = min(options, key=lambda a: load[a])
+                load[address] += sizes[index]
+                plan.setdefault(address, []).append(index)
+            for address, indices in plan.items():
+                number = len(batches)
+                batches[number] = (address, set(indices))
+                thread = threading.Thread(target=self._run_batch,
+                                          args=(number, address, [tasks[i] for i in indices],
+                                                kwargs, compact, out))
+                thread.daemon = True
+                thread.start()
+
+        assign(list(tasks))
+        decoder = VocabDecoder()
+        pending = {}
+        upto = 0
+        while upto < len(tasks):
+            number, address, reply = out.get()
+            outstanding = batches[number][1]
+            if reply[0] == 'error':
+                raise RuntimeError('Error on worker %s:%d:\n%s' % (address[0], address[1], reply[1]))
+            if reply[0] == 'failed':
+                alive.discard(address)
+                if outstanding:
+                    assign(outstanding)
+                    outstanding.clear()
+                continue
+            _, index, res, conc_res, tokens = reply
+            outstanding.discard(index)
+            if compact and isinstance(res, tuple):
+                # worker process ids can clash across machines and batches
+                res = decoder.counter(((number, res[0]),) + tuple(res[1:]))
+                conc_res = from_columns(conc_res)
+            if telemetry is not None:
+                telemetry.add(files=1, tokens=tokens, bytes=sizes[index],
+                              matches=count_matches(res))
+            pending[index] = (res, conc_res)
+            while upto in pending:
+                yield pending.pop(upto)
+                upto += 1
+
+    def __repr__(self):
+        return "<%s: %s>" % (self.__class__.__name__,
+                             ', '.join('%s:%d' % a for a in self.addresses))
@@ -5,7 +5,8 @@ corpkit: process CONLL formatted data
 def parse_conll(f,
                 first_time=False,
                 just_meta=False,
-                usecols=None):
+                usecols=None,
+                sents=None):
     """
     Make a pandas.DataFrame with metadata from a CONLL-U file
     
@@ -14,6 +15,7 @@ def parse_conll(f,
         first_time (bool, optional): If True, add in sent index
         just_meta (bool, optional): Return only a metadata `dict`
         usecols (None, optional): Which columns must be parsed by pandas.read_csv
+        sents (set, optional): Numbers of the only sentences to parse
     
     Returns:
         pandas.DataFrame: DataFrame containing tokens and a ._metadata attribute
@@ -34,8 +36,9 @@ def parse_conll(f,
 
     splitdata = []
     metadata = {}
-    sents = data.split('\n\n')    
-    for count, sent in enumerate(sents, start=1):
+    for count, sent in enumerate(data.split('\n\n'), start=1):
+        if sents is not None and count not in sents:
+            continue
         metadata[count] = defaultdict(set)
         for line in sent.split('\n'):
             if line and not line.startswith('#') \
@@ -791,10 +794,213 @@ def determine_adjacent(original):
         adj = False
     return adj, original
 
+def typed_value(value, kind=None):
+    """
+    Read a metadata value as a number or date
+
+    :param kind: ``'int'``, ``'float'`` or ``'date'``, or `None` to try each
+    :type kind: `str`
+
+    :returns: `int`, `float`, `datetime.date`, or `None` if it isn't one
+    """
+    from datetime import datetime
+    from corpkit.constants import METADATA_DATE_FORMATS
+    value = value.strip()
+    for typ, convert in [('int', int), ('float', float)]:
+        if kind in (None, typ):
+            try:
+                return convert(value)
+            except ValueError:
+                pass
+    if kind in (None, 'date'):
+        for fmt in METADATA_DATE_FORMATS:
+            try:
+                return datetime.strptime(value, fmt).date()
+            except ValueError:
+                pass
+
+def metadata_type(values):
+    """
+    Work out if all of a field's values are ints, floats or dates
+
+    :returns: ``'int'``, ``'float'``, ``'date'`` or ``'str'``
+    """
+    values = [v for v in values if v.strip() and v != 'none']
+    if not values:
+        return 'str'
+    for kind in ['int', 'float', 'date']:
+        if all(typed_value(v, kind) is not None for v in values):
+            return kind
+    return 'str'
+
+def is_range(criteria):
+    """
+    Check if metadata criteria are a ``(low, high)`` range of numbers or
+    dates, rather than values to match. Either end can be `None`.
+    """
+    from corpkit.constants import STRINGTYPE
+    return isinstance(criteria, tuple) and len(criteria) == 2 \
+        and not any(isinstance(i, STRINGTYPE) for i in criteria) \
+        and any(i is not None for i in criteria)
+
+def in_range(value, criteria):
+    """
+    Check if a typed metadata value is within an inclusive range. Dates are
+    compared to numbers by their year.
+    """
+    import datetime
+    if value is None:
+        return False
+    low, high = criteria
+    bounds = [i for i in criteria if i is not None]
+    dated = [isinstance(i, datetime.date) for i in bounds]
+    if isinstance(value, datetime.date):
+        if not all(dated):
+            value = value.year
+    elif any(dated):
+        return False
+    return (low is None or value >= low) and (high is None or value <= high)
+
+def values_in_range(values, kind, criteria):
+    """
+    Get the values of a numeric or date field that are within a range, by
+    bisection
+
+    :param values: The field's values, in order, as from
+                   :func:`corpkit.build.typed_fields`
+    :type values: `list`
+
+    :param kind: The field's type, from :func:`metadata_type`
+    :type kind: `str`
+    """
+    import datetime
+    from bisect import bisect_left, bisect_right
+    keys = [typed_value(v, kind) for v in values]
+    # values that aren't numbers or dates, like 'none', are at the end
+    keys = [k for k in keys if k is not None]
+    dated = [isinstance(i, datetime.date) for i in criteria if i is not None]
+    if kind == 'date' and not all(dated):
+        keys = [k.year for k in keys]
+    elif kind != 'date' and any(dated):
+        return []
+    low, high = criteria
+    start = 0 if low is None else bisect_left(keys, low)
+    end = len(keys) if high is None else bisect_right(keys, high)
+    return values[start:end]
+
+def binned_field(subcorpora):
+    """
+    Check if `subcorpora` is a ``(field, bins)`` pair for grouping by ranges
+    of a numeric or date field
+    """
+    from corpkit.constants import STRINGTYPE
+    return isinstance(subcorpora, tuple) and len(subcorpora) == 2 \
+        and isinstance(subcorpora[0], STRINGTYPE) \
+        and not isinstance(subcorpora[1], STRINGTYPE)
+
+def value_bin(value, bins):
+    """
+    Find the bin a metadata value falls in
+
+    :param bins: Width of each bin, like ``5`` for five years, or a `list`
+                 of bin edges. Each bin includes its lower edge only.
+                 Dates are binned by year.
+    :type bins: `int`/`float`/`list`
+
+    :returns: The bin's lower edge and a label like ``'1990-1994'``, or
+              ``(None, 'none')`` if the value isn't a number or date, or is
+              outside the edges
+    """
+    import datetime
+    from bisect import bisect_right
+    value = typed_value(value.split(';')[0])
+    if isinstance(value, datetime.date):
+        value = value.year
+    if value is None:
+        return None, 'none'
+    if isinstance(bins, (list, tuple)):
+        place = bisect_right(bins, value)
+        if place == 0 or place == len(bins):
+            return None, 'none'
+        low, high = bins[place - 1], bins[place]
+    else:
+        low = (value // bins) * bins
+        high = low + bins
+    if all(isinstance(i, int) for i in (low, high)):
+        return low, str(low) if high - low == 1 else '%d-%d' % (low, high - 1)
+    return low, '%g-%g' % (low, high)
+
+def metadata_matches(value, criteria, method='just'):
+    """
+    Check if a sentence with this value for a metadata field is kept by
+    `just` or `skip` criteria. Values with ``;`` in them are split up.
+    """
+    import re
+    from corpkit.constants import STRINGTYPE
+    lst_met_vl = value.split(';')
+    if is_range(criteria):
+        found = any(in_range(typed_value(i), criteria) for i in lst_met_vl)
+        return found if method == 'just' else not found
+    if isinstance(criteria, (list, set, tuple)):
+        criteria = [i.lower() for i in criteria]
+        if method == 'just':
+            return any(i.lower() in criteria for i in lst_met_vl)
+        elif method == 'skip':
+            return not any(i in criteria for i in lst_met_vl)
+    elif isinstance(criteria, (type(re.compile('')), STRINGTYPE)):
+        # compiled patterns keep their own flags
+        if isinstance(criteria, STRINGTYPE):
+            criteria = re.compile(criteria, re.IGNORECASE)
+        if method == 'just':
+            return any(criteria.search(i) for i in lst_met_vl)
+        elif method == 'skip':
+            return not any(criteria.search(i) for i in lst_met_vl)
+    return False
+
+def metadata_table(metadata):
+    """
+    Turn sentence metadata into a table with a row for each sentence and a
+    categorical column for each field, with ``'none'`` for missing values
+    """
+    import pandas as pd
+    ids = sorted(metadata)
+    table = pd.DataFrame([metadata[i] for i in ids], index=ids)
+    return table.fillna('none').astype('category')
+
+def metadata_mask(table, criteria, feature='speaker', method='just'):
+    """
+    Check each sentence in a :func:`metadata_table` against `just` or `skip`
+    criteria, checking each distinct value only once
+
+    :returns: boolean `numpy.ndarray`, `True` for sentences to keep
+    """
+    import numpy as np
+    if feature not in table.columns:
+        keep = metadata_matches('none', criteria, method=method)
+        return np.full(len(table), keep, dtype=bool)
+    column = table[feature].cat
+    passed = np.array([metadata_matches(v, criteria, method=method)
+                       for v in column.categories], dtype=bool)
+    return passed[column.codes.values]
+
+def keep_sentences(df, metadata, table, mask):
+    """
+    Keep the sentences of a DataFrame that are `True` in a mask over its
+    :func:`metadata_table`
+    """
+    import numpy as np
+    keep = table.index[mask]
+    if not mask.all():
+        df = df[np.asarray(df.index.get_level_values(0).isin(keep))]
+    df._metadata = {k: metadata[k] for k in keep}
+    return df
+
 def cut_df_by_metadata(df, metadata, criteria, coref=False,
-                            feature='speaker', method='just'):
+                            feature='speaker', method='just', table=None):
     """
     Keep or remove parts of the DataFrame based on metadata criteria
+
+    :param table: :func:`metadata_table` for `metadata`, if already made
     """
     if not criteria:
         df._metadata = metadata
@@ -803,53 +1009,79 @@ def cut_df_by_metadata(df, metadata, criteria, coref=False,
     if coref:
         df._metadata = metadata
         return df
-    import re
-    good_sents = []
-    new_metadata = {}
-    from corpkit.constants import STRINGTYPE
-    # could make the below more elegant ...
-    for sentid, data in sorted(metadata.items()):
-        meta_value = data.get(feature, 'none')
-        lst_met_vl = meta_value.split(';')
-        if isinstance(criteria, (list, set, tuple)):
-            criteria = [i.lower() for i in criteria]
-            if method == 'just':
-                if any(i.lower() in criteria for i in lst_met_vl):
-                    good_sents.append(sentid)
-                    new_metadata[sentid] = data
-            elif method == 'skip':
-                if not any(i in criteria for i in lst_met_vl):
-                    good_sents.append(sentid)
-                    new_metadata[sentid] = data
-        elif isinstance(criteria, (re._pattern_type, STRINGTYPE)):
-            if method == 'just':
-                if any(re.search(criteria, i, re.IGNORECASE) for i in lst_met_vl):
-                    good_sents.append(sentid)
-                    new_metadata[sentid] = data
-            elif method == 'skip':
-                if not any(re.search(criteria, i, re.IGNORECASE) for i in lst_met_vl):
-                    good_sents.append(sentid)
-                    new_metadata[sentid] = data
-
-    df = df.loc[good_sents]
-    df = df.fillna('')
-    df._metadata = new_metadata
-    return df
+    if table is None:
+        table = metadata_table(metadata)
+    mask = metadata_mask(table, criteria, feature=feature, method=method)
+    return keep_sentences(df, metadata, table, mask)
 
 def cut_df_by_meta(df, just_metadata, skip_metadata):
     """
     Reshape a DataFrame based on filters
     """
-    if df is not None:
-        if just_metadata:
-            for k, v in just_metadata.items():
-                df = cut_df_by_metadata(df, df._metadata, v, feature=k)
-        if skip_metadata:
-            for k, v in skip_metadata.items():
-                df = cut_df_by_metadata(df, df._metadata, v, feature=k, method='skip')
-    return df
+    if df is None or not (just_metadata or skip_metadata):
+        return df
+    filters = [(k, v, 'just') for k, v in (just_metadata or {}).items()] + \
+              [(k, v, 'skip') for k, v in (skip_metadata or {}).items()]
+    filters = [(k, v, method) for k, v, method in filters if v]
+    if not filters:
+        return df
+    metadata = df._metadata
+    table = metadata_table(metadata)
+    mask = None
+    for k, v, method in filters:
+        cut = metadata_mask(table, v, feature=k, method=method)
+        mask = cut if mask is None else mask & cut
+    return keep_sentences(df, metadata, table, mask)
 
 
+def metadata_codes(table, feature):
+    """
+    Get the values of a field in a :func:`metadata_table`, and for each
+    sentence, the position of its value in them. `feature` can also be a
+    ``(field, bins)`` pair, to get bins of values instead (see
+    :func:`value_bin`).
+
+    :returns: `list` of values and `numpy.ndarray` of positions
+    """
+    import numpy as np
+    if binned_field(feature):
+        feature, bins = feature
+        if feature not in table.columns:
+            return metadata_codes(table, feature)
+        column = table[feature].cat
+        found = [value_bin(v, bins) for v in column.categories]
+        names = [label for _, label in
+                 sorted(set(found), key=lambda b: (b[0] is None, b[0], b[1]))]
+        lookup = np.array([names.index(label) for _, label in found], dtype=int)
+        return names, lookup[column.codes.values]
+    if feature in table.columns:
+        column = table[feature].cat
+        return list(column.categories), column.codes.values
+    return ['none'] if len(table) else [], np.zeros(len(table), dtype=int)
+
+def split_df_by_metadata(df, metadata, table, feature):
+    """
+    Split a DataFrame into the sentences having each value of a metadata
+    field, in one pass
+
+    :returns: `list` of ``(value, DataFrame)``, with `DataFrame._metadata`
+              set for each part
+    """
+    import numpy as np
+    import pandas as pd
+    values, codes = metadata_codes(table, feature)
+    by_sent = pd.Series(codes, index=table.index)
+    parts = {}
+    if len(df):
+        tokens = by_sent.reindex(df.index.get_level_values(0)).values
+        parts = dict(list(df.groupby(tokens, sort=False)))
+    out = []
+    for code, value in enumerate(values):
+        part = parts.get(code, df.iloc[:0])
+        part._metadata = {k: metadata[k] for k in table.index[codes == code]}
+        out.append((value, part))
+    return out
+
 def tgrep_searcher(f=False,
                    metadata=False,
                    from_df=False,
@@ -876,14 +1108,18 @@ def tgrep_searcher(f=False,
     Use tgrep for constituency grammar search
     """
 
-    from corpkit.process import show_tree_as_per_option, tgrep
+    from nltk.tgrep import tgrep_nodes
+    from corpkit.process import show_tree_as_per_option, get_trees
     matches = []
     conc_out = []
     # in case search was a dict
     srch = search.get('t') if isinstance(search, dict) else search
     metcat = category if category else ''
-    for i, sent in metadata.items():
-        results = tgrep(sent['parse'], srch)
+    # search every sentence at once, with trees kept from earlier searches
+    ids = list(metadata)
+    found = tgrep_nodes(srch, get_trees(fname, metadata, ids))
+    for i, results in zip(ids, found):
+        sent = metadata[i]
         sname = sent.get('speaker')
         metcat = category
         for res in results:
@@ -931,7 +1167,9 @@ def slow_tregex(metadata=False,
     Do the metadata specific version of tregex queries
     """
 
-    from corpkit.process import tregex_engine, format_tregex, make_conc_lines_from_whole_mid
+    from corpkit.process import tregex_batch, format_tregex, make_conc_lines_from_whole_mid, \
+                                tregex_spans, format_tregex_spans, make_conc_lines_from_spans
+    from corpkit.treeindex import get_index
     
     if isinstance(search, dict):
         search = list(search.values())[0]
@@ -955,43 +1193,44 @@ def slow_tregex(metadata=False,
             return {}, {}
 
     ops = ['-%s' % i for i in translated_option] + ['-o', '-n']
-    res = tregex_engine(query=search, 
-                        options=ops, 
-                        corpus=to_open,
-                        root=root,
-                        preserve_case=preserve_case,
-                        speaker_data=False)
-
-    res = format_tregex(res, show, exclude=exclude, excludemode=excludemode,
-                        translated_option=translated_option,
-                        lem_instance=lem_instance, countmode=countmode, speaker_data=False,
-                        lemtag=lemtag)
-
-    if not res:
-        if subcorpora:
+    index = get_index(fname)
+    fmt = dict(exclude=exclude, excludemode=excludemode, translated_option=translated_option,
+               lem_instance=lem_instance, countmode=countmode, lemtag=lemtag)
+
+    # for conc, get matches with their spans and sentences in one go
+    spans = None
+    if conc and not countmode:
+        spans = tregex_spans(to_open, search, ops, preserve_case=preserve_case,
+                             index=index, sent_ids=list(metadata))
+    if spans is not None:
+        res, spans = format_tregex_spans(spans, show, speaker_data=False, **fmt)
+        if not res and subcorpora:
             return [], []
-
-    if conc:
-        ops += ['-w']
-        whole_res = tregex_engine(query=search, 
-                                  options=ops, 
-                                  corpus=to_open,
-                                  root=root,
-                                  preserve_case=preserve_case,
-                                  speaker_data=speak)
-
-        # format match too depending on option
-        if not only_format_match:
-            whole_res = format_tregex(whole_res, show, exclude=exclude, excludemode=excludemode,
-                                      translated_option=translated_option,
-                                       lem_instance=lem_instance, countmode=countmode,
-                                       speaker_data=speak, whole=True,
-                                       lemtag=lemtag)
-
-        # make conc lines from conc results
-        concs = make_conc_lines_from_whole_mid(whole_res, res, filename=fname, show=show)
+        concs = make_conc_lines_from_spans(spans, speaker_data=speak)
     else:
-        concs = [False for i in res]
+        # matches, and whole sentences for conc, in one request
+        queries = [(search, ops, {'speaker_data': False})]
+        if conc:
+            queries.append((search, ops + ['-w'], {'speaker_data': speak}))
+        batch = tregex_batch(to_open, queries, root=root, preserve_case=preserve_case,
+                             index=index, sent_ids=list(metadata))
+        res = format_tregex(batch[0], show, speaker_data=False, **fmt)
+
+        if not res:
+            if subcorpora:
+                return [], []
+
+        if conc:
+            whole_res = batch[1]
+
+            # format match too depending on option
+            if not only_format_match:
+                whole_res = format_tregex(whole_res, show, speaker_data=speak, whole=True, **fmt)
+
+            # make conc lines from conc results
+            concs = make_conc_lines_from_whole_mid(whole_res, res, filename=fname, show=show)
+        else:
+            concs = [False for i in res]
 
     if len(res) > 0 and isinstance(res[0], tuple):
         res = [i[-1] for i in res]
@@ -1011,7 +1250,8 @@ def get_stats(from_df=False, metadata=False, feature=False, root=False, **kwargs
     import re
     from corpkit.dictionaries.process_types import processes
     from collections import Counter, defaultdict
-    from corpkit.process import tregex_engine
+    from corpkit.process import tregex_batch
+    from corpkit.treeindex import get_index
 
     def ispunct(s):
         import string
@@ -1049,14 +1289,15 @@ def get_stats(from_df=False, metadata=False, feature=False, root=False, **kwargs
     if not to_open.strip('\n'):
         return {}, {}
 
-    for name, q in sorted(tregex_qs.items()):
-        options = ['-o', '-t'] if name == 'Processes' else ['-o']
-        # c option removed, could cause memory problems
-        #ops = ['-%s' % i for i in translated_option] + ['-o', '-n']
-        res = tregex_engine(query=q, 
-                            options=options,
-                            corpus=to_open,  
-                            root=root)
+    # all the queries go to tregex together
+    names = sorted(tregex_qs)
+    queries = [(tregex_qs[name], ['-o', '-t'] if name == 'Processes' else ['-o'])
+               for name in names]
+    # c option removed, could cause memory problems
+    #ops = ['-%s' % i for i in translated_option] + ['-o', '-n']
+    index = get_index(kwargs.get('fname'))
+    batch = tregex_batch(to_open, queries, root=root, index=index, sent_ids=list(metadata))
+    for name, res in zip(names, batch):
 
         #res = format_tregex(res)
         if not res:
@@ -1121,8 +1362,12 @@ def pipeline(f=False,
     all_matches = []
     all_exclude = []
 
+    # sentences known from the metadata index to pass the filters
+    sents = kwargs.pop('sents', None)
     if from_df is False or from_df is None:
-        df = parse_conll(f, usecols=kwargs.get('usecols'))
+        if isinstance(sents, dict):
+            sents = sents.get(f)
+        df = parse_conll(f, usecols=kwargs.get('usecols'), sents=sents)
         # can fail here if df is none
         if df is None:
             print('Problem reading data from %s.' % f)
@@ -1132,7 +1377,10 @@ def pipeline(f=False,
         df = from_df
         metadata = kwargs.pop('metadata')
     feature = kwargs.pop('by_metadata', False)
+    stats = kwargs.pop('stats', None)
     df = cut_df_by_meta(df, just_metadata, skip_metadata)
+    if stats is not None and df is not None:
+        stats['tokens'] = len(df)
 
     searcher = pipeline
     if statsmode:
@@ -1147,35 +1395,33 @@ def pipeline(f=False,
             print('Problem reading data from %s.' % f)
             return {}, {}
 
-        # determine searcher
-        resultdict = {}
-        concresultdict = {}
-        # get all the possible values in the df for the feature of interest
-        all_cats = set([i.get(feature, 'none') for i in list(df._metadata.values())])
-        for category in all_cats:
-            new_df = cut_df_by_metadata(df, df._metadata, category, feature=feature, method='just')
-            r, c = searcher(f=False,
-                            fname=f,
-                            search=search,
-                            exclude=exclude,
-                            show=show,
-                            searchmode=searchmode,
-                            excludemode=excludemode,
-                            conc=conc,
-                            coref=coref,
-                            from_df=new_df,
-                            by_metadata=False,
-                            category=category,
-                            show_conc_metadata=show_conc_metadata,
-                            lem_instance=lem_instance,
-                            root=kwargs.pop('root', False),
-                            subcorpora=feature,
-                            metadata=new_df._metadata,
-                            **kwargs)
-            
-            resultdict[category] = r
-            concresultdict[category] = c
-        return resultdict, concresultdict
+        # counting and tree searches get each value's sentences in turn
+        if searcher is not pipeline:
+            resultdict = {}
+            concresultdict = {}
+            table = metadata_table(df._metadata)
+            for category, new_df in split_df_by_metadata(df, df._metadata, table, feature):
+                r, c = searcher(f=False,
+                                fname=f,
+                                search=search,
+                                exclude=exclude,
+                                show=show,
+                                searchmode=searchmode,
+                                excludemode=excludemode,
+                                conc=conc,
+                                coref=coref,
+                                from_df=new_df,
+                                by_metadata=False,
+                                category=category,
+                                show_conc_metadata=show_conc_metadata,
+                                lem_instance=lem_instance,
+                                root=kwargs.pop('root', False),
+                                subcorpora=feature,
+                                metadata=new_df._metadata,
+                                **kwargs)
+                resultdict[category] = r
+                concresultdict[category] = c
+            return resultdict, concresultdict
 
     if df is None:
         print('Problem reading data from %s.' % f)
@@ -1205,7 +1451,8 @@ def pipeline(f=False,
         df = df[~df['w'].str.contains(crit)]
 
     if statsmode:
-        return get_stats(df, metadata, False, root=kwargs.pop('root', False), **kwargs)
+        return get_stats(df, metadata, False, root=kwargs.pop('root', False),
+                         fname=f, **kwargs)
     elif search_trees:
         return searcher(from_df=df,
                         search=search,
@@ -1244,6 +1491,12 @@ def pipeline(f=False,
     if coref:
         all_matches = get_corefs(df, all_matches)
 
+    # with subcorpora, the matches are shown for each metadata value
+    if feature:
+        return show_by_metadata(df, all_matches, show, metadata, feature,
+                                conc=conc, coref=coref,
+                                show_conc_metadata=show_conc_metadata, **kwargs)
+
     out, conc_out = show_this(df, all_matches, show, metadata, conc, 
                               coref=coref, category=category, 
                               show_conc_metadata=show_conc_metadata,
@@ -1251,6 +1504,54 @@ def pipeline(f=False,
 
     return out, conc_out
 
+def show_by_metadata(df, matches, show, metadata, feature, conc=False, **kwargs):
+    """
+    Group matches from a search of the whole file by the metadata value of
+    their sentence, and show each group as its own subcorpus
+
+    :returns: `dict` of values and results, and `dict` of values and
+              concordance lines
+    """
+    from collections import defaultdict
+    table = metadata_table(metadata)
+    values, codes = metadata_codes(table, feature)
+    sent_codes = dict(zip(table.index, codes))
+    grouped = defaultdict(list)
+    for match in matches:
+        grouped[sent_codes.get(match[0])].append(match)
+    resultdict = {}
+    concresultdict = {}
+
+    # counts, and single columns without concordancing, need no formatting
+    # and can be done for every value at once, as show_this would
+    if kwargs.get('countmode'):
+        for code, category in enumerate(values):
+            resultdict[category], concresultdict[category] = len(grouped.get(code, [])), {}
+        return resultdict, concresultdict
+    if len(show) == 1 and show[0] in ['mw', 'ml', 'mp', 'mf'] and not conc \
+        and kwargs.get('gramsize', 1) == 1 and not kwargs.get('window'):
+        ordered = sorted(matches)
+        found = df.loc[ordered][show[0][-1]] if ordered else []
+        if ordered and not kwargs.get('preserve_case'):
+            found = found.str.lower()
+        shown = defaultdict(list)
+        for match, value in zip(ordered, found):
+            shown[sent_codes.get(match[0])].append(value)
+        for code, category in enumerate(values):
+            resultdict[category], concresultdict[category] = shown.get(code, []), {}
+        return resultdict, concresultdict
+
+    for code, (category, part) in enumerate(split_df_by_metadata(df, metadata, table, feature)):
+        if not grouped.get(code):
+            empty = (0, {}) if kwargs.get('countmode') else ([], [])
+            resultdict[category], concresultdict[category] = empty
+            continue
+        r, c = show_this(part, grouped[code], show, part._metadata, conc,
+                         category=category, **kwargs)
+        resultdict[category] = r
+        concresultdict[category] = c
+    return resultdict, concresultdict
+
 def load_raw_data(f):
     """
     Loads the stripped and raw versions of a parsed file
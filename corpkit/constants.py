@@ -62,6 +62,9 @@ CONLL_COLUMNS = ['i', 'w', 'l', 'p', 'e', 'v', 'g', 'f', 'd', 'c']
 # from getting matched unintentionally
 MAX_SPEAKERNAME_SIZE = 40
 
+# formats tried when reading metadata values as dates, i.e. date=2004-05-01
+METADATA_DATE_FORMATS = ['%Y-%m-%d', '%Y-%m', '%Y/%m/%d', '%Y-%m-%dT%H:%M:%S']
+
 # parsing sometimes fails with a java error. if corpus.parse(restart=True), this will try
 # parsing n times before giving up
 REPEAT_PARSE_ATTEMPTS = 3
@@ -74,7 +77,3 @@ REPEAT_PARSE_ATTEMPTS = 3
 # newest, beta
 CORENLP_VERSION = '3.7.0'
 CORENLP_URL  = 'http://nlp.stanford.edu/software/stanford-corenlp-full-2016-10-31.zip'
-
-# it can be very slow to load a bunch of unused metadata categories
-MAX_METADATA_FIELDS = 99
-MAX_METADATA_VALUES = 99
\ No newline at end of file
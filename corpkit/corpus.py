@@ -7,6 +7,7 @@ from __future__ import print_function
 from lazyprop import lazyprop
 from corpkit.process import classname
 from corpkit.constants import STRINGTYPE, PYTHON_VERSION
+from corpkit.resultcache import cached
 
 class Corpus(object):
     """
@@ -67,7 +68,7 @@ class Corpus(object):
         # moved into the determine_datatype() funct.
         
         if self.level == 'd':
-            self.singlefile = len(self._dlist) > 1
+            self.singlefile = len(self._dlist) == 1
         else:
             self.singlefile = False
             if os.path.isfile(self.path):
@@ -79,29 +80,26 @@ class Corpus(object):
             
             if self.path.endswith('-parsed') or self.path.endswith('-tokenised'):
 
-                for r, d, f in os.walk(self.path):
-                    if not f:
-                        continue
-                    if isinstance(f, str) and f.startswith('.'):
-                        continue
-                    if f[0].endswith('conll') or f[0].endswith('conllu'):
-                        self.datatype = 'conll'
-                        break
+                # missing or not a directory: the same errors listing it gives
+                if self.manifest is None:
+                    import errno
+                    code = errno.ENOTDIR if os.path.exists(self.path) else errno.ENOENT
+                    raise OSError(code, os.strerror(code), self.path)
+                exts = self.manifest.extensions()
+                if exts['.conll'] or exts['.conllu']:
+                    self.datatype = 'conll'
 
-                if len([d for d in os.listdir(self.path)
-                        if isdir(join(self.path, d))]) > 0:
+                if self.manifest.subdirs():
                     self.singlefile = False
-                if len([d for d in os.listdir(self.path)
-                        if isdir(join(self.path, d))]) == 0:
+                else:
                     self.level = 's'
             else:
                 if self.level == 'c':
                     if not self.datatype:
                         self.datatype, self.singlefile = determine_datatype(
                             self.path)
-                if isdir(self.path):
-                    if len([d for d in os.listdir(self.path)
-                            if isdir(join(self.path, d))]) == 0:
+                if self.level == 'c' and isdir(self.path):
+                    if not self.manifest.subdirs():
                         self.level = 's'
 
             # if initialised on a file, process as file
@@ -138,6 +136,17 @@ class Corpus(object):
             if self.print_info:
                 print('Corpus: %s' % self.path)
 
+    @lazyprop
+    def manifest(self):
+        """
+        The saved listing of the corpus' directories and files, with their
+        sizes, times and (once counted) sentences and tokens. See
+        :mod:`corpkit.manifest`.
+        """
+        from corpkit.manifest import get_manifest
+        if self.level in ['c', 's']:
+            return get_manifest(self.path)
+
     @lazyprop
     def subcorpora(self):
         """
@@ -152,10 +161,10 @@ class Corpus(object):
         if self.data.__class__ == Datalist or isinstance(self.data, (Datalist, list)):
             return self.data
         if self.level == 'c':
+            from corpkit.manifest import listing
             variable_safe_r = re.compile(r'[\W0-9_]+', re.UNICODE)
             sbs = Datalist(sorted([Subcorpus(join(self.path, d), self.datatype, **self.kwa)
-                                   for d in os.listdir(self.path)
-                                   if isdir(join(self.path, d))],
+                                   for d in listing(self.path)['dirs']],
                                   key=operator.attrgetter('name')), **self.kwa)
             for subcorpus in sbs:
                 variable_safe = re.sub(variable_safe_r, '',
@@ -184,8 +193,9 @@ class Corpus(object):
         import operator
         from os.path import join, isdir
         if self.level == 's':
-            fls = [f for f in os.listdir(self.path) if not f.startswith('.')]
-            fls = [File(f, self.path, self.datatype, **self.kwa) for f in fls]
+            from corpkit.manifest import listing
+            fls = [FileHandle(f, self.path, self.datatype, **self.kwa)
+                   for f in listing(self.path)['files']]
             fls = sorted(fls, key=operator.attrgetter('name'))
             return Datalist(fls, **self.kwa)
         elif self.level == 'd':
@@ -196,14 +206,20 @@ class Corpus(object):
         """
         Lazy-load a list of all filepaths in a corpus
         """
+        import os
+        from corpkit.manifest import listing
         if self.level == 'f':
             return [self.path]
-        if self.files:
-            return [i.path for i in self.files]
+        if self.level == 'd' or isinstance(self.data, (Datalist, list)):
+            if self.files:
+                return [i.path for i in self.files]
+            return [f.path for sc in self.subcorpora for f in sc.files]
+        if self.level == 's':
+            return [os.path.join(self.path, f) for f in listing(self.path)['files']]
         fs = []
-        for sc in self.subcorpora:
-            for f in sc.files:
-                fs.append(f.path)
+        for sc in listing(self.path)['dirs']:
+            path = os.path.join(self.path, sc)
+            fs.extend(path + os.sep + f for f in listing(path)['files'])
         return fs
 
     def conll_conform(self, errors='raise'):
@@ -364,7 +380,7 @@ class Corpus(object):
             del_from.__delitem__(key)
 
         elif isinstance(key, STRINGTYPE):
-            del_from.__delitem__(del_from.index(key))
+            del_from.__delitem__(key)
 
     @lazyprop
     def features(self):
@@ -548,6 +564,7 @@ class Corpus(object):
         from corpkit.configurations import configurations
         return configurations(self, search, **kwargs)
 
+    @cached
     def interrogate(self, search='w', *args, **kwargs):
         """
         Interrogate a corpus of texts for a lexicogrammatical phenomenon.
@@ -685,6 +702,25 @@ class Corpus(object):
         :param multiprocess: How many parallel processes to run
         :type multiprocess: `int`/`bool` (`bool` determines automatically)
 
+        :param max_memory: Memory budget for parallel processes, as bytes or a
+                           string like ``'16G'``. By default, 80 per cent of
+                           available memory. Fewer files are searched at once if
+                           the biggest ones would not fit. Files are not split, so
+                           a file too big for the budget is still searched whole,
+                           with a warning.
+        :type max_memory: `int`/`str`
+
+        :param progress: A function to call with progress counters (files,
+                         tokens, matches, bytes) while interrogating. The final
+                         counters are stored in ``query['telemetry']``.
+        :type progress: `function`
+
+        :param cluster: ``'host:port'`` addresses of worker daemons (started
+                        with ``corpkit worker``) to spread the search over.
+                        Daemons need the same files, relative to the corpus
+                        root, or a share of them.
+        :type cluster: `list`
+
         :param files_as_subcorpora: (**Deprecated, use subcorpora=files**). Treat each file as a subcorpus, ignoring 
                                     actual subcorpora if present
         :type files_as_subcorpora: `bool`
@@ -704,12 +740,18 @@ class Corpus(object):
         :param subcorpora: Use a metadata value as subcorpora. 
                            Passing a list will create a multiindex.
                            `'file'` and `'folder'`/`'default'` are also possible values.
-        :type subcorpora: `str`/`list`
+                           A ``(field, bins)`` tuple groups a numeric or date field into
+                           ranges: ``('year', 5)`` makes five-year bins, and
+                           ``('age', [0, 18, 65, 120])`` uses the given edges.
+        :type subcorpora: `str`/`list`/`tuple`
 
         :param just_metadata: One or more metadata fields and criteria to filter sentences by.
                               Only those matching will be kept. Criteria can be a list of words
                               or a regular expression. Passing ``{'speaker': 'ENVER'}``
                               will search only sentences annotated with ``speaker=ENVER``.
+                              A ``(low, high)`` tuple of numbers or dates keeps values in that
+                              inclusive range, i.e. ``{'year': (1990, 1999)}``. Either end
+                              can be `None`.
         :type just_metadata: `dict`
 
         :param skip_metadata: A field and regex/list to filter sentences by.
@@ -723,13 +765,55 @@ class Corpus(object):
                         of results (i.e. 0.1 will remove 10 per cent)
         :type discard: ``int``/``float``
 
-        :returns: A :class:`corpkit.interrogation.Interrogation` object, with 
-                  `.query`, `.results`, `.totals` attributes. If multiprocessing is 
+        :param sparse: Store results as a sparse matrix. Use this when there are
+                       very many unique results (i.e. n-grams over many subcorpora),
+                       most of which are zero in most subcorpora.
+        :type sparse: ``bool``
+
+        :param approx_topk: Keep only about this many of the most frequent results per
+                            subcorpus, using a fixed amount of memory. Counts may be
+                            underestimated by at most the value stored for each subcorpus
+                            in ``query['approx_error']``, which is never more than the
+                            number of results divided by ``approx_topk``.
+        :type approx_topk: ``int``
+
+        :param approx: Estimate the results from a sample of files, stratified by
+                       subcorpus and weighted by tokens, growing the sample until the
+                       95% confidence interval of each subcorpus' total is within this
+                       relative error, i.e. ``0.05``. Counts are scaled up estimates;
+                       ``query['approx_interval']`` holds ``(lower, upper)`` bounds for
+                       every cell, and ``query['approx_fraction']`` the share of each
+                       subcorpus searched. Only works with folder subcorpora, and
+                       without concordancing.
+        :type approx: ``float``
+
+        :param incremental: Keep what each file contributed to the results, so that
+                            :func:`~corpkit.interrogation.Interrogation.refresh` can
+                            bring them up to date by searching only new and changed
+                            files. Files are searched in this process, and only
+                            CONLL searches of a corpus or subcorpus can be refreshed.
+        :type incremental: ``bool``
+
+        :param cache: Reuse the result of the same query over the same files from
+                      the result cache in ``~/.corpkit/results``, and cache new
+                      results there. Off unless ``CORPKIT_RESULT_CACHE`` is set
+                      to a directory to keep results in. Results are thrown away
+                      when a file is added, removed or replaced, but not when a
+                      file is edited in place. Searches with `on_subcorpus`,
+                      `progress` or `telemetry` always run.
+        :type cache: ``bool``
+
+        :returns: A :class:`corpkit.interrogation.Interrogation` object, with
+                  `.query`, `.results`, `.totals` attributes. If multiprocessing is
                   invoked, result may be multiindexed.
         """
         from corpkit.interrogator import interrogator
+        from corpkit.conll import binned_field
         import pandas as pd
         par = kwargs.pop('multiprocess', None)
+        approx = kwargs.pop('approx', False)
+        incremental = kwargs.pop('incremental', False)
+        partials = kwargs.pop('partials', None)
         kwargs.pop('corpus', None)
 
         if self.datatype != 'conll':
@@ -763,17 +847,37 @@ class Corpus(object):
 
         kwargs.pop('subcorpora', False)
 
-        if par and self.subcorpora:
-            if isinstance(par, int):
-                kwargs['multiprocess'] = par
-            res = interrogator(self.subcorpora, search,
-                                subcorpora=subcorpora, *args, **kwargs)
+        # keep what each file finds, and how to search again
+        if incremental and partials is None:
+            if approx or kwargs.get('conc') == 'only':
+                raise ValueError('Incremental interrogation needs every file counted.')
+            if self.level not in ['c', 's']:
+                raise ValueError('Only corpora and subcorpora can be interrogated incrementally.')
+            from corpkit.partials import Partials
+            call = dict(kwargs)
+            if subcorpora:
+                call['subcorpora'] = subcorpora
+            partials = Partials(self.path, self.level, self.datatype, search, args, call)
+        if partials is not None:
+            kwargs['partials'] = partials
+
+        # with multiprocessing, files are sharded over a pool of workers
+        kwargs['multiprocess'] = par
+        if getattr(self, 'workers', None) is not None:
+            kwargs.setdefault('workers', self.workers)
+        if approx:
+            from corpkit.sampling import approx_interrogate
+            if self.level != 's' and (subcorpora or kwargs.get('files_as_subcorpora')):
+                raise ValueError('approx only works with folder subcorpora.')
+            kwargs.pop('files_as_subcorpora', None)
+            res = approx_interrogate(self, search, approx,
+                                     seed=kwargs.pop('approx_seed', None), **kwargs)
         else:
-            kwargs['multiprocess'] = par
             res = interrogator(self, search,
-                                subcorpora=subcorpora, *args, **kwargs)
+                               subcorpora=subcorpora, *args, **kwargs)
 
-        if kwargs.get('conc', False) == 'only':
+        # stopped with the cancel event, or conc only
+        if res is None or kwargs.get('conc', False) == 'only':
             return res
 
         from corpkit.interrogation import Interrodict
@@ -783,20 +887,36 @@ class Corpus(object):
             return res.multiindex()
         else:
             if subcorpora:
-                res.results.index.name = subcorpora
+                res.results.index.name = subcorpora[0] if binned_field(subcorpora) else subcorpora
 
 
         # sort by total
+        from corpkit.process import is_sparse
         ind = list(res.results.index)
         if isinstance(res.results, pd.DataFrame):
-            if not res.results.empty:
+            # sparse results are already sorted, and casting would densify them
+            sparse = is_sparse(res.results)
+            if not res.results.empty and not sparse:
                 res.results = res.results[list(res.results.sum().sort_values(ascending=False).index)]
                 res.results = res.results.astype(int)
 
             if all(i == 'none' or str(i).isdigit() for i in ind):
                 longest = max([len(str(i)) if str(i).isdigit() else 1 for i in ind])
                 res.results.index = [str(i).zfill(longest) for i in ind]
-                res.results = res.results.sort_index().astype(int)
+                res.results = res.results.sort_index()
+                if 'approx_interval' in res.query:
+                    bounds = []
+                    for bound in res.query['approx_interval']:
+                        bound.index = [str(i).zfill(longest) for i in ind]
+                        bounds.append(bound)
+                    res.query['approx_interval'] = tuple(bounds)
+                if not sparse:
+                    res.results = res.results.astype(int)
+
+            # keep the bounds of estimates in the same order as the results
+            if 'approx_interval' in res.query:
+                res.query['approx_interval'] = tuple(b.reindex_like(res.results)
+                                                     for b in res.query['approx_interval'])
         else:
             show = res.query.get('show', [])
             outs = []
@@ -810,7 +930,50 @@ class Corpus(object):
                 res.results.name = name
         return res
 
-    def sample(self, n, level='f'):
+    def ainterrogate(self, *args, **kwargs):
+        """
+        Interrogate without blocking an `asyncio` event loop. Takes the same
+        arguments as :func:`~corpkit.corpus.Corpus.interrogate`, plus
+        `executor`. The interrogation runs in the event loop's thread pool,
+        unless another executor is given. Cancelling the task stops the
+        interrogation after the file being searched. Python 3 only.
+
+        :Example:
+
+        >>> result = await corpus.ainterrogate({W: r'^c'}, printstatus=False)
+
+        :param executor: Where to run the interrogation
+        :type executor: `concurrent.futures.Executor`
+
+        :returns: A coroutine returning a :class:`corpkit.interrogation.Interrogation`
+        """
+        if PYTHON_VERSION == 2:
+            raise NotImplementedError('ainterrogate needs Python 3.')
+        from corpkit.aio import ainterrogate
+        return ainterrogate(self, *args, **kwargs)
+
+    def ainterrogate_stream(self, *args, **kwargs):
+        """
+        Like :func:`~corpkit.corpus.Corpus.ainterrogate`, but results for each
+        subcorpus (counts and new concordance lines) can be read as soon as
+        that subcorpus is done. Python 3 only.
+
+        :Example:
+
+        >>> stream = corpus.ainterrogate_stream({W: r'^c'}, conc=True)
+        >>> async for part in stream:
+        ...     print(part.name, part.results[part.name].most_common(5))
+        >>> result = await stream.result()
+
+        :returns: A :class:`corpkit.aio.InterrogationStream`
+        """
+        if PYTHON_VERSION == 2:
+            raise NotImplementedError('ainterrogate_stream needs Python 3.')
+        from corpkit.aio import InterrogationStream
+        executor = kwargs.pop('executor', None)
+        return InterrogationStream(self, args, kwargs, executor=executor)
+
+    def sample(self, n, level='f', stratified=False, seed=None):
         """
         Get a sample of the corpus
 
@@ -819,32 +982,35 @@ class Corpus(object):
         :type n: ``int``/``float``
         :param level: sample subcorpora (``s``) or files (``f``)
         :type level: ``str``
+        :param stratified: when sampling files, draw from each subcorpus in
+                           proportion to its number of tokens
+        :type stratified: ``bool``
+        :param seed: seed for the random number generator, to get the same
+                     sample again
+        :type seed: ``int``
         :returns: a Corpus object
         """
         import random
+        rng = random.Random(seed)
 
-        if isinstance(n, int):
-            if level.lower().startswith('s'):
-                rs = random.sample(list(self.subcorpora), n)
-                rs = sorted(rs, key=lambda x: x.name)
-                return Corpus(Datalist(rs),
-                              print_info=False, datatype='conll')
-            else:
-                fps = list(self.all_files)
-                dl = Datalist(random.sample(fps, n))
-                return Corpus(dl, level='d',
-                              print_info=False, datatype='conll')
-        elif isinstance(n, float):
-            if level.lower().startswith('s'):
-                fps = list(self.subcorpora)
-                n = len(fps) / n
-                return Corpus(Datalist(random.sample(fps, n)),
-                              print_info=False, datatype='conll')
-            else:
-                fps = list(self.all_files)
-                n = len(fps) / n
-                return Corpus(Datalist(random.sample(fps, n)), level='d',
-                              print_info=False, datatype='conll')
+        if level.lower().startswith('s'):
+            fps = list(self.subcorpora)
+        else:
+            fps = list(self.all_files)
+        if isinstance(n, float):
+            n = max(int(round(len(fps) * n)), 1)
+
+        if level.lower().startswith('s'):
+            rs = sorted(rng.sample(fps, n), key=lambda x: x.name)
+            return Corpus(Datalist(rs),
+                          print_info=False, datatype='conll')
+        elif stratified:
+            from corpkit.sampling import stratified_sample
+            dl = Datalist(stratified_sample(self, n, seed=seed))
+        else:
+            dl = Datalist(rng.sample(fps, n))
+        return Corpus(dl, level='d',
+                      print_info=False, datatype='conll')
 
     def delete_metadata(self):
         """
@@ -1032,6 +1198,42 @@ class Corpus(object):
         kwargs.pop('corpus', None)
         return self.interrogate(conc='only', *args, **kwargs)
 
+    def start_workers(self, processes=None, cache_size=64):
+        """
+        Start a pool of worker processes that stays alive between
+        interrogations of this corpus. Workers keep recently searched files
+        in memory, so repeated queries are much faster.
+
+        :Example:
+
+        >>> with corpus.start_workers(8):
+        ...     nouns = corpus.interrogate({W: r'^n'})
+        ...     verbs = corpus.interrogate({W: r'^v'})
+
+        :param processes: Number of worker processes (default: one per core)
+        :type processes: `int`
+
+        :param cache_size: Number of parsed files each worker keeps in memory
+        :type cache_size: `int`
+
+        :returns: A :class:`corpkit.multiprocess.WorkerPool`, which can be used
+                  as a context manager to stop the workers
+        """
+        from corpkit.multiprocess import WorkerPool
+        self.stop_workers()
+        self.workers = WorkerPool(processes, cache_size=cache_size)
+        return self.workers
+
+    def stop_workers(self):
+        """
+        Stop any worker processes started by
+        :func:`~corpkit.corpus.Corpus.start_workers`
+        """
+        workers = getattr(self, 'workers', None)
+        if workers is not None:
+            workers.close()
+        self.workers = None
+
     def interroplot(self, search, **kwargs):
         """
         Interrogate, relativise, then plot, with very little customisability.
@@ -1188,15 +1390,12 @@ class Subcorpus(Corpus):
 
         from corpkit.process import makesafe
 
-        if isinstance(key, slice):
-            # Get the start, stop, and step from the slice
-            key = list(key.indices(len(self.files)))
-            return Datalist(list(self.files)[slice(*key)])
-            #bits = [self[i] for i in range(*key.indices(len(self.files)))]
-            #return [self[ii] for ii in range(*key.indices(len(self.files)))])
-        elif isinstance(key, int):
-            return list(self.files)[key]
+        if isinstance(key, (slice, int)):
+            return self.files[key]
         else:
+            found = self.files[key]
+            if found is not None:
+                return found
             try:
                 return self.files.__getattribute__(key)
             except:
@@ -1268,8 +1467,11 @@ class File(Corpus):
         if self.datatype == 'conll':
             from nltk import Tree
             from collections import OrderedDict
-            return OrderedDict({k: Tree.fromstring(v['parse']) \
-                                for k, v in sorted(self.document._metadata.items())})
+            from corpkit.process import get_trees
+            metadata = self.document._metadata
+            ids = sorted(metadata)
+            # copies, as the parsed trees are shared with searches
+            return OrderedDict(zip(ids, [Tree.convert(t) for t in get_trees(self.path, metadata, ids)]))
         else:
             raise AttributeError('Data must be parsed to get trees.')
 
@@ -1287,7 +1489,80 @@ class File(Corpus):
             self.read()
         return '\n'.join(text)
 
+class FileHandle(object):
+    """
+    A light stand-in for :class:`corpkit.corpus.File`, used for the files of
+    a subcorpus. It holds only the path, name, datatype and filters, so that
+    listing a big corpus doesn't make a full :class:`corpkit.corpus.File`
+    for every file. Anything else (`document`, `read`, `interrogate` and so
+    on) comes from a :class:`corpkit.corpus.File` made the first time it is
+    needed.
+    """
+    __slots__ = ['path', 'name', 'datatype', 'symbolic', 'just', 'skip', '_file']
+
+    level = 'f'
+    singlefile = True
+    data = None
+    print_info = False
+
+    def __init__(self, path, dirname=False, datatype=False, **kwa):
+        import os
+        if dirname:
+            self.path = os.path.join(dirname, path)
+            self.name = path
+        else:
+            self.path = path
+            self.name = os.path.basename(path)
+        if self.path.endswith(('.conll', '.conllu')):
+            self.datatype = 'conll'
+        else:
+            self.datatype = 'plaintext'
+        self.symbolic = kwa.get('subcorpora', False)
+        self.just = kwa.get('just', False)
+        self.skip = kwa.get('skip', False)
+        self._file = None
+
+    @property
+    def kwa(self):
+        return {'skip': self.skip, 'just': self.just, 'symbolic': self.symbolic}
+
+    @property
+    def file(self):
+        """
+        The full :class:`corpkit.corpus.File`
+        """
+        if self._file is None:
+            self._file = File(self.path, datatype=self.datatype, **self.kwa)
+        return self._file
+
+    def __getattr__(self, key):
+        if key.startswith('__') or key in FileHandle.__slots__:
+            raise AttributeError(key)
+        return getattr(self.file, key)
+
+    def __getstate__(self):
+        return {k: getattr(self, k) for k in FileHandle.__slots__ if k != '_file'}
+
+    def __setstate__(self, state):
+        self._file = None
+        for k, v in state.items():
+            setattr(self, k, v)
+
+    def __getitem__(self, key):
+        return self.file[key]
+
+    def __repr__(self):
+        return "<File instance: %s>" % self.name
+
+    def __str__(self):
+        return self.path
+
 class Datalist(list):
+    """
+    A list of subcorpora or files, which can also be indexed by name. Names
+    are looked up in a `dict` of positions, made when first needed and
+    thrown away whenever the list changes.
+    """
 
     def __init__(self, data, **kwargs):
 
@@ -1299,8 +1574,26 @@ class Datalist(list):
     def __repr__(self):
         return "<%s instance: %d items>" % (classname(self), len(self))
 
+    def _position(self, name):
+        """
+        Index of the first item called `name`, or `None`
+        """
+        # __dict__, not getattr, so that a missing index isn't looked up as a name
+        names = self.__dict__.get('_names')
+        if names is None:
+            names = {}
+            for i, d in enumerate(self):
+                names.setdefault(getattr(d, 'name', None), i)
+            self.__dict__['_names'] = names
+        return names.get(name)
+
+    def _changed(self):
+        self.__dict__.pop('_names', None)
+
     def __getattr__(self, key):
-        ix = next((i for i, d in enumerate(self) if d.name == key), None)
+        if key.startswith('__'):
+            raise AttributeError(key)
+        ix = self._position(key)
         if ix is not None:
             return self[ix]
 
@@ -1308,12 +1601,14 @@ class Datalist(list):
         from corpkit.constants import STRINGTYPE
         
         if isinstance(key, slice):
-            return Datalist([self[i] for i in range(*key.indices(len(self)))])
+            return Datalist(super(Datalist, self).__getitem__(key))
         
         elif isinstance(key, list):
             if isinstance(key[0], STRINGTYPE):
+                key = set(key)
                 dats = [i for i in self if i.name in key]
             else:
+                key = set(key)
                 dats = [x for i, x in enumerate(self) if i in key]
             return Datalist(dats)
 
@@ -1321,18 +1616,54 @@ class Datalist(list):
             return super(Datalist, self).__getitem__(key)
 
         elif isinstance(key, STRINGTYPE):
-            ix = next((i for i, x in enumerate(self) if x.name == key), None)
+            ix = self._position(key)
             if ix is not None:
                 return super(Datalist, self).__getitem__(ix)
 
     def __delitem__(self, key):
         from corpkit.constants import STRINGTYPE
         if isinstance(key, STRINGTYPE):
-            key = next((i for i, d in enumerate(self) if d.name == key), None)
+            key = self._position(key)
             if key is None:
                 return
         super(Datalist, self).__delitem__(key)
+        self._changed()
+
+    def __setitem__(self, key, value):
+        super(Datalist, self).__setitem__(key, value)
+        self._changed()
+
+    def __iadd__(self, other):
+        self._changed()
+        return super(Datalist, self).__iadd__(other)
+
+    def append(self, item):
+        super(Datalist, self).append(item)
+        self._changed()
+
+    def extend(self, items):
+        super(Datalist, self).extend(items)
+        self._changed()
+
+    def insert(self, index, item):
+        super(Datalist, self).insert(index, item)
+        self._changed()
+
+    def remove(self, item):
+        super(Datalist, self).remove(item)
+        self._changed()
+
+    def pop(self, *args):
+        self._changed()
+        return super(Datalist, self).pop(*args)
+
+    def sort(self, *args, **kwargs):
+        super(Datalist, self).sort(*args, **kwargs)
+        self._changed()
 
+    def reverse(self):
+        super(Datalist, self).reverse()
+        self._changed()
 
     def interrogate(self, *args, **kwargs):
         """
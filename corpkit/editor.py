@@ -800,9 +800,14 @@ def editor(interrogation,
     except:
         pass
 
+    # sparse counts have no infinites or nans, and replacing would densify
+    from corpkit.process import is_sparse, sparse_sum
+    sparse = is_sparse(df)
+
     # drop infinites and nans
-    df = df.replace([np.inf, -np.inf], np.nan)
-    df = df.fillna(0.0)
+    if not sparse:
+        df = df.replace([np.inf, -np.inf], np.nan)
+        df = df.fillna(0.0)
 
     if just_totals:
         df = DataFrame(df.sum(), columns=['Combined total'])
@@ -812,7 +817,7 @@ def editor(interrogation,
             else:
                 df2 = df2.sum()
 
-    tots = df.sum(axis=1)
+    tots = sparse_sum(df, axis=1) if sparse else df.sum(axis=1)
 
     if using_totals or outputmode:
         if not operation.startswith('k'):
@@ -851,9 +856,10 @@ def editor(interrogation,
                       measure=keyword_measure,
                       **kwargs)
     
-    # drop infinites and nans
-    df = df.replace([np.inf, -np.inf], np.nan)
-    df = df.fillna(0.0)
+    # drop infinites and nans, unless still sparse
+    if not is_sparse(df):
+        df = df.replace([np.inf, -np.inf], np.nan)
+        df = df.fillna(0.0)
 
     # resort data
     if sort_by or keep_stats:
@@ -25,6 +25,8 @@ class Interrogation(object):
         """`dict` containing values that generated the result"""
         self.concordance = concordance
         """pandas `DataFrame` containing concordance lines, if concordance lines were requested."""
+        self.partials = None
+        """:class:`corpkit.partials.Partials` holding what each file found, if interrogated with `incremental=True`."""
 
     def __str__(self):
         if self.query.get('corpus'):
@@ -408,6 +410,41 @@ class Interrogation(object):
         from corpkit.other import save
         save(self, savename, savedir=savedir, **kwargs)
 
+    def refresh(self, **kwargs):
+        """
+        Bring the results of an incremental interrogation up to date with its
+        corpus, searching only the files that are new or have changed since,
+        and dropping the files that have been deleted. What changed and
+        deleted files found before is taken off the totals kept in `partials`,
+        so unchanged files aren't added up again. Results, totals,
+        concordance and query are replaced in place.
+
+        :Example:
+
+        >>> data = corpus.interrogate({W: r'^th'}, incremental=True)
+        ### add, edit or delete files in the corpus
+        >>> data.refresh()
+        >>> data.query['incremental']
+        {'searched': 3, 'reused': 49997, 'removed': 0}
+
+        :param kwargs: Arguments to change for this interrogation, i.e.
+                       `quiet`
+        
+        :returns: This interrogation
+        """
+        partials = getattr(self, 'partials', None)
+        if partials is None:
+            raise ValueError('Only interrogations made with incremental=True can be refreshed.')
+        call = dict(partials.kwargs, **kwargs)
+        call['cache'] = False
+        new = partials.corpus().interrogate(partials.search, *partials.args,
+                                            partials=partials, **call)
+        self.results = new.results
+        self.totals = new.totals
+        self.query = new.query
+        self.concordance = new.concordance
+        return self
+
     def quickview(self, n=25):
         """view top n results as painlessly as possible.
 
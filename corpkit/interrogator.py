@@ -32,6 +32,8 @@ def interrogator(corpus,
     no_closed=False,
     no_punct=True,
     discard=False,
+    sparse=False,
+    approx_topk=False,
     **kwargs):
     """
     Interrogate corpus, corpora, subcorpus and file objects.
@@ -44,6 +46,15 @@ def interrogator(corpus,
     show_conc_metadata = kwargs.pop('show_conc_metadata', False)
     fsi_index = kwargs.pop('fsi_index', True)
     dep_type = kwargs.pop('dep_type', 'collapsed-ccprocessed-dependencies')
+    workers = kwargs.pop('workers', None)
+    partial = kwargs.pop('partial', False)
+    telemetry = kwargs.pop('telemetry', None)
+    progress = kwargs.pop('progress', None)
+    max_memory = kwargs.pop('max_memory', None)
+    cluster = kwargs.pop('cluster', None)
+    on_subcorpus = kwargs.pop('on_subcorpus', None)
+    cancel = kwargs.pop('cancel', None)
+    partials = kwargs.pop('partials', None)
 
     nosubmode = subcorpora is None
     #todo: temporary
@@ -54,6 +65,7 @@ def interrogator(corpus,
     locs = locals().copy()
     locs.update(kwargs)
     locs.pop('kwargs', None)
+    locs.pop('partials', None)
 
     import codecs
     import signal
@@ -65,15 +77,17 @@ def interrogator(corpus,
     from pandas import DataFrame, Series
 
     from corpkit.interrogation import Interrogation, Interrodict
-    from corpkit.corpus import Datalist, Corpora, Corpus, File, Subcorpus
+    from corpkit.corpus import Datalist, Corpora, Corpus, File, FileHandle, Subcorpus
     from corpkit.process import (tregex_engine, get_deps, unsplitter, sanitise_dict, 
                                  animator, filtermaker, fix_search,
                                  pat_format, auto_usecols, format_tregex,
-                                 make_conc_lines_from_whole_mid)
+                                 make_conc_lines_from_whole_mid, tregex_spans,
+                                 format_tregex_spans, make_conc_lines_from_spans,
+                                 sentences_by_metadata)
     from corpkit.other import as_regex
     from corpkit.dictionaries.process_types import Wordlist
     from corpkit.build import check_jdk
-    from corpkit.conll import pipeline
+    from corpkit.conll import pipeline, binned_field
     from corpkit.process import delete_files_and_subcorpora
     
     have_java = check_jdk()
@@ -184,10 +198,13 @@ def interrogator(corpus,
         if isinstance(query, Wordlist):
             query = list(query)
 
-        if subcorpora and multiprocess:
+        # one field is grouped by while searching each file, so only
+        # several fields need an interrogation for each value
+        one_field = isinstance(subcorpora, STRINGTYPE) or binned_field(subcorpora)
+        if subcorpora and multiprocess and not one_field:
             is_mul = 'subcorpora'
 
-        if isinstance(subcorpora, (list, tuple)):
+        if isinstance(subcorpora, (list, tuple)) and not one_field:
             is_mul = 'subcorpora'
 
         if isinstance(query, (dict, OrderedDict)):
@@ -241,6 +258,11 @@ def interrogator(corpus,
             else:
                 raise ValueError('%s: Query %s' % (thetime, error_message))
 
+    def tree_index_can(search):
+        """Check if the tree index can do every tree query"""
+        from corpkit.treeindex import supported
+        return all(supported(v) for k, v in search.items() if k.endswith('t'))
+
     def determine_search_func(show):
         """Figure out what search function we're using"""
 
@@ -258,6 +280,8 @@ def interrogator(corpus,
         if search.get('t') and simp_crit:
             if have_java:
                 simple_tregex_mode = True
+            elif datatype == 'conll' and tree_index_can(search):
+                search_trees = 'tregex'
             else:
                 search_trees = 'tgrep'
             optiontext = 'Searching parse trees'
@@ -265,7 +289,8 @@ def interrogator(corpus,
         elif datatype == 'conll':
         
             if any(i.endswith('t') for i in search.keys()):
-                if have_java and not kwargs.get('tgrep'):
+                # without java, the tree index can still do most tregex queries
+                if not kwargs.get('tgrep') and (have_java or tree_index_can(search)):
                     search_trees = 'tregex'
                 else:
                     search_trees = 'tgrep'
@@ -293,13 +318,16 @@ def interrogator(corpus,
         translated_option = 't'
         if isinstance(search['t'], Wordlist):
             search['t'] = list(search['t'])
-        q = tregex_engine(corpus=False,
-                          query=search.get('t'),
-                          options=['-t'],
-                          check_query=True,
-                          root=root,
-                          preserve_case=preserve_case
-                         )
+        # without java, tgrep is used, and it checks the query itself
+        q = True
+        if have_java:
+            q = tregex_engine(corpus=False,
+                              query=search.get('t'),
+                              options=['-t'],
+                              check_query=True,
+                              root=root,
+                              preserve_case=preserve_case
+                             )
 
         # so many of these bad fixing loops!
         nshow = []
@@ -378,9 +406,9 @@ def interrogator(corpus,
             if corpus.level in ['s', 'f', 'd']:
                 return {(corpus.name, corpus.path): False}
             else:
-                return {(os.path.basename(i), os.path.join(corpus.path, i)): False
-                    for i in os.listdir(corpus.path)
-                    if os.path.isdir(os.path.join(corpus.path, i))}
+                from corpkit.manifest import listing
+                return {(i, os.path.join(corpus.path, i)): False
+                    for i in listing(corpus.path)['dirs']}
 
         if isinstance(corpus, Datalist):
             to_iterate_over = {}
@@ -576,7 +604,7 @@ def interrogator(corpus,
             line[star:en] = [correct_spelling(str(b)) for b in line[star:en]]
         return line
 
-    def make_progress_bar():
+    def make_progress_bar(draw=True):
         """generate a progress bar"""
 
         if simple_tregex_mode:
@@ -593,7 +621,7 @@ def interrogator(corpus,
                     'denom': kwargs.get('denominator', 1)}
 
         term = None
-        if kwargs.get('paralleling', None) is not None:
+        if kwargs.get('paralleling', None) is not None and draw:
             from blessings import Terminal
             term = Terminal()
             par_args['terminal'] = term
@@ -607,6 +635,9 @@ def interrogator(corpus,
             outn = getattr(outn, 'name', outn)
             outn = outn + ': '
 
+        if not draw:
+            return None, outn, total_files, par_args
+
         tstr = '%s%d/%d' % (outn, current_iter, total_files)
         p = animator(None, None, init=True, tot_string=tstr, **par_args)
         tstr = '%s%d/%d' % (outn, current_iter + 1, total_files)
@@ -618,13 +649,20 @@ def interrogator(corpus,
     note = kwargs.get('note')
     language_model = kwargs.get('language_model')
 
-    # set up pause method
+    # set up pause method. signals can only be handled in the main
+    # thread, so not when run in the background, i.e. by ainterrogate
+    import threading
+    main_thread = threading.current_thread().name == 'MainThread'
     original_sigint = signal.getsignal(signal.SIGINT)
     if kwargs.get('paralleling', None) is None:
-        if not root:
+        if not root and main_thread:
             original_sigint = signal.getsignal(signal.SIGINT)
             signal.signal(signal.SIGINT, signal_handler)
 
+    def restore_sigint():
+        if main_thread:
+            signal.signal(signal.SIGINT, original_sigint)
+
     # find out about concordancing
     only_conc = False
     no_conc = False
@@ -635,17 +673,33 @@ def interrogator(corpus,
         no_conc = False
     numconc = 0
 
+    if isinstance(corpus, FileHandle):
+        corpus = corpus.file
+
     # wipe non essential class attributes to not bloat query attrib
     if isinstance(corpus, Corpus):
         import copy
         corpus = copy.copy(corpus)
-        for k, v in corpus.__dict__.items():
-            if isinstance(v, (Interrogation, Interrodict)):
+        from corpkit.multiprocess import WorkerPool
+        for k, v in list(corpus.__dict__.items()):
+            if isinstance(v, (Interrogation, Interrodict, WorkerPool)):
                 corpus.__dict__.pop(k, None)
 
+    # worker daemons can search a corpus the coordinator does not have
+    if cluster:
+        from corpkit.cluster import Cluster
+        if not isinstance(cluster, Cluster):
+            cluster = Cluster(cluster)
+        if isinstance(corpus, STRINGTYPE) and os.path.isdir(corpus):
+            corpus = Corpus(corpus, print_info=False)
+        elif isinstance(corpus, STRINGTYPE):
+            corpus = cluster.corpus(corpus)
+        elif getattr(corpus, 'level', None) != 'c':
+            raise ValueError('Cluster interrogation needs a whole corpus.')
+
     # convert path to corpus object
     if not isinstance(corpus, (Corpus, Corpora, Subcorpus, File, Datalist)):
-        if not multiprocess and not kwargs.get('outname'):
+        if not kwargs.get('outname') and not cluster:
             corpus = Corpus(corpus, print_info=False)
 
     # figure out how the user has entered the query and show, and normalise
@@ -672,13 +726,21 @@ def interrogator(corpus,
     if isinstance(corpus, Corpora):
         im = 'multiplecorpora'
 
-    # split corpus if the user wants multiprocessing but no other iterable
-    if not im and multiprocess:
-        im = 'datalist'
-        if getattr(corpus, 'subcorpora', False):
-            corpus = corpus[:]
-        else:
-            corpus = corpus.files
+    # if the user wants multiprocessing but there is no other iterable,
+    # shard the files over a pool of workers
+    if workers is not None and workers.closed:
+        workers = None
+    sharded = not im and (bool(multiprocess) or workers is not None or bool(cluster))
+
+    # incremental interrogations keep what each file found, so files are
+    # searched here, one by one
+    if partials is not None:
+        if im:
+            raise ValueError('Incremental interrogation needs a single corpus and query.')
+        if approx_topk:
+            raise ValueError('Incremental interrogation needs every file counted.')
+        sharded = False
+        multiprocess = False
 
     search = fix_search(search, case_sensitive=case_sensitive, root=root)
     exclude = fix_search(exclude, case_sensitive=case_sensitive, root=root)
@@ -696,7 +758,9 @@ def interrogator(corpus,
 
     # send to multiprocess function
     if im:
-        signal.signal(signal.SIGINT, original_sigint)
+        locs['progress'] = progress
+        locs['max_memory'] = max_memory
+        restore_sigint()
         from corpkit.multiprocess import pmultiquery
         return pmultiquery(**locs)
 
@@ -714,7 +778,12 @@ def interrogator(corpus,
         
     # store all results in here
     from collections import defaultdict
-    results = defaultdict(Counter)
+    if approx_topk:
+        # a bounded heavy-hitters summary per subcorpus
+        from corpkit.sketch import TopK
+        results = defaultdict(lambda: TopK(approx_topk))
+    else:
+        results = defaultdict(Counter)
     count_results = defaultdict(list)
     conc_results = defaultdict(list)
 
@@ -732,6 +801,14 @@ def interrogator(corpus,
 
     # Determine the search function to be used #
     optiontext, simple_tregex_mode, statsmode, tree_to_text, search_trees = determine_search_func(show)
+
+    # whole-subcorpus tregex searches run concurrently on threads instead
+    if simple_tregex_mode:
+        if cluster:
+            raise ValueError('Cluster interrogation needs a CONLL corpus.')
+        if partials is not None:
+            raise ValueError('Incremental interrogation needs a CONLL search.')
+        sharded = False
     
     # no conc for statsmode
     if statsmode:
@@ -759,6 +836,41 @@ def interrogator(corpus,
     # make iterable object for corpus interrogation
     to_iterate_over = make_search_iterable(corpus)
 
+    # with metadata filters, skip files with no sentences that pass them,
+    # and only parse the sentences that do
+    sentence_filter = None
+    emptied = set()
+    if (just_metadata or skip_metadata) and datatype == 'conll' \
+        and not getattr(corpus, '_dlist', False) and not isinstance(corpus, Datalist) \
+        and os.path.isdir(getattr(corpus, 'path', '')):
+        index = sentences_by_metadata(corpus.path, just_metadata, skip_metadata)
+        if index is not None:
+            index = {os.path.abspath(k): v for k, v in index.items()}
+            sentence_filter = {}
+            for key, files in to_iterate_over.items():
+                if not isinstance(files, list):
+                    continue
+                kept = []
+                for f in files:
+                    sents = index.get(os.path.abspath(f.path))
+                    if sents is None or sents:
+                        kept.append(f)
+                    if sents:
+                        sentence_filter[f.path] = sents
+                if files and not kept:
+                    emptied.add(key[1])
+                to_iterate_over[key] = kept
+
+    # incremental interrogations only search new and changed files, and
+    # start from what the others found last time
+    if partials is not None:
+        partials.start(to_iterate_over)
+        for key, counted in partials.totals.items():
+            if countmode:
+                count_results[key].append(counted)
+            else:
+                results[key] += counted
+
     try:
         nam = get_ipython().__class__.__name__
         if nam == 'ZMQInteractiveShell':
@@ -785,18 +897,206 @@ def interrogator(corpus,
     # print welcome message
     welcome_message = welcome_printer(return_it=in_notebook)
 
-    # create a progress bar
-    p, outn, total_files, par_args = make_progress_bar()
+    # create a progress bar, unless counters are being sent to pmultiquery,
+    # or a single thread is drawing progress for sharded workers
+    show_monitor = sharded and kwargs.get('printstatus', True) and not root and not in_notebook
+    draw_bar = telemetry is None and not show_monitor
+    p, outn, total_files, par_args = make_progress_bar(draw=draw_bar)
+
+    reporter = None
+    monitor = None
+    if telemetry is not None:
+        from corpkit.telemetry import TelemetryReporter
+        reporter = TelemetryReporter(telemetry)
+        reporter.add(total=total_files)
+    elif sharded or progress:
+        from corpkit.telemetry import Telemetry
+        monitor = Telemetry(total_files, callback=progress, show=show_monitor).start()
+
+    def update_progress(current_iter, res=None, path=None):
+        """
+        Move the progress bar on, and count files, tokens, matches and bytes
+        """
+        if reporter is not None or (monitor is not None and not sharded):
+            from corpkit.telemetry import count_matches
+            counts = {'files': 1,
+                      'matches': count_matches(res),
+                      'tokens': pipeline_kwargs.get('stats', {}).get('tokens', 0),
+                      'bytes': os.path.getsize(path) if path and os.path.isfile(path) else 0}
+            (reporter or monitor).add(**counts)
+        if draw_bar:
+            tstr = '%s%d/%d' % (outn, current_iter + 1, total_files)
+            animator(p, current_iter, tstr, **par_args)
 
     if conc:
         conc_col_names = get_conc_colnames(corpus,
                                            fsi_index=fsi_index,
                                            simple_tregex_mode=False)
 
- 
+    # how many conc lines have been sent to on_subcorpus, and which
+    # metadata values have changed since the last call
+    conc_sent = Counter()
+    touched = set()
+
+    def report_subcorpus(subcorpus_name):
+        """
+        Give on_subcorpus the counts and new conc lines of a finished subcorpus
+        """
+        if on_subcorpus is None:
+            return
+        keys = set(touched) if subcorpora else {subcorpus_name}
+        touched.clear()
+        counts = {}
+        for k in keys:
+            if k in results:
+                counts[k] = results[k].result() if approx_topk else Counter(results[k])
+        lines = []
+        for k in sorted(conc_results):
+            lines.extend(list(l) for l in conc_results[k][conc_sent[k]:])
+            conc_sent[k] = len(conc_results[k])
+        chunk = None
+        if lines and conc:
+            width = len(conc_col_names)
+            chunk = DataFrame([l + ['none'] * (width - len(l)) for l in lines],
+                              columns=conc_col_names)
+        on_subcorpus(subcorpus_name, counts, chunk)
+
+    def cancelled():
+        return cancel is not None and cancel.is_set()
+
+    # arguments for searching each file with pipeline()
+    kwargs.pop('by_metadata', None)
+    slow_treg_speaker_guess = kwargs.get('outname', '') if kwargs.get('multispeaker') else ''
+    pipeline_kwargs = dict(kwargs,
+                           search=search,
+                           show=show,
+                           dep_type=dep_type,
+                           exclude=exclude,
+                           excludemode=excludemode,
+                           searchmode=searchmode,
+                           case_sensitive=case_sensitive,
+                           conc=conc,
+                           only_format_match=only_format_match,
+                           speaker=slow_treg_speaker_guess,
+                           gramsize=gramsize,
+                           no_punct=no_punct,
+                           no_closed=no_closed,
+                           window=window,
+                           coref=coref,
+                           countmode=countmode,
+                           maxconc=(maxconc, numconc),
+                           is_a_word=is_a_word,
+                           by_metadata=subcorpora,
+                           show_conc_metadata=show_conc_metadata,
+                           just_metadata=just_metadata,
+                           skip_metadata=skip_metadata,
+                           sents=sentence_filter,
+                           fsi_index=fsi_index,
+                           translated_option=translated_option,
+                           statsmode=statsmode,
+                           preserve_case=preserve_case,
+                           usecols=usecols,
+                           search_trees=search_trees,
+                           lem_instance=lem_instance,
+                           lemtag=lemtag)
+
+    # arguments that can't be pickled can't reach worker processes, so
+    # search in this process rather than differently
+    if sharded and not cluster:
+        from corpkit.multiprocess import unpicklable
+        unsent = unpicklable(pipeline_kwargs)
+        if unsent:
+            import warnings
+            warnings.warn("Can't send %s to worker processes, so searching "
+                          "in one process." % ', '.join(unsent))
+            sharded = False
+
+    # when sharding, files are searched by a pool of workers, and the
+    # results come back in the order the loop below asks for them
+    shard_results = None
+    if sharded and cluster:
+        from corpkit.cluster import RemoteFile
+        tasks = []
+        for (subcorpus_name, _), files in sorted(to_iterate_over.items()):
+            category = 'Total' if nosubmode else subcorpus_name
+            for f in files:
+                rel = f.path if isinstance(f, RemoteFile) else os.path.relpath(f.path, corpus.path)
+                tasks.append((len(tasks), category, rel.replace(os.sep, '/'), f.path))
+        shard_results = cluster.search(tasks,
+                                       pipeline_kwargs,
+                                       compact=not spelling,
+                                       telemetry=monitor)
+    elif sharded:
+        from corpkit.multiprocess import shard_files
+        shard_results = shard_files(sorted(to_iterate_over.items()),
+                                    pipeline_kwargs,
+                                    multiprocess=multiprocess,
+                                    nosubmode=nosubmode,
+                                    workers=workers,
+                                    compact=not spelling,
+                                    telemetry=monitor,
+                                    max_memory=max_memory)
+
+
+    # each tregex call waits on its own java process, so start them all
+    # on a few threads, matches and whole sentences at once
+    tregex_jobs = {}
+    tregex_pool = None
+    if tree_to_text or simple_tregex_mode:
+        import functools
+        import multiprocessing
+        from multiprocessing.pool import ThreadPool
+        num_calls = len(to_iterate_over) * (1 if no_conc else 2)
+        num_threads = multiprocess if isinstance(multiprocess, int) and \
+                      not isinstance(multiprocess, bool) else max(2, multiprocessing.cpu_count())
+        tregex_pool = ThreadPool(max(1, min(num_threads, num_calls)))
+
+        def fallback(subcorpus_path, spans=None):
+            """
+            Search with tregex.sh when a subcorpus couldn't be done in one
+            pass. Run as the span search's callback, so that waiting for one
+            subcorpus never holds up starting the others.
+            """
+            if spans is not None or cancelled():
+                return
+            jobs = tregex_jobs[subcorpus_path]
+            try:
+                # tregex_engine can change its options list, so give each its own
+                jobs[1] = tregex_pool.apply_async(tregex_engine,
+                                                  kwds=dict(query=treg_q,
+                                                            options=list(op),
+                                                            corpus=subcorpus_path,
+                                                            root=root,
+                                                            preserve_case=preserve_case))
+                if not no_conc:
+                    jobs[2] = tregex_pool.apply_async(tregex_engine,
+                                                      kwds=dict(query=search['t'],
+                                                                options=['-w'] + op,
+                                                                corpus=subcorpus_path,
+                                                                root=root,
+                                                                preserve_case=preserve_case))
+            except ValueError:
+                # the pool has been shut down
+                pass
+
+        for (_, subcorpus_path), _ in sorted(to_iterate_over.items()):
+            tregex_jobs[subcorpus_path] = [None, None, None]
+            # with the tregex server, one pass gets matches, spans and sentences
+            if not no_conc and not countmode and not tree_to_text:
+                tregex_jobs[subcorpus_path][0] = tregex_pool.apply_async(
+                    tregex_spans,
+                    kwds=dict(corpus=subcorpus_path,
+                              query=treg_q,
+                              options=list(op),
+                              preserve_case=preserve_case),
+                    callback=functools.partial(fallback, subcorpus_path))
+            else:
+                fallback(subcorpus_path)
 
     # Iterate over data, doing interrogations
     for (subcorpus_name, subcorpus_path), files in sorted(to_iterate_over.items()):
+        if cancelled():
+            break
         if nosubmode:
             subcorpus_name = 'Total'
 
@@ -807,37 +1107,40 @@ def interrogator(corpus,
 
         # get either everything (tree_to_text) or the search['t'] query
         if tree_to_text or simple_tregex_mode:
-            result = tregex_engine(query=treg_q,
-                                   options=op,
-                                   corpus=subcorpus_path,
-                                   root=root,
-                                   preserve_case=preserve_case)
+            span_job = tregex_jobs[subcorpus_path][0]
+            spans = span_job.get() if span_job is not None else None
+            # the fallback jobs are set by the time the span search is done
+            _, match_job, whole_job = tregex_jobs[subcorpus_path]
+
+            if spans is not None:
+                result, spans = format_tregex_spans(spans, show, translated_option=translated_option,
+                                    exclude=exclude, excludemode=excludemode, lemtag=lemtag,
+                                    lem_instance=lem_instance, countmode=countmode, speaker_data=False)
+            else:
+                result = match_job.get()
 
             # format search results with slashes etc
-            if not countmode and not tree_to_text:
+            if spans is None and not countmode and not tree_to_text:
                 result = format_tregex(result, show, translated_option=translated_option,
                             exclude=exclude, excludemode=excludemode, lemtag=lemtag,
                             lem_instance=lem_instance, countmode=countmode, speaker_data=False)
 
-            # if concordancing, do the query again with 'whole' sent and fname
+            # if concordancing, cut sentences at the match, or find the match
+            # in the results of the query run again with 'whole' sent and fname
             if not no_conc:
-                ops = ['-w'] + op
-                #ops = [i for i in ops if i != '-n']
-                whole_result = tregex_engine(query=search['t'],
-                                             options=ops,
-                                             corpus=subcorpus_path,
-                                             root=root,
-                                             preserve_case=preserve_case
-                                            )
-
-                # format match too depending on option
-                if not only_format_match:
-                    wholeresult = format_tregex(whole_result, show, translated_option=translated_option,
-                                exclude=exclude, excludemode=excludemode, lemtag=lemtag,
-                            lem_instance=lem_instance, countmode=countmode, speaker_data=False, whole=True)
-
-                # make conc lines from conc results
-                conc_result = make_conc_lines_from_whole_mid(whole_result, result, show=show)
+                if spans is not None:
+                    conc_result = make_conc_lines_from_spans(spans)
+                else:
+                    whole_result = whole_job.get()
+
+                    # format match too depending on option
+                    if not only_format_match:
+                        wholeresult = format_tregex(whole_result, show, translated_option=translated_option,
+                                    exclude=exclude, excludemode=excludemode, lemtag=lemtag,
+                                lem_instance=lem_instance, countmode=countmode, speaker_data=False, whole=True)
+
+                    # make conc lines from conc results
+                    conc_result = make_conc_lines_from_whole_mid(whole_result, result, show=show)
                 for lin in conc_result:
                     if maxconc is False or numconc < maxconc:
                         conc_results[subcorpus_name].append(lin)
@@ -854,54 +1157,32 @@ def interrogator(corpus,
 
             # update progress bar
             current_iter += 1
-            tstr = '%s%d/%d' % (outn, current_iter + 1, total_files)
-            animator(p, current_iter, tstr, **par_args)
+            update_progress(current_iter, result)
+            report_subcorpus(subcorpus_name)
             continue
 
-        # todo: move this
-        kwargs.pop('by_metadata', None)
-        
         # conll querying goes by file, not subcorpus
         for f in files:
-            slow_treg_speaker_guess = kwargs.get('outname', '') if kwargs.get('multispeaker') else ''
-            filepath, corefs = f.path, coref
-            res, conc_res = pipeline(filepath, search=search, show=show,
-                                     dep_type=dep_type,
-                                     exclude=exclude,
-                                     excludemode=excludemode,
-                                     searchmode=searchmode,
-                                     case_sensitive=case_sensitive,
-                                     conc=conc,
-                                     only_format_match=only_format_match,
-                                     speaker=slow_treg_speaker_guess,
-                                     gramsize=gramsize,
-                                     no_punct=no_punct,
-                                     no_closed=no_closed,
-                                     window=window,
-                                     filename=f.path,
-                                     coref=corefs,
-                                     countmode=countmode,
-                                     maxconc=(maxconc, numconc),
-                                     is_a_word=is_a_word,
-                                     by_metadata=subcorpora,
-                                     show_conc_metadata=show_conc_metadata,
-                                     just_metadata=just_metadata,
-                                     skip_metadata=skip_metadata,
-                                     fsi_index=fsi_index,
-                                     category=subcorpus_name,
-                                     translated_option=translated_option,
-                                     statsmode=statsmode,
-                                     preserve_case=preserve_case,
-                                     usecols=usecols,
-                                     search_trees=search_trees,
-                                     lem_instance=lem_instance,
-                                     lemtag=lemtag,
-                                     **kwargs)
+            if cancelled():
+                break
+            # what this file adds, kept by incremental interrogations
+            counts, lines = {}, []
+            if shard_results is not None:
+                res, conc_res = next(shard_results)
+            else:
+                # files kept for later need every line they can give
+                pipeline_kwargs['maxconc'] = (maxconc, numconc if partials is None else 0)
+                if reporter is not None or monitor is not None:
+                    pipeline_kwargs['stats'] = {}
+                res, conc_res = pipeline(f.path, filename=f.path,
+                                         category=subcorpus_name,
+                                         **pipeline_kwargs)
 
             if res is None and conc_res is None:
+                if partials is not None:
+                    partials.put(f.path, counts, lines)
                 current_iter += 1
-                tstr = '%s%d/%d' % (outn, current_iter + 1, total_files)
-                animator(p, current_iter, tstr, **par_args)
+                update_progress(current_iter, path=f.path)
                 continue
 
             # deal with symbolic structures---that is, rather than adding
@@ -911,16 +1192,22 @@ def interrogator(corpus,
                 for (k, v), concl in zip(res.items(), conc_res.values()):                            
                     v = lowercase_result(v)
                     results[k] += Counter(v)
+                    counts.setdefault(k, Counter()).update(v)
+                    touched.add(k)
                     for line in concl:
-                        if maxconc is False or numconc < maxconc:
+                        keep = maxconc is False or numconc < maxconc
+                        if keep or partials is not None:
                             line = postprocess_concline(line,
                                 fsi_index=fsi_index, conc=conc)
+                            lines.append((k, line))
+                        if keep:
                             conc_results[k].append(line)
                             numconc += 1
+                if partials is not None:
+                    partials.put(f.path, counts, lines)
                 
                 current_iter += 1
-                tstr = '%s%d/%d' % (outn, current_iter + 1, total_files)
-                animator(p, current_iter, tstr, **par_args)
+                update_progress(current_iter, res, f.path)
                 continue
 
             # garbage collection needed?
@@ -930,8 +1217,13 @@ def interrogator(corpus,
             if res == 'Bad query':
                 return 'Bad query'
 
+            # count before lowercasing etc.
+            current_iter += 1
+            update_progress(current_iter, res, f.path)
+
             if countmode:
                 count_results[subcorpus_name] += [res]
+                counts[subcorpus_name] = res
 
             else:
                 # add filename and do lowercasing for conc
@@ -939,6 +1231,7 @@ def interrogator(corpus,
                     for line in conc_res:
                         line = postprocess_concline(line,
                             fsi_index=fsi_index, conc=conc)
+                        lines.append((subcorpus_name, line))
                         if maxconc is False or numconc < maxconc:
                             conc_results[subcorpus_name].append(line)
                             numconc += 1
@@ -950,19 +1243,59 @@ def interrogator(corpus,
                     # curse of dimensionality
                     countres = Counter(res)
                     if isinstance(discard, float):
-                        countres.most_common()
-                        nkeep = len(counter) - len(counter) * discard
+                        nkeep = len(countres) - len(countres) * discard
                         countres = Counter({k: v for i, (k, v) in enumerate(countres.most_common()) if i <= nkeep})
                     elif isinstance(discard, int):
                         countres = Counter({k: v for k, v in countres.most_common() if v >= discard})
                     results[subcorpus_name] += countres
+                    counts[subcorpus_name] = countres
                     #else:
                     #results[subcorpus_name] += res
 
-            # update progress bar
-            current_iter += 1
-            tstr = '%s%d/%d' % (outn, current_iter + 1, total_files)
-            animator(p, current_iter, tstr, **par_args)
+            if partials is not None:
+                partials.put(f.path, counts, lines)
+
+        # a subcorpus whose files were all skipped still gets its row
+        if subcorpus_path in emptied and not subcorpora:
+            if countmode:
+                count_results[subcorpus_name] += [0]
+            elif not only_conc:
+                results[subcorpus_name] += Counter()
+
+        if not cancelled():
+            report_subcorpus(subcorpus_name)
+
+    if tregex_pool is not None:
+        if cancelled():
+            tregex_pool.terminate()
+        else:
+            tregex_pool.close()
+        tregex_pool.join()
+    if shard_results is not None:
+        shard_results.close()
+
+    # send the last counters, or stop drawing progress
+    if reporter is not None:
+        reporter.flush()
+    if monitor is not None:
+        locs['telemetry'] = monitor.stop()
+
+    # stopped part way through
+    if cancelled():
+        if not root:
+            restore_sigint()
+        return
+
+    # how much of an incremental interrogation was searched again
+    if partials is not None:
+        locs['incremental'] = partials.finish()
+        if not no_conc:
+            conc_results = partials.concordance(maxconc)
+
+    # turn summaries back into counters, keeping their error bounds
+    if approx_topk:
+        locs['approx_error'] = {k: v.error for k, v in results.items()}
+        results = {k: v.result() for k, v in results.items()}
 
     # Get concordances into DataFrame, return if just conc
     if not no_conc:
@@ -981,7 +1314,7 @@ def interrogator(corpus,
                     conc_df.save(savename)
             goodbye_printer(only_conc=True)
             if not root:
-                signal.signal(signal.SIGINT, original_sigint)            
+                restore_sigint()            
             return conc_df
     else:
         conc_df = None
@@ -990,6 +1323,12 @@ def interrogator(corpus,
     if countmode:
         df = Series({k: sum(v) for k, v in sorted(count_results.items())})
         tot = df.sum()
+    elif sparse:
+        # build a scipy.sparse matrix straight from the counters
+        from corpkit.process import make_sparse_results
+        df, tot = make_sparse_results(results)
+        numentries = len(df.columns)
+        total_total = tot.sum()
     else:
         the_big_dict = {}
         unique_results = set(item for sublist in list(results.values()) for item in sublist)
@@ -1034,7 +1373,9 @@ def interrogator(corpus,
     # if we're doing files as subcorpora,  we can remove the extension etc
     if isinstance(df, DataFrame) and files_as_subcorpora:
         df.index = df.index.str.replace(r'(?:-[0-9][0-9][0-9]|)\.txt\.conll.*', '')
-        df = df.groupby(level=0,sort=True).sum()
+        # grouping would densify sparse results, so only do it if needed
+        if not sparse or df.index.has_duplicates:
+            df = df.groupby(level=0,sort=True).sum()
 
     if conc_df is not None and conc_df is not False:
         # removed 'f' from here for now
@@ -1051,6 +1392,15 @@ def interrogator(corpus,
     if nosubmode and isinstance(df, pd.DataFrame):
         df = df.sum()
     interro = Interrogation(results=df, totals=tot, query=locs, concordance=conc_df)
+    if partials is not None:
+        interro.partials = partials
+
+    # send compact results back to pmultiquery
+    if partial:
+        from corpkit.multiprocess import PartialResult
+        if not root:
+            restore_sigint()
+        return PartialResult(interro, partial)
 
     # save it
     if save and not kwargs.get('outname'):
@@ -1064,5 +1414,5 @@ def interrogator(corpus,
         except AttributeError:
             pass
     if not root:
-        signal.signal(signal.SIGINT, original_sigint)
+        restore_sigint()
     return interro
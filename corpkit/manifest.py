@@ -0,0 +1,338 @@
+"""
+corpkit: a saved listing of the files in a corpus, so that making a Corpus
+and listing its subcorpora and files doesn't mean walking every directory
+
+For each directory the manifest keeps its modification time, its
+subdirectories, a count of its file extensions, and the size, modification
+time, sentence and token counts of its files. Adding, removing or renaming
+a file changes the time of the directory it is in, so checking a manifest
+is one `stat` per directory, and only directories whose time has changed
+are listed again. Editing a file in place doesn't change its directory, so
+sizes, times and counts are only hints: anything that must be exact checks
+the file itself.
+
+Manifests are saved in ``~/.corpkit/manifest``, not in the corpus, because
+Tregex reads every file in the directories it searches.
+"""
+
+from __future__ import print_function
+
+# bump when the saved format changes, so old manifests are rebuilt
+MANIFEST_VERSION = 1
+
+# manifests already loaded in this process, by corpus path
+MANIFEST_CACHE = {}
+
+def scan_dir(path):
+    """
+    List a directory with `os.scandir`, or `os.listdir` where there isn't one.
+    Hidden files and directories are left out.
+
+    :returns: sorted subdirectory names, and sorted ``(name, size, mtime)``
+              for each file
+    """
+    import os
+    dirs, files = [], []
+    if hasattr(os, 'scandir'):
+        for entry in os.scandir(path):
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir():
+                dirs.append(entry.name)
+            else:
+                stat = entry.stat()
+                files.append((entry.name, stat.st_size, stat.st_mtime))
+    else:
+        for name in os.listdir(path):
+            if name.startswith('.'):
+                continue
+            full = os.path.join(path, name)
+            if os.path.isdir(full):
+                dirs.append(name)
+            else:
+                stat = os.stat(full)
+                files.append((name, stat.st_size, stat.st_mtime))
+    return sorted(dirs), sorted(files)
+
+def count_file(path):
+    """
+    Count the sentences and tokens in a file. CONLL sentences are blocks of
+    token lines; plain text has whitespace separated tokens and no sentence
+    count.
+
+    :returns: ``(sents, tokens)``, with `None` for anything unknown
+    """
+    from corpkit.constants import OPENER
+    try:
+        with OPENER(path, 'r', encoding='utf-8', errors='ignore') as fo:
+            if not (path.endswith('.conll') or path.endswith('.conllu')):
+                return None, sum(len(line.split()) for line in fo)
+            sents, tokens, in_sent = 0, 0, False
+            for line in fo:
+                if not line.strip():
+                    in_sent = False
+                elif not line.startswith('#'):
+                    tokens += 1
+                    if not in_sent:
+                        sents += 1
+                        in_sent = True
+            return sents, tokens
+    except (IOError, OSError):
+        return None, None
+
+class Manifest(object):
+    """
+    The directories and files under a corpus path
+
+    :param path: Absolute path to the corpus
+    :type path: `str`
+
+    :param dirs: Listing of each directory, keyed by its path relative to
+                 `path` (``''`` for `path` itself)
+    :type dirs: `dict`
+    """
+
+    def __init__(self, path, dirs=None):
+        self.path = path
+        self.dirs = dirs or {}
+
+    def full(self, rel):
+        """
+        Absolute path of a directory in the manifest
+        """
+        import os
+        return os.path.join(self.path, rel) if rel else self.path
+
+    def list_dir(self, rel, mtime):
+        """
+        List one directory, keeping counts for files that look unchanged
+        """
+        import os
+        from collections import Counter
+        dirs, files = scan_dir(self.full(rel))
+        old = self.dirs.get(rel)
+        known = {}
+        if old:
+            known = {(n, s, m): (c, t) for n, s, m, c, t in
+                     zip(old['files'], old['sizes'], old['mtimes'],
+                         old['sents'], old['tokens'])}
+        counts = [known.get(f, (None, None)) for f in files]
+        return {'mtime': mtime,
+                'dirs': dirs,
+                'files': [f[0] for f in files],
+                'exts': Counter(os.path.splitext(f[0])[1] for f in files if '.' in f[0]),
+                'sizes': [f[1] for f in files],
+                'mtimes': [f[2] for f in files],
+                'sents': [c[0] for c in counts],
+                'tokens': [c[1] for c in counts]}
+
+    def update(self):
+        """
+        Check every directory's time, and list again the ones that changed
+
+        :returns: `True` if anything changed
+        """
+        import os
+        changed = False
+        dirs = {}
+        todo = ['']
+        while todo:
+            rel = todo.pop()
+            try:
+                mtime = os.stat(self.full(rel)).st_mtime
+            except OSError:
+                changed = True
+                continue
+            entry = self.dirs.get(rel)
+            if entry is None or entry['mtime'] != mtime:
+                entry = self.list_dir(rel, mtime)
+                changed = True
+            dirs[rel] = entry
+            todo.extend(os.path.join(rel, d) for d in entry['dirs'])
+        if set(dirs) != set(self.dirs):
+            changed = True
+        self.dirs = dirs
+        return changed
+
+    def subdirs(self, rel=''):
+        """
+        Names of the subdirectories of a directory
+        """
+        return self.dirs[rel]['dirs']
+
+    def files(self, rel=''):
+        """
+        Names of the files in a directory
+        """
+        return self.dirs[rel]['files']
+
+    def extensions(self):
+        """
+        Count the file extensions in the whole corpus
+        """
+        from collections import Counter
+        counted = Counter()
+        for entry in self.dirs.values():
+            counted.update(entry['exts'])
+        return counted
+
+    def count(self):
+        """
+        Count sentences and tokens for files that haven't been counted yet
+
+        :returns: `True` if anything was counted
+        """
+        import os
+        changed = False
+        for rel, entry in self.dirs.items():
+            for i, name in enumerate(entry['files']):
+                if entry['tokens'][i] is None:
+                    sents, tokens = count_file(os.path.join(self.full(rel), name))
+                    entry['sents'][i], entry['tokens'][i] = sents, tokens
+                    changed = changed or tokens is not None
+        return changed
+
+    def records(self):
+        """
+        Every file in the corpus, in order, as a `dict` with `path`,
+        `subcorpus` (`None` for files at the top level), `size`, `mtime`,
+        `sents` and `tokens`
+        """
+        import os
+        for rel in sorted(self.dirs):
+            entry = self.dirs[rel]
+            for name, size, mtime, sents, tokens in zip(entry['files'], entry['sizes'],
+                                                        entry['mtimes'], entry['sents'],
+                                                        entry['tokens']):
+                yield {'path': os.path.join(self.full(rel), name),
+                       'subcorpus': rel or None,
+                       'size': size,
+                       'mtime': mtime,
+                       'sents': sents,
+                       'tokens': tokens}
+
+    def save(self, path):
+        """
+        Save as JSON
+        """
+        import os
+        import json
+        tmp = '%s.%d.tmp' % (path, os.getpid())
+        with open(tmp, 'w') as fo:
+            json.dump({'version': MANIFEST_VERSION, 'path': self.path, 'dirs': self.dirs}, fo)
+        try:
+            os.replace(tmp, path)
+        except AttributeError:
+            if os.path.exists(path):
+                os.remove(path)
+            os.rename(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a saved manifest, or get `None` if it is unreadable or from an
+        older version
+        """
+        import json
+        try:
+            with open(path, 'r') as fo:
+                data = json.load(fo)
+        except (IOError, OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+            return
+        return cls(data['path'], data['dirs'])
+
+def manifest_dir():
+    """
+    Find a writable place for saved manifests
+    """
+    import os
+    import tempfile
+    for path in [os.path.join(os.path.expanduser('~'), '.corpkit', 'manifest'),
+                 os.path.join(tempfile.gettempdir(), 'corpkit-manifest')]:
+        try:
+            if not os.path.isdir(path):
+                os.makedirs(path)
+            if os.access(path, os.W_OK):
+                return path
+        except OSError:
+            continue
+
+def manifest_path(path):
+    """
+    Where the manifest for a corpus is saved, or `None` if nowhere
+    """
+    import os
+    import hashlib
+    where = manifest_dir()
+    if where is None:
+        return
+    digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+    return os.path.join(where, '%s-%s.json' % (os.path.basename(path), digest[:16]))
+
+def get_manifest(path, count=False, build=True):
+    """
+    Get the manifest of a corpus directory, from memory or disk, bringing it
+    up to date and saving it if anything changed
+
+    :param count: Count sentences and tokens of files not counted yet
+    :type count: `bool`
+
+    :param build: Scan the corpus if there is no saved manifest. If `False`,
+                  return `None` instead
+    :type build: `bool`
+
+    :returns: :class:`Manifest`, or `None` if `path` isn't a directory
+    """
+    import os
+    path = os.path.abspath(path)
+    if not os.path.isdir(path):
+        return
+    manifest = MANIFEST_CACHE.get(path)
+    saved = manifest_path(path)
+    if manifest is None and saved and os.path.isfile(saved):
+        manifest = Manifest.load(saved)
+        if manifest is not None and manifest.path != path:
+            manifest = None
+    if manifest is None:
+        if not build:
+            return
+        manifest = Manifest(path)
+    changed = manifest.update()
+    if count:
+        changed = manifest.count() or changed
+    if changed and saved:
+        try:
+            manifest.save(saved)
+        except (IOError, OSError):
+            pass
+    MANIFEST_CACHE[path] = manifest
+    return manifest
+
+def listing(path):
+    """
+    Get the listing of one directory, from the manifest of the corpus it is
+    a subcorpus of if there is one, otherwise from its own
+
+    :returns: `dict` with the names of its `dirs` and `files`, their
+              `sizes`, `mtimes`, `sents` and `tokens`
+    """
+    import os
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime
+    parent = os.path.dirname(path)
+    for root, rel in [(path, ''), (parent, os.path.basename(path))]:
+        manifest = MANIFEST_CACHE.get(root)
+        if manifest is None:
+            continue
+        entry = manifest.dirs.get(rel)
+        if entry is not None and entry['mtime'] == mtime:
+            return entry
+        manifest = get_manifest(root)
+        if rel in manifest.dirs:
+            return manifest.dirs[rel]
+    manifest = get_manifest(parent, build=False)
+    if manifest is not None and os.path.basename(path) in manifest.dirs:
+        return manifest.dirs[os.path.basename(path)]
+    return get_manifest(path).dirs['']
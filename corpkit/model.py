@@ -81,14 +81,14 @@ class MultiModel(dict):
         # get data into a list of ngram tuples
         from collections import Counter, OrderedDict
         import pandas as pd
-        from corpkit.corpus import Subcorpus, File
+        from corpkit.corpus import Subcorpus, File, FileHandle
         # get subcorpus
         if isinstance(data, Subcorpus):
             counts = self[data.name].counts
         elif isinstance(data, STRINGTYPE) and data in self.keys():
             counts = self[data].counts 
         #get file
-        elif isinstance(data, File) or (isinstance(data, STRINGTYPE) and \
+        elif isinstance(data, (File, FileHandle)) or (isinstance(data, STRINGTYPE) and \
             os.path.isfile(data)):
             counts = self._turn_file_obj_into_counts(data)
         # get text
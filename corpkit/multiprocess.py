@@ -117,6 +117,24 @@ def pmultiquery(corpus,
     if multiprocess is False:
         num_cores = 1
 
+    # don't run more at once than will fit in memory. each process searches
+    # its files one by one, so its peak is its biggest file
+    if multiprocess and num_cores > 1:
+        if multiple == 'datalist':
+            sizes = [largest_file(x.path) for x in corpus]
+        elif multiple == 'multiplecorpora':
+            sizes = [largest_file(getattr(x, 'path', x)) for x in corpus]
+        else:
+            sizes = [largest_file(corpus.path)] * denom
+        fits = memory_limited_workers(sizes, num_cores,
+                                      conc=bool(kwargs.get('conc')),
+                                      max_memory=kwargs.get('max_memory'))
+        if fits < num_cores and print_info:
+            thetime = strftime("%H:%M:%S", localtime())
+            print('%s: Running %d parallel processes rather than %d, to save memory.' \
+                  % (thetime, fits, num_cores))
+        num_cores = fits
+
     # make sure saves are right type
     if save is True:
         raise ValueError('save must be string when multiprocessing.')
@@ -216,7 +234,8 @@ def pmultiquery(corpus,
     used_joblib = False
     #ds = ds[::-1]
     #todo: the number of blank lines to print can be way wrong
-    if not root and print_info:
+    # parallel workers post counters to a queue instead of drawing their own bars
+    if not root and print_info and not multiprocess:
         from blessings import Terminal
         terminal = Terminal()
         print('\n' * (len(ds) - 2))
@@ -232,14 +251,31 @@ def pmultiquery(corpus,
             except:
                 pass
 
+    merged = None
     if not root and multiprocess:
+        # workers send back compact partial results
+        import uuid
+        session = uuid.uuid4().hex
+        from corpkit.telemetry import Telemetry
+        manager = multiprocessing.Manager()
+        monitor = Telemetry(queue=manager.Queue(), callback=kwargs.get('progress'),
+                            show=print_info and not in_notebook)
+        for d in ds:
+            d['partial'] = session
+            d['telemetry'] = monitor.queue
+            d.pop('progress', None)
+        monitor.start()
         try:
             res = Parallel(n_jobs=num_cores)(delayed(interrogator)(**x) for x in ds)
+            res, merged = unpack_partials(res)
             used_joblib = True
         except:
             failed = True
             print('Multiprocessing failed.')
             raise
+        finally:
+            locs['telemetry'] = monitor.stop()
+            manager.shutdown()
         if not res:
             failed = True
     else:
@@ -262,6 +298,11 @@ def pmultiquery(corpus,
     else:
         qlocs['corpus'] = list([i.path for i in qlocs.get('corpus', [])])
 
+    # keep the error bounds of each approximate interrogation
+    if kwargs.get('approx_topk'):
+        qlocs['approx_error'] = {r.query.get('outname'): r.query.get('approx_error') \
+                                 for r in res if hasattr(r, 'query')}
+
     # return just a concordance
     from corpkit.interrogation import Concordance
     if kwargs.get('conc') == 'only':
@@ -308,8 +349,11 @@ def pmultiquery(corpus,
     # 
     else:
         if multiple == 'multiplecorpora' and not mult_corp_are_subs:
-            sers = [i.results for i in res]
-            out = DataFrame(sers, index=[i.query['outname'] for i in res])
+            if merged is not None:
+                out = merged
+            else:
+                sers = [i.results for i in res]
+                out = DataFrame(sers, index=[i.query['outname'] for i in res])
             out = out.reindex_axis(sorted(out.columns), axis=1) # sort cols
             out = out.fillna(0) # nan to zero
             out = out.astype(int) # float to int
@@ -320,12 +364,15 @@ def pmultiquery(corpus,
                 out = pd.concat([r.results for r in res])
                 out = out.sort_index()
             else:
-                try:
-                    out = pd.concat([r.results for r in res], axis=1)
-                    out = out.T
-                    out.index = [i.query['outname'] for i in res]
-                except ValueError:
-                    return None
+                if merged is not None:
+                    out = merged
+                else:
+                    try:
+                        out = pd.concat([r.results for r in res], axis=1)
+                        out = out.T
+                        out.index = [i.query['outname'] for i in res]
+                    except ValueError:
+                        return None
                 # format like normal
                 # this sorts subcorpora, which are cls
                 out = out[sorted(list(out.columns))]
@@ -388,3 +435,771 @@ def pmultiquery(corpus,
         if list(out.results.index) == ['0'] and not kwargs.get('df1_always_df'):
             out.results = out.results.ix[0].sort_index()
         return out
+
+
+class VocabEncoder(object):
+    """
+    Give results integer ids in a worker process. Each message carries
+    only the results this worker has not sent before, plus id and count
+    arrays, which are much quicker to pickle than pandas objects.
+    """
+
+    def __init__(self, session):
+        import os
+        self.session = session
+        self.source = os.getpid()
+        self.ids = {}
+        self.seq = 0
+
+    def encode(self, words, counts):
+        """
+        :returns: ``(source, seq, new_words, ids, counts)``
+        """
+        import numpy as np
+        delta = []
+        ids = np.empty(len(words), dtype=np.int64)
+        for i, word in enumerate(words):
+            idx = self.ids.get(word)
+            if idx is None:
+                idx = self.ids[word] = len(self.ids)
+                delta.append(word)
+            ids[i] = idx
+        counts = np.asarray(counts, dtype=np.int64)
+        self.seq += 1
+        return (self.source, self.seq, delta, ids, counts)
+
+ENCODER = None
+
+def get_encoder(session):
+    """
+    Get this process' encoder, starting again for each new interrogation
+    """
+    global ENCODER
+    if ENCODER is None or ENCODER.session != session:
+        ENCODER = VocabEncoder(session)
+    return ENCODER
+
+class VocabDecoder(object):
+    """
+    Rebuild worker vocabularies in the parent process, mapping each worker's
+    ids onto one shared set of ids. Messages from the same worker must be
+    decoded in the order they were made.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.words = []
+        self.maps = {}
+
+    def decode(self, message):
+        """
+        :returns: shared ids and counts as `numpy` arrays
+        """
+        import numpy as np
+        source, _, delta, ids, counts = message
+        local, size = self.maps.get(source, (np.empty(0, dtype=np.int64), 0))
+        if size + len(delta) > len(local):
+            grown = np.empty(max(2 * len(local), size + len(delta)), dtype=np.int64)
+            grown[:size] = local[:size]
+            local = grown
+        for word in delta:
+            idx = self.ids.get(word)
+            if idx is None:
+                idx = self.ids[word] = len(self.words)
+                self.words.append(word)
+            local[size] = idx
+            size += 1
+        self.maps[source] = (local, size)
+        return local[ids], counts
+
+    def counter(self, message):
+        """
+        Decode a message into a ``Counter``
+        """
+        from collections import Counter
+        ids, counts = self.decode(message)
+        words = self.words
+        return Counter(dict(zip([words[i] for i in ids], counts.tolist())))
+
+    def matrix(self, rows):
+        """
+        Put decoded ``(ids, counts)`` pairs into one row each of a 2D array
+        """
+        import numpy as np
+        mat = np.zeros((len(rows), len(self.words)), dtype=np.int64)
+        for i, (ids, counts) in enumerate(rows):
+            np.add.at(mat[i], ids, counts)
+        return mat
+
+def to_columns(lines):
+    """
+    Make concordance lines columnar, if they are all the same length
+    """
+    if not lines or not isinstance(lines, list):
+        return lines
+    if len(set(len(line) for line in lines)) != 1:
+        return lines
+    return ('columns', list(zip(*lines)))
+
+def from_columns(data):
+    """
+    Turn columnar concordance lines back into a list of lists
+    """
+    if isinstance(data, tuple) and data and data[0] == 'columns':
+        return [list(line) for line in zip(*data[1])]
+    return data
+
+class PartialResult(object):
+    """
+    The compact form of a worker's :class:`corpkit.interrogation.Interrogation`.
+    Integer results are encoded with :class:`VocabEncoder` (two-dimensional
+    results as their nonzero cells), and the concordance is sent as columns
+    rather than a DataFrame.
+    """
+
+    def __init__(self, interro, session):
+        import numpy as np
+        from pandas import Series, DataFrame
+        self.query = interro.query
+        self.totals = interro.totals
+        self.results = interro.results
+        self.message = None
+        self.cells = None
+        self.index = None
+        self.name = getattr(self.results, 'name', None)
+        encoder = get_encoder(session)
+        if isinstance(self.results, Series) and self.results.dtype.kind in 'iu':
+            self.message = encoder.encode(list(self.results.index), self.results.values)
+            self.results = None
+        elif isinstance(self.results, DataFrame) and \
+             all(k in 'iu' for k in self.results.dtypes.map(lambda x: x.kind)):
+            values = self.results.values
+            rows, cols = values.nonzero()
+            self.message = encoder.encode(list(self.results.columns),
+                                          np.zeros(len(self.results.columns)))
+            self.cells = (rows, cols, values[rows, cols])
+            self.index = self.results.index
+            self.results = None
+        self.conc = None
+        conc = interro.concordance
+        if conc is not None:
+            self.conc = (list(conc.columns), [conc[c].values for c in conc.columns])
+
+    @property
+    def ndim(self):
+        return 2 if self.cells is not None else 1
+
+    def to_interrogation(self, decoder, ids=None):
+        """
+        Rebuild the interrogation in the parent process
+        """
+        import numpy as np
+        from pandas import Series, DataFrame
+        from corpkit.interrogation import Interrogation, Concordance
+        results = self.results
+        if self.message is not None:
+            if ids is None:
+                ids = decoder.decode(self.message)
+            idx, counts = ids
+            words = [decoder.words[i] for i in idx]
+            if self.cells is None:
+                results = Series(counts, index=words, name=self.name)
+            else:
+                rows, cols, counts = self.cells
+                mat = np.zeros((len(self.index), len(words)), dtype=np.int64)
+                mat[rows, cols] = counts
+                results = DataFrame(mat, index=self.index, columns=words)
+        conc = None
+        if self.conc is not None:
+            cols, values = self.conc
+            conc = Concordance(DataFrame(dict(zip(cols, values)), columns=cols))
+        return Interrogation(results=results, totals=self.totals,
+                             query=self.query, concordance=conc)
+
+def unpack_partials(res):
+    """
+    Turn partial results from workers back into interrogations.
+
+    :returns: the interrogations, and if every result was one-dimensional,
+              a DataFrame of all results (one row per interrogation), made
+              with `numpy` rather than by aligning each result
+    """
+    from pandas import DataFrame
+    if not res or not all(isinstance(r, PartialResult) for r in res):
+        return res, None
+    decoder = VocabDecoder()
+    # each worker's messages have to be decoded in the order it made them
+    order = sorted(range(len(res)), key=lambda i: res[i].message[:2] \
+                   if res[i].message is not None else (0, 0))
+    decoded = [None] * len(res)
+    for i in order:
+        if res[i].message is not None:
+            decoded[i] = decoder.decode(res[i].message)
+    out = [r.to_interrogation(decoder, ids) for r, ids in zip(res, decoded)]
+    if any(ids is None for ids in decoded) or any(r.ndim != 1 for r in res):
+        return out, None
+    merged = DataFrame(decoder.matrix(decoded),
+                       index=[r.query.get('outname') for r in res],
+                       columns=decoder.words)
+    return out, merged
+
+# state kept in each worker process of a WorkerPool
+WORKER_CACHE = None
+WORKER_CACHE_SIZE = 0
+WORKER_QUERY = (None, None)
+
+def pool_initialiser(cache_size):
+    """
+    Set up a worker process: import the slow stuff once, make a cache
+    """
+    import signal
+    from collections import OrderedDict
+    import pandas
+    import corpkit.conll
+    global WORKER_CACHE, WORKER_CACHE_SIZE
+    WORKER_CACHE = OrderedDict()
+    WORKER_CACHE_SIZE = cache_size
+    # let the parent process handle pausing and quitting
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def cached_conll(path, usecols=None, sents=None):
+    """
+    Parse a CONLL file, or get it from this worker's cache if unchanged.
+    With `sents`, only those sentences are parsed, and cached as such.
+    """
+    import os
+    from corpkit.conll import parse_conll
+    if not WORKER_CACHE_SIZE:
+        return parse_conll(path, usecols=usecols, sents=sents)
+    key = (path, os.path.getmtime(path), tuple(usecols) if usecols else None,
+           frozenset(sents) if sents is not None else None)
+    df = WORKER_CACHE.pop(key, None)
+    if df is None:
+        df = parse_conll(path, usecols=usecols, sents=sents)
+        if df is None:
+            return
+    WORKER_CACHE[key] = df
+    while len(WORKER_CACHE) > WORKER_CACHE_SIZE:
+        WORKER_CACHE.popitem(last=False)
+    return df
+
+def pool_worker(task):
+    """
+    Search a single file in a worker process, with the query this worker
+    was last sent
+    """
+    from corpkit.conll import pipeline
+    from collections import Counter
+    index, category, path, filename, query_id, compact = task
+    if WORKER_QUERY[0] != query_id:
+        raise ValueError('Worker has no query for this file.')
+    kwargs = dict(WORKER_QUERY[1])
+    sents = kwargs.pop('sents', None)
+    if isinstance(sents, dict):
+        sents = sents.get(path)
+    df = cached_conll(path, usecols=kwargs.get('usecols'), sents=sents)
+    if df is not None:
+        kwargs['from_df'] = df
+        kwargs['metadata'] = df._metadata
+    stats = {'tokens': 0}
+    kwargs['stats'] = stats
+    res, conc_res = pipeline(path, filename=filename, category=category, **kwargs)
+    if compact and isinstance(res, list):
+        res = Counter(res)
+        res = get_encoder(query_id).encode(list(res.keys()), list(res.values()))
+        conc_res = to_columns(conc_res)
+    return index, res, conc_res, stats['tokens']
+
+def next_file(me, queues, shared):
+    """
+    Take the next file to search: one sent to this worker, then one
+    any worker can search, then one waiting for a busy worker
+
+    :returns: ``(number, task)``, or `None` if there is nothing to search
+    """
+    try:
+        from queue import Empty
+    except ImportError:
+        from Queue import Empty
+    for queue in [queues[me], shared] + queues[me + 1:] + queues[:me]:
+        try:
+            return queue.get_nowait()
+        except Empty:
+            continue
+
+def pool_process(me, inbox, queues, shared, outbox, current, cache_size):
+    """
+    Run one worker process of a :class:`WorkerPool`. Queries arrive on
+    `inbox`, files on this worker's queue in `queues` or on `shared`, and
+    results go to `outbox` with the number of the interrogation they belong
+    to. Once a worker has the query of the `current` interrogation it searches
+    its own files, then shared ones, then takes files from the queues of
+    busier workers. Files of an interrogation that is no longer `current`
+    are skipped. The worker stops when the process that started it has gone.
+    """
+    import os
+    import pickle
+    import traceback
+    try:
+        from queue import Empty
+    except ImportError:
+        from Queue import Empty
+    global WORKER_QUERY
+    pool_initialiser(cache_size)
+    parent = os.getppid()
+    query_number = 0
+    held = None
+    while True:
+        searching = query_number and query_number == current.value
+        if held is None and searching:
+            held = next_file(me, queues, shared)
+        if held is not None:
+            number, task = held
+            if number != current.value:
+                held = None
+                continue
+            # otherwise, it was taken before the query it belongs to arrived
+            if number == query_number:
+                held = None
+                try:
+                    outbox.put((number, True, pool_worker(task)))
+                except Exception:
+                    outbox.put((number, False, traceback.format_exc()))
+                continue
+        # check for files again soon while others may still be busy
+        try:
+            message = inbox.get(timeout=0.05 if searching else 1)
+        except Empty:
+            if os.getppid() != parent:
+                return
+            continue
+        if message is None:
+            return
+        # the query is only unpickled once per interrogation
+        _, query_number, query_id, blob = message
+        try:
+            WORKER_QUERY = (query_id, pickle.loads(blob))
+        except Exception:
+            WORKER_QUERY = (None, None)
+
+class WorkerPool(object):
+    """
+    A pool of worker processes that stays alive between interrogations.
+
+    Workers are started once, and keep the most recently searched files
+    in memory. Each file is sent to the same worker every time, and each
+    worker is sent the query once, so repeated queries over the same corpus
+    only need to send the query and find the files already parsed. A worker
+    with nothing left to search takes files waiting for a busier one. Without
+    a cache, files go on one queue that every worker takes from. Usually
+    made with :func:`~corpkit.corpus.Corpus.start_workers`.
+
+    :param processes: Number of worker processes (default: one per core)
+    :type processes: `int`
+
+    :param cache_size: Number of parsed files each worker keeps in memory
+    :type cache_size: `int`
+    """
+
+    def __init__(self, processes=None, cache_size=64):
+        import multiprocessing
+        self.processes = processes or multiprocessing.cpu_count()
+        self.cache_size = cache_size
+        self.queries = 0
+        # which worker searches each file
+        self.homes = {}
+        # number of the interrogation workers should be searching for
+        self.current = multiprocessing.Value('l', 0)
+        self.outbox = multiprocessing.Queue()
+        self.inboxes = [multiprocessing.Queue() for _ in range(self.processes)]
+        # files sent to one worker, and files for any worker
+        self.queues = [multiprocessing.Queue() for _ in range(self.processes)]
+        self.shared = multiprocessing.Queue()
+        self.procs = []
+        for me, inbox in enumerate(self.inboxes):
+            proc = multiprocessing.Process(target=pool_process,
+                                           args=(me, inbox, self.queues, self.shared,
+                                                 self.outbox, self.current, cache_size))
+            proc.daemon = True
+            proc.start()
+            self.procs.append(proc)
+
+    @property
+    def closed(self):
+        return self.procs is None
+
+    def assign(self, tasks, used, load=None):
+        """
+        Find the worker for each file: the one that searched it before, or
+        if there isn't one, the worker with the least to search so far
+
+        :param load: Bytes sent to each worker so far, updated in place
+        :type load: `list`
+
+        :returns: `list` of worker numbers, one per task
+        """
+        import os
+        if load is None:
+            load = [0] * used
+        out = []
+        for task in tasks:
+            path = task[2]
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = 0
+            home = self.homes.get(path)
+            if home is None or home >= used:
+                home = load.index(min(load))
+                self.homes[path] = home
+            load[home] += size
+            out.append(home)
+        return out
+
+    def run(self, tasks, kwargs, compact=True, max_active=None, ahead=None):
+        """
+        Search files, yielding ``(index, res, conc_res, tokens)`` as they finish
+
+        :param tasks: ``(index, category, path)`` for each file, optionally
+                      with a filename to show in concordance lines. Files
+                      are started in this order
+        :type tasks: `list`/iterable
+
+        :param kwargs: Arguments for :func:`corpkit.conll.pipeline`
+        :type kwargs: `dict`
+
+        :param compact: Send plain results back as id and count arrays,
+                        see :class:`VocabEncoder`
+        :type compact: `bool`
+
+        :param max_active: Most workers to use, if fewer than the number of
+                           processes
+        :type max_active: `int`
+
+        :param ahead: Most files to send before their results come back. The
+                      next file is only taken from `tasks` once a result has
+                      been handled, so `tasks` can be a generator that
+                      decides what to search next
+        :type ahead: `int`
+        """
+        import os
+        import pickle
+        from itertools import islice
+        if self.closed:
+            raise ValueError('Worker pool has been closed.')
+        self.queries += 1
+        number = self.queries
+        query_id = (os.getpid(), id(self), number)
+        blob = pickle.dumps(kwargs, pickle.HIGHEST_PROTOCOL)
+        used = min(self.processes, max_active or self.processes)
+        self.current.value = number
+        for inbox in self.inboxes[:used]:
+            inbox.put(('query', number, query_id, blob))
+        load = [0] * used
+
+        def send(task):
+            # with nothing cached, whichever worker is free takes the next file
+            if self.cache_size:
+                queue = self.queues[self.assign([task], used, load)[0]]
+            else:
+                queue = self.shared
+            filename = task[3] if len(task) > 3 else task[2]
+            queue.put((number, (task[0], task[1], task[2], filename, query_id, compact)))
+
+        tasks = iter(tasks)
+        count = 0
+        for task in islice(tasks, ahead):
+            send(task)
+            count += 1
+        return self._results(number, count, tasks if ahead else None, send)
+
+    def _results(self, number, count, tasks=None, send=None):
+        """
+        Get the results of one interrogation from the workers, sending one
+        more of `tasks` after each result has been handled
+        """
+        try:
+            from queue import Empty
+        except ImportError:
+            from Queue import Empty
+        try:
+            while count:
+                try:
+                    got, success, out = self.outbox.get(timeout=1)
+                except Empty:
+                    if any(not proc.is_alive() for proc in self.procs):
+                        raise RuntimeError('A worker process has stopped.')
+                    continue
+                # left over from an interrogation that was stopped
+                if got != number:
+                    continue
+                count -= 1
+                if not success:
+                    raise RuntimeError('Error in worker process:\n%s' % out)
+                yield out
+                if tasks is not None:
+                    for task in tasks:
+                        send(task)
+                        count += 1
+                        break
+        finally:
+            # stopped early: workers skip the rest of this interrogation
+            if self.current.value == number:
+                self.current.value = 0
+
+    def close(self):
+        """
+        Stop the worker processes
+        """
+        if self.procs is None:
+            return
+        for proc in self.procs:
+            proc.terminate()
+        for proc in self.procs:
+            proc.join()
+        for queue in self.inboxes + self.queues + [self.shared, self.outbox]:
+            queue.cancel_join_thread()
+            queue.close()
+        self.procs = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getstate__(self):
+        raise TypeError('WorkerPool objects cannot be pickled.')
+
+    def __repr__(self):
+        state = 'closed' if self.closed else '%d processes' % self.processes
+        return "<%s: %s>" % (self.__class__.__name__, state)
+
+# rough peak memory of one worker process before it searches anything
+WORKER_MEMORY = 150 * 1024 * 1024
+
+def parse_memory(value):
+    """
+    Turn ``'16G'``, ``'500M'`` or a number of bytes into a number of bytes
+    """
+    if value is None or isinstance(value, (int, float)):
+        return value
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+    value = value.strip().upper().rstrip('B')
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(float(value))
+
+def available_memory():
+    """
+    How much memory is available for new processes, in bytes
+
+    :returns: `int`, or `None` if it can't be found out
+    """
+    import os
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except ImportError:
+        pass
+    try:
+        with open('/proc/meminfo') as fo:
+            for line in fo:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (IOError, OSError, ValueError):
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return
+
+def estimate_task_memory(size, usecols=None, conc=False):
+    """
+    Guess the peak memory used to search a CONLL file of `size` bytes.
+
+    A parsed file takes about its own size in memory for every column
+    loaded, and the raw text and split lines are held while parsing.
+    Concordancing keeps extra copies of the sentences.
+    """
+    from corpkit.constants import CONLL_COLUMNS
+    ncols = len(usecols) if usecols else len(CONLL_COLUMNS)
+    estimate = size * (3 + 1.1 * ncols)
+    if conc:
+        estimate *= 1.5
+    return int(estimate)
+
+def memory_limited_workers(sizes, num_workers, usecols=None, conc=False, max_memory=None):
+    """
+    Find how many workers can search at once without going over the memory
+    budget, assuming the biggest files are searched at the same time.
+
+    Only the number of workers is limited: files are never split, so there
+    is always at least one worker, and a file that doesn't fit the budget
+    on its own is still searched whole, with a warning.
+
+    :param sizes: Size in bytes of the biggest file each task will search
+    :type sizes: `list`
+
+    :param num_workers: Number of workers wanted
+    :type num_workers: `int`
+
+    :param max_memory: Memory budget (default: 80% of available memory)
+    :type max_memory: `int`/`str`
+
+    :returns: `int`
+    """
+    budget = parse_memory(max_memory)
+    if budget is None:
+        available = available_memory()
+        if available is None:
+            return num_workers
+        budget = available * 0.8
+    estimates = sorted((estimate_task_memory(s, usecols, conc) for s in sizes), reverse=True)
+    if estimates and WORKER_MEMORY + estimates[0] > budget:
+        import warnings
+        warnings.warn('The biggest file may need more memory than max_memory '
+                      'allows, and is searched whole.')
+    used = 0
+    for n in range(num_workers):
+        cost = WORKER_MEMORY + (estimates[n] if n < len(estimates) else 0)
+        if n and used + cost > budget:
+            return n
+        used += cost
+    return num_workers
+
+def largest_file(path):
+    """
+    Size in bytes of the biggest file in or at `path`
+    """
+    import os
+    from corpkit.manifest import listing
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    if not os.path.isdir(path):
+        return 0
+    entry = listing(path)
+    return max(entry['sizes'] + [largest_file(os.path.join(path, d)) for d in entry['dirs']] + [0])
+
+def unpicklable(kwargs):
+    """
+    Names of the arguments that can't be sent to worker processes
+
+    :returns: sorted `list` of `str`
+    """
+    from corpkit.process import canpickle
+    return sorted(k for k, v in kwargs.items() if not canpickle(v))
+
+def shard_files(to_iterate_over, pipeline_kwargs, multiprocess=True,
+                nosubmode=False, workers=None, compact=True, telemetry=None,
+                max_memory=None):
+    """
+    Search every file of an interrogation on a pool of worker processes.
+
+    Tasks are single files, submitted largest first. Without a running pool
+    to use, they go on one queue that idle workers take from, rather than
+    waiting behind a big subcorpus. Results are given back in the original
+    order, so only a few files are sent ahead of the earliest unfinished one:
+    when too many results are waiting for it, the earliest files are sent
+    instead of the largest.
+
+    :param to_iterate_over: ``(name, path), files`` pairs, in the order the
+                            results should come back
+    :type to_iterate_over: `list`
+
+    :param pipeline_kwargs: Arguments for :func:`corpkit.conll.pipeline`
+    :type pipeline_kwargs: `dict`
+
+    :param multiprocess: Number of processes, or ``True`` for one per core
+    :type multiprocess: `int`/`bool`
+
+    :param workers: A running pool to use instead of starting a new one
+    :type workers: :class:`corpkit.multiprocess.WorkerPool`
+
+    :param compact: Send plain results back as id and count arrays. The
+                    results come back as ``Counter`` objects
+    :type compact: `bool`
+
+    :param telemetry: Counters to add each finished file to
+    :type telemetry: :class:`corpkit.telemetry.Telemetry`
+
+    :param max_memory: Memory budget, used to limit how many files are
+                       searched at once
+    :type max_memory: `int`/`str`
+
+    :returns: A generator of ``(res, conc_res)`` for each file, in original order
+    """
+    import os
+    import multiprocessing
+    from corpkit.telemetry import count_matches
+
+    tasks = []
+    for (subcorpus_name, _), files in to_iterate_over:
+        category = 'Total' if nosubmode else subcorpus_name
+        for f in files:
+            tasks.append((len(tasks), category, f.path))
+
+    if not tasks:
+        return
+
+    # workers without every argument would search differently
+    unsent = unpicklable(pipeline_kwargs)
+    if unsent:
+        raise ValueError("Can't send %s to worker processes." % ', '.join(unsent))
+
+    # the concordance line limit is applied while merging
+    kwargs = dict(pipeline_kwargs)
+    kwargs['maxconc'] = (kwargs.get('maxconc', (False, 0))[0], 0)
+
+    sizes = {t[0]: os.path.getsize(t[2]) for t in tasks}
+    order = sorted(tasks, key=lambda t: sizes[t[0]], reverse=True)
+
+    # a pool just for this interrogation, without caching. bigger
+    # files are searched first, so the estimate is for the biggest ones
+    if multiprocess is True or not multiprocess:
+        multiprocess = multiprocessing.cpu_count()
+    wanted = workers.processes if workers is not None else min(int(multiprocess), len(tasks))
+    max_active = memory_limited_workers(list(sizes.values()), max(1, wanted),
+                                        usecols=kwargs.get('usecols'),
+                                        conc=bool(kwargs.get('conc')),
+                                        max_memory=max_memory)
+    own_pool = workers is None
+    if own_pool:
+        workers = WorkerPool(max_active, cache_size=0)
+
+    # most files searched at once, and most results kept waiting for an
+    # earlier file before the earliest files are sent instead
+    ahead = 2 * max_active
+    pending = {}
+    sent = set()
+
+    def feed():
+        by_size = iter(order)
+        by_index = iter(tasks)
+        while len(sent) < len(tasks):
+            source = by_index if len(pending) >= ahead else by_size
+            for task in source:
+                if task[0] not in sent:
+                    break
+            sent.add(task[0])
+            yield task
+
+    decoder = VocabDecoder()
+    try:
+        upto = 0
+        # messages arrive in the order each worker made them
+        for index, res, conc_res, tokens in workers.run(feed(), kwargs, compact=compact,
+                                                        max_active=max_active, ahead=ahead):
+            if compact and isinstance(res, tuple):
+                res = decoder.counter(res)
+                conc_res = from_columns(conc_res)
+            if telemetry is not None:
+                telemetry.add(files=1, tokens=tokens, bytes=sizes[index],
+                              matches=count_matches(res))
+            pending[index] = (res, conc_res)
+            while upto in pending:
+                yield pending.pop(upto)
+                upto += 1
+    finally:
+        if own_pool:
+            workers.close()
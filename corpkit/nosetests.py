@@ -28,6 +28,18 @@ parsed_path = 'data/test-plain-parsed'
 speak_path = 'data/test-speak-parsed'
 tok_path = 'data/test-tokenised'
 
+def setup_module():
+    """Keep results cached by the tests apart from any others"""
+    import tempfile
+    from corpkit import resultcache
+    resultcache.CACHE_DIR = tempfile.mkdtemp()
+
+def teardown_module():
+    import shutil
+    from corpkit import resultcache
+    shutil.rmtree(resultcache.CACHE_DIR, ignore_errors=True)
+    resultcache.CACHE_DIR = None
+
 def test_import():
     import corpkit
     from dictionaries.wordlists import wordlists
@@ -39,6 +51,34 @@ def test_corpus_class():
     unparsed = Corpus(unparsed_path)
     assert_equals(os.path.basename(unparsed_path), unparsed.name)
  
+def test_manifest():
+    """Test that the saved corpus listing matches the directories"""
+    from manifest import get_manifest
+    corp = Corpus(speak_path)
+    manifest = get_manifest(speak_path, count=True)
+    assert_equals([s.name for s in corp.subcorpora], manifest.subdirs())
+    assert_equals([r['path'] for r in manifest.records()], corp.all_filepaths)
+    assert_equals(all(r['tokens'] > 0 for r in manifest.records()), True)
+    # parsed paths that aren't directories fail as listing them would
+    nose.tools.assert_raises(OSError, Corpus, 'data/missing-parsed')
+    import tempfile
+    handle, path = tempfile.mkstemp(suffix='-parsed')
+    os.close(handle)
+    try:
+        nose.tools.assert_raises(OSError, Corpus, path)
+    finally:
+        os.remove(path)
+
+def test_file_lookup():
+    """Test finding files by name, and reading them through their handles"""
+    corp = Corpus(speak_path)
+    files = corp.subcorpora[0].files
+    last = files[-1]
+    assert_equals(files[last.name].path, last.path)
+    assert_equals(corp.subcorpora[0][last.name].path, last.path)
+    assert_equals(files['no-such-file'], None)
+    assert_equals(len(last.document) > 0, True)
+
 def test_parse():
     """Test CoreNLP parsing"""
     import shutil
@@ -127,7 +167,412 @@ def test_interro3():
 #    d = {'and interrogating': {'first': 0, 'second': 2},
 #         'concordancing and': {'first': 0, 'second': 2}}
 #    assert_equals(data.results.to_dict(), d)
-  
+
+def test_interro_sparse():
+    """Testing sparse results against dense ones"""
+    from process import is_sparse
+    corp = Corpus(parsed_path)
+    dense = corp.interrogate({'w': r'^c'}, show=['l'], cache=False)
+    data = corp.interrogate({'w': r'^c'}, show=['l'], sparse=True, cache=False)
+    assert_equals(is_sparse(data.results), True)
+    assert_equals(data.totals.equals(dense.totals), True)
+    densified = data.results.sparse.to_dense()[list(dense.results.columns)]
+    assert_equals(densified.equals(dense.results), True)
+    # editing doesn't densify
+    assert_equals(is_sparse(data.edit(print_info=False).results), True)
+
+def test_compact_partials():
+    """Testing that compact results from workers decode to the serial results"""
+    from collections import Counter
+    from corpkit.multiprocess import VocabEncoder, VocabDecoder, to_columns, from_columns
+    first, second = VocabEncoder('test'), VocabEncoder('test')
+    second.source = first.source + 1
+    decoder = VocabDecoder()
+    for encoder, counted in [(first, Counter({'a': 2, 'b': 1})),
+                             (second, Counter({'b': 3, 'c': 1})),
+                             (first, Counter({'c': 4, 'a': 1}))]:
+        message = encoder.encode(list(counted), list(counted.values()))
+        assert_equals(decoder.counter(message), counted)
+    # results already sent aren't sent again
+    assert_equals(first.encode(['a', 'b', 'c'], [1, 1, 1])[2], [])
+    lines = [['1', 'first', 'a'], ['2', 'second', 'b']]
+    assert_equals(from_columns(to_columns(lines)), lines)
+    corp = Corpus(speak_path)
+    searches = {'c': {'w': r'^c'}, 't': {'w': r'^t'}}
+    data = corp.interrogate(searches, show=['l'], multiprocess=2, use_interrodict=True, cache=False)
+    for name, search in searches.items():
+        serial = corp.interrogate(search, show=['l'], cache=False).results
+        found = data[name].results
+        assert_equals(found[sorted(found.columns)].equals(serial[sorted(serial.columns)]), True)
+
+def test_interro_approx_topk():
+    """Testing bounded top-k interrogation"""
+    corp = Corpus(parsed_path)
+    data = corp.interrogate({'w': r'^c'}, show=['l'], approx_topk=2)
+    # at most k results are kept for each subcorpus
+    assert_equals(((data.results > 0).sum(axis=1) <= 2).all(), True)
+    assert_equals(data.results.iloc[:, 0].sum() > 0, True)
+    assert_equals(sorted(data.query['approx_error']), ['first', 'second'])
+
+def test_interro_sharded():
+    """Testing that files searched by worker processes give the serial results"""
+    corp = Corpus(speak_path)
+    for kwargs in [{'show': ['l']}, {'show': ['w'], 'conc': True}, {'show': ['w'], 'subcorpora': 'speaker'}]:
+        serial = corp.interrogate({'w': r'^[a-z]'}, cache=False, **kwargs)
+        sharded = corp.interrogate({'w': r'^[a-z]'}, multiprocess=2, cache=False, **kwargs)
+        assert_equals(sharded.results.equals(serial.results), True)
+        if kwargs.get('conc'):
+            assert_equals(len(sharded.concordance), len(serial.concordance))
+
+def test_telemetry():
+    """Testing progress counters from worker processes against a serial run"""
+    corp = Corpus(speak_path)
+    serial, parallel = [], []
+    one = corp.interrogate({'w': r'^[a-z]'}, show=['l'], progress=serial.append, cache=False)
+    two = corp.interrogate({'w': r'^[a-z]'}, show=['l'], progress=parallel.append,
+                           multiprocess=2, cache=False)
+    for data, seen in [(one, serial), (two, parallel)]:
+        counts = data.query['telemetry']
+        assert_equals(counts['files'], len(corp.all_filepaths))
+        assert_equals(counts['matches'], data.results.sum().sum())
+        assert_equals(seen[-1]['files'], counts['files'])
+    assert_equals(one.query['telemetry']['tokens'], two.query['telemetry']['tokens'])
+    assert_equals(one.query['telemetry']['bytes'], two.query['telemetry']['bytes'])
+
+def test_max_memory():
+    """Testing that a memory budget limits workers, not results"""
+    from corpkit.multiprocess import parse_memory, memory_limited_workers
+    assert_equals(parse_memory('1.5K'), 1536)
+    assert_equals(parse_memory('16G'), 16 * 1024 ** 3)
+    import warnings
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        assert_equals(memory_limited_workers([10 ** 6] * 4, 4, max_memory=1), 1)
+    # files too big for the budget aren't split, so this is only a warning
+    assert_equals(len([w for w in caught if 'max_memory' in str(w.message)]), 1)
+    assert_equals(memory_limited_workers([10 ** 6] * 4, 4, max_memory='1T'), 4)
+    corp = Corpus(speak_path)
+    serial = corp.interrogate({'w': r'^[a-z]'}, show=['l'], cache=False)
+    limited = corp.interrogate({'w': r'^[a-z]'}, show=['l'], multiprocess=2, max_memory=1, cache=False)
+    assert_equals(limited.results.equals(serial.results), True)
+
+def test_worker_pool():
+    """Testing that a persistent pool gives serial results, with each file kept on one worker"""
+    corp = Corpus(speak_path)
+    serial = corp.interrogate({'w': r'^[a-z]'}, show=['l'], cache=False)
+    with corp.start_workers(2) as workers:
+        first = corp.interrogate({'w': r'^[a-z]'}, show=['l'], cache=False)
+        homes = dict(workers.homes)
+        again = corp.interrogate({'w': r'^[a-z]'}, show=['l'], cache=False)
+        assert_equals(workers.homes, homes)
+    assert_equals(sorted(homes.values()), [0, 1])
+    assert_equals(first.results.equals(serial.results), True)
+    assert_equals(again.results.equals(serial.results), True)
+
+def test_ainterrogate():
+    """Testing asyncio interrogation, streaming and cancelling against a blocking run"""
+    import sys
+    if sys.version_info < (3, 5):
+        raise nose.SkipTest('ainterrogate needs Python 3.5')
+    import asyncio
+    corp = Corpus(speak_path)
+    serial = corp.interrogate({'w': r'^[a-z]'}, show=['l'], cache=False)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        data = loop.run_until_complete(corp.ainterrogate({'w': r'^[a-z]'}, show=['l']))
+        assert_equals(data.results.equals(serial.results), True)
+        stream = corp.ainterrogate_stream({'w': r'^[a-z]'}, show=['l'])
+        parts = []
+        while True:
+            try:
+                parts.append(loop.run_until_complete(stream.__anext__()))
+            except StopAsyncIteration:
+                break
+        assert_equals([p.name for p in parts], ['first', 'second'])
+        for part in parts:
+            assert_equals(sum(part.results[part.name].values()), serial.results.loc[part.name].sum())
+        assert_equals(loop.run_until_complete(stream.result()).results.equals(serial.results), True)
+        # stopped before searching anything
+        stream = corp.ainterrogate_stream({'w': r'^[a-z]'}, show=['l'])
+        stream.cancel()
+        assert_equals(loop.run_until_complete(stream.result()), None)
+    finally:
+        loop.close()
+        asyncio.set_event_loop(None)
+
+def test_cluster():
+    """Testing interrogation over two worker daemons, one of which dies part way"""
+    import os
+    import shutil
+    import signal
+    import socket
+    import tempfile
+    import multiprocessing
+    from time import sleep
+    from corpkit.cluster import serve, Cluster
+    tmp = tempfile.mkdtemp()
+    try:
+        for sub in ['first', 'second']:
+            os.makedirs(os.path.join(tmp, 'corp', sub))
+            src = os.path.join(speak_path, sub)
+            text = ''.join(open(os.path.join(src, f)).read() for f in sorted(os.listdir(src)))
+            for i in range(5):
+                with open(os.path.join(tmp, 'corp', sub, '%02d.txt.conll' % i), 'w') as fo:
+                    fo.write('\n'.join([text.strip('\n')] * 10) + '\n')
+        corp = Corpus(os.path.join(tmp, 'corp'))
+        local = corp.interrogate({'w': r'^[a-z]'}, show=['l'], cache=False)
+        ports = []
+        for _ in range(2):
+            sock = socket.socket()
+            sock.bind(('127.0.0.1', 0))
+            ports.append(sock.getsockname()[1])
+            sock.close()
+        daemons = [multiprocessing.Process(target=serve, args=(corp.path,),
+                                           kwargs={'listen': '127.0.0.1:%d' % port, 'authkey': 'test',
+                                                   'processes': 1, 'quiet': True})
+                   for port in ports]
+        for daemon in daemons:
+            daemon.start()
+        cluster = Cluster(['127.0.0.1:%d' % port for port in ports], authkey='test')
+        for _ in range(100):
+            try:
+                if len(cluster.files()) == 2:
+                    break
+            except IOError:
+                pass
+            sleep(0.1)
+        # the first daemon dies as soon as it has been given its files
+        batches = []
+        run_batch = Cluster._run_batch
+        def killing(self, number, address, *args):
+            batches.append(address)
+            if address[1] == ports[0]:
+                os.kill(daemons[0].pid, signal.SIGKILL)
+                daemons[0].join()
+            return run_batch(self, number, address, *args)
+        Cluster._run_batch = killing
+        try:
+            remote = corp.interrogate({'w': r'^[a-z]'}, show=['l'], cache=False, cluster=cluster)
+            # a daemon that has hung is given up on, rather than waited for
+            os.kill(daemons[1].pid, signal.SIGSTOP)
+            try:
+                Cluster('127.0.0.1:%d' % ports[1], authkey='test', timeout=1).files()
+            except IOError as err:
+                hung = err
+            os.kill(daemons[1].pid, signal.SIGCONT)
+        finally:
+            Cluster._run_batch = run_batch
+            for daemon in daemons:
+                daemon.terminate()
+                daemon.join()
+        assert_equals(remote.results.equals(local.results), True)
+        # the first daemon's files were given to the second
+        assert_equals(batches.count(('127.0.0.1', ports[1])), 2)
+        assert_equals(isinstance(hung, IOError), True)
+    finally:
+        shutil.rmtree(tmp)
+
+def test_interro_approx():
+    """Testing estimates from a stratified sample"""
+    corp = Corpus(speak_path)
+    exact = corp.interrogate({'w': r'^[a-z]'})
+    est = corp.interrogate({'w': r'^[a-z]'}, approx=0.05)
+    # too few files to sample, so everything is searched
+    assert_equals(est.query['approx_fraction'], {'first': 1.0, 'second': 1.0})
+    assert_equals(est.results.sum().sum(), exact.results.sum().sum())
+    lower, upper = est.query['approx_interval']
+    assert_equals((lower.values <= est.results.values).all(), True)
+    assert_equals(len(corp.sample(0.5).files), 1)
+
+def test_result_cache():
+    """Testing cached results, and throwing them away when a directory changes"""
+    import os
+    from corpkit.resultcache import CACHE_STATS
+    corp = Corpus(speak_path)
+    first = corp.interrogate({'w': r'^th'}, show=['l'], cache=True)
+    hits = CACHE_STATS['hits']
+    again = corp.interrogate({'w': r'^th'}, show='L', cache=True)
+    assert_equals(CACHE_STATS['hits'], hits + 1)
+    assert_equals(again.results.equals(first.results), True)
+    # only used when asked for
+    corp.interrogate({'w': r'^th'}, show=['l'])
+    assert_equals(CACHE_STATS['hits'], hits + 1)
+    folder = os.path.dirname(corp.all_filepaths[0])
+    stat = os.stat(folder)
+    os.utime(folder, (stat.st_atime, stat.st_mtime + 1))
+    invalidated = CACHE_STATS['invalidated']
+    corp.interrogate({'w': r'^th'}, show=['l'], cache=True)
+    assert_equals(CACHE_STATS['invalidated'], invalidated + 1)
+    assert_equals(CACHE_STATS['hits'], hits + 1)
+    # callbacks need a real search
+    seen = []
+    corp.interrogate({'w': r'^th'}, show=['l'], cache=True,
+                     on_subcorpus=lambda *args: seen.append(args))
+    assert_equals(len(seen), 2)
+    assert_equals(CACHE_STATS['hits'], hits + 1)
+
+def test_interro_incremental():
+    """Testing refreshing an interrogation by searching only changed files"""
+    import os
+    import shutil
+    import tempfile
+    def same(one, two):
+        # ties can come in either order
+        return one[sorted(one.columns)].equals(two[sorted(two.columns)])
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, 'test-speak-parsed')
+        shutil.copytree(speak_path, path)
+        corp = Corpus(path)
+        data = corp.interrogate({'w': r'^[a-z]'}, show=['l'], conc=True,
+                                incremental=True, cache=False)
+        assert_equals(len(data.partials), 2)
+        stat = os.stat(corp.all_filepaths[0])
+        os.utime(corp.all_filepaths[0], (stat.st_atime, stat.st_mtime + 1))
+        data.refresh()
+        assert_equals(data.query['incremental'], {'searched': 1, 'reused': 1, 'removed': 0})
+        full = corp.interrogate({'w': r'^[a-z]'}, show=['l'], conc=True, cache=False)
+        assert_equals(same(data.results, full.results), True)
+        # a new file is added to the totals, and taken off again when deleted
+        first = [f for s in corp.subcorpora for f in s.files][0].path
+        copied = os.path.join(os.path.dirname(first), 'copy.txt.conll')
+        shutil.copy(first, copied)
+        data.refresh()
+        assert_equals(data.query['incremental'], {'searched': 1, 'reused': 2, 'removed': 0})
+        full = Corpus(path).interrogate({'w': r'^[a-z]'}, show=['l'], conc=True, cache=False)
+        assert_equals(same(data.results, full.results), True)
+        assert_equals(len(data.concordance), len(full.concordance))
+        os.remove(copied)
+        data.refresh()
+        assert_equals(data.query['incremental'], {'searched': 0, 'reused': 2, 'removed': 1})
+        full = Corpus(path).interrogate({'w': r'^[a-z]'}, show=['l'], conc=True, cache=False)
+        assert_equals(same(data.results, full.results), True)
+        assert_equals(len(data.concordance), len(full.concordance))
+    finally:
+        shutil.rmtree(tmp)
+
+def test_tregex_server_fallback():
+    """Testing that searches fall back when the Tregex server can't be used"""
+    from corpkit import tregexserver
+    from corpkit.process import tregex_spans
+    trees = '(ROOT (S (NP (DT the) (NN dog)) (VP (VBZ barks))))'
+    # options the server doesn't know are never sent to it
+    assert_equals(tregexserver.batch_search(trees, [('NP', ['-q'])]), None)
+    saved = (tregexserver.TregexServer.class_dir, tregexserver.SERVER_BROKEN,
+             list(tregexserver.SERVERS), list(tregexserver.IDLE))
+    def missing(self):
+        raise IOError('TregexServer.class not found')
+    tregexserver.TregexServer.class_dir = missing
+    tregexserver.SERVER_BROKEN = False
+    tregexserver.SERVERS[:], tregexserver.IDLE[:] = [], []
+    try:
+        assert_equals(tregexserver.batch_search(trees, [('NP', ['-o'])]), None)
+        assert_equals(tregexserver.get_server(), None)
+        # span searches without an index then leave it to tregex.sh
+        assert_equals(tregex_spans(trees, 'NP', ['-o']), None)
+        corp = Corpus(speak_path)
+        data = corp.interrogate({'t': r'NP < DT'}, show=['w'], conc=True, cache=False)
+        baseline = corp.interrogate({'t': r'NP < DT'}, show=['w'], tgrep=True, cache=False)
+        # tgrep keeps the case of matches, so compare totals
+        assert_equals(data.totals.equals(baseline.totals), True)
+        assert_equals(len(data.concordance), baseline.totals.sum())
+    finally:
+        tregexserver.TregexServer.class_dir = saved[0]
+        tregexserver.SERVER_BROKEN = saved[1]
+        tregexserver.SERVERS[:], tregexserver.IDLE[:] = saved[2], saved[3]
+
+def test_tree_index():
+    """Testing tree index queries against tgrep"""
+    from treeindex import get_index
+    corp = Corpus(speak_path)
+    data = corp.interrogate({'t': r'NP < DT'}, show=['w'], tgrep=True)
+    index = get_index(corp.subcorpora[0].files[0].path)
+    counts = [get_index(f.path).count(r'NP < DT') for s in corp.subcorpora for f in s.files]
+    assert_equals(sum(counts), data.results.sum().sum())
+    assert_equals(index.count(r'NP=n < DT'), None)
+
+def test_file_trees():
+    """Testing that changing a file's trees doesn't change searches"""
+    corp = Corpus(speak_path)
+    first = corp.interrogate({'t': r'NP < DT'}, show=['w'], tgrep=True, cache=False)
+    files = [f for s in corp.subcorpora for f in s.files]
+    for f in files:
+        for tree in f.trees.values():
+            for sub in tree.subtrees():
+                sub.set_label('X')
+    again = corp.interrogate({'t': r'NP < DT'}, show=['w'], tgrep=True, cache=False)
+    assert_equals(again.results.equals(first.results), True)
+    assert_equals(Corpus(speak_path).subcorpora[0].files[0].trees[1].label() == 'X', False)
+
+def test_dotfile_update():
+    """Testing that the metadata dotfile is updated by reading only changed files"""
+    import shutil
+    import tempfile
+    import corpkit.build
+    from corpkit.build import scan_corpus_metadata
+    from process import get_corpus_metadata
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, 'test-dotfile-parsed')
+    dotpath = os.path.join('data', '.test-dotfile-parsed.json')
+    shutil.copytree(speak_path, path)
+    scan = corpkit.build.scan_file_metadata
+    try:
+        data = get_corpus_metadata(path, generate=True)
+        # reading files in parallel finds what reading them in turn does
+        assert_equals(data['files'], scan_corpus_metadata(path, processes=1))
+        assert_equals(data['files'], scan_corpus_metadata(path, processes=2))
+        changed = os.path.join(path, 'first', 'intro.txt.conll')
+        with open(changed) as fo:
+            text = fo.read()
+        with open(changed, 'w') as fo:
+            fo.write(text.replace('speaker=TESTER', 'speaker=CHANGED'))
+        read = []
+        def counted(f):
+            read.append(f)
+            return scan(f)
+        corpkit.build.scan_file_metadata = counted
+        data = get_corpus_metadata(path)
+        assert_equals(read, [changed])
+        assert_equals('CHANGED' in data['fields']['speaker'], True)
+        os.remove(changed)
+        assert_equals(sorted(get_corpus_metadata(path)['files']), ['second/body.txt.conll'])
+    finally:
+        corpkit.build.scan_file_metadata = scan
+        shutil.rmtree(tmp)
+        if os.path.isfile(dotpath):
+            os.remove(dotpath)
+
+def test_metadata_sentence_index():
+    """Testing sentence filtering by metadata index"""
+    from process import sentences_by_metadata
+    corp = Corpus(speak_path)
+    sents = sentences_by_metadata(corp.path, just_metadata={'speaker': ['TESTER']})
+    assert_equals(sorted(len(v) for v in sents.values()), [0, 4])
+    data = corp.interrogate({'w': r'^[a-z]'}, just_metadata={'speaker': ['TESTER']})
+    assert_equals(list(data.results.index), ['first', 'second'])
+    assert_equals(data.results.loc['second'].sum(), 0)
+
+def test_metadata_masks():
+    """Testing metadata filters made with masks against checking each sentence"""
+    from conll import cut_df_by_meta, metadata_matches
+    corp = Corpus(speak_path)
+    for f in [f for s in corp.subcorpora for f in s.files]:
+        for just, skip in [({'speaker': ['TESTER']}, {}),
+                           ({}, {'speaker': r'TESTER|NEWCOMER'}),
+                           ({'year': ['2004', '2005']}, {'test': r'^off$'}),
+                           ({'missing': ['x']}, {})]:
+            df = f.document
+            metadata = df._metadata
+            checks = [(k, v, 'just') for k, v in just.items()] + \
+                     [(k, v, 'skip') for k, v in skip.items()]
+            expected = [i for i in sorted(metadata)
+                        if all(metadata_matches(metadata[i].get(k, 'none'), v, method=method)
+                               for k, v, method in checks)]
+            cut = cut_df_by_meta(df, just, skip)
+            assert_equals(sorted(set(cut.index.get_level_values(0))), expected)
+            assert_equals(sorted(cut._metadata), expected)
+
 def test_interro_multiindex_tregex_justspeakers():
     """Testing interrogation 6"""
     import pandas as pd
@@ -147,6 +592,19 @@ def test_conc():
     assert_equals(data.ix[0]['m'], 'small')
 
 # this syntax isn't recognised by tgrep, so we'll skip it in tests
+def test_conc_lines_from_whole_mid():
+    """Testing concordance lines made from Tregex matches and whole sentences"""
+    from process import make_conc_lines_from_whole_mid
+    whole = ('data/first/intro.txt.conll', 'TESTER', 'The dog saw the dog .')
+    # a match found twice in a sentence gives a line for each place
+    lines = make_conc_lines_from_whole_mid([whole, whole], [('f', 'the dog'), ('f', 'the dog')], show=['w'])
+    assert_equals([l[4:] for l in lines], [['', 'The dog', 'saw the dog .'],
+                                           ['The dog saw', 'the dog', '.']])
+    assert_equals(lines[0][:4], ['_,_', '', 'intro.txt.conll', 'TESTER'])
+    # and found once, only one line, however often its words occur
+    lines = make_conc_lines_from_whole_mid([whole], [('f', 'dog/nn')], show=['w', 'p'])
+    assert_equals([l[4:] for l in lines], [['The', 'dog', 'saw the dog .']])
+
 def test_edit():
     """Testing edit function"""
     corp = Corpus(parsed_path)
@@ -217,6 +675,27 @@ def test_symbolic_subcorpora():
     spks = ['ANONYMOUS', 'NEWCOMER', 'TESTER', 'UNIDENTIFIED']
     assert_equals(list(res.results.index), spks)
 
+def test_symbolic_subcorpora_overlap():
+    """
+    Check that each sentence is counted for its own metadata value only
+    """
+    corpus = Corpus(speak_path)
+    res = corpus.interrogate({'w': r'^[a-z]'}, subcorpora='test')
+    total = corpus.interrogate({'w': r'^[a-z]'})
+    assert_equals(list(res.results.index), ['none', 'off', 'on'])
+    assert_equals(res.results.sum().sum(), total.results.sum().sum())
+
+def test_metadata_ranges():
+    """
+    Check range filters and binned subcorpora over numeric metadata
+    """
+    corpus = Corpus(speak_path)
+    ranged = corpus.interrogate({'w': r'^[a-z]'}, just_metadata={'year': (2003, 2005)})
+    listed = corpus.interrogate({'w': r'^[a-z]'}, just_metadata={'year': ['2004', '2005']})
+    assert_equals(ranged.results.sum().sum(), listed.results.sum().sum())
+    binned = corpus.interrogate({'w': r'^[a-z]'}, subcorpora=('year', 2))
+    assert_equals(list(binned.results.index), ['2002-2003', '2004-2005', 'none'])
+
 def test_symbolic_multiindex():
     """
     Check that we can make a named multiindex
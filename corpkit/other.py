@@ -742,14 +742,23 @@ def topwords(self, datatype='n', n=10, df=False, sort=True, precision=2):
         operation = 'k'
     else:
         operation = '%'
+    from corpkit.process import is_sparse
+
+    def get_row(x):
+        """get a row of results, using only nonzero cells if sparse"""
+        row = self.results.loc[x]
+        if is_sparse(row):
+            row = row[row != 0].astype(row.dtype.subtype)
+        return row
+
     if isinstance(self, corpkit.interrogation.Interrodict):
         to_iterate = self.items()
     else:
         if sort is True:
-            to_iterate = [(x, self.results.ix[x].sort_values(ascending=ascend)) \
+            to_iterate = [(x, get_row(x).sort_values(ascending=ascend)) \
                           for x in list(self.results.index)]
         else:
-            to_iterate = [(x, self.results.ix[x]) for x in list(self.results.index)]
+            to_iterate = [(x, get_row(x)) for x in list(self.results.index)]
     for name, data in to_iterate:
         if isinstance(self, corpkit.interrogation.Interrodict):
             if sort is True:
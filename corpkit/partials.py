@@ -0,0 +1,211 @@
+"""
+corpkit: what each file contributed to an interrogation, so that it can be
+brought up to date by searching only the files that are new or changed
+
+An interrogation made with ``incremental=True`` keeps a :class:`Partials`
+as its `partials` attribute. It holds the counts and concordance lines of
+every file searched, with the size and modification time the file had when
+it was searched, and the counts of all files added together.
+:func:`~corpkit.interrogation.Interrogation.refresh` takes what changed and
+deleted files found off those totals, and searches only new and changed
+files, adding what they find. Files edited in place don't change their
+directory, so file times are still read, one directory listing at a time.
+"""
+
+from __future__ import print_function
+
+from collections import Counter
+
+# arguments about how an interrogation runs, not what it finds, which are
+# left out of the call that refreshing repeats
+RUN_ONLY = {'multiprocess', 'workers', 'telemetry', 'progress', 'cancel',
+            'on_subcorpus', 'cluster', 'save', 'max_memory', 'partials',
+            'incremental', 'cache'}
+
+def stamp(path):
+    """
+    Size and modification time of a file, or `None` if it is gone
+    """
+    import os
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return
+    return stat.st_size, stat.st_mtime
+
+def stamps(paths):
+    """
+    Size and modification time of each file, listing each directory once
+
+    :returns: `dict` of ``(size, mtime)`` by path, without files that are gone
+    """
+    import os
+    from corpkit.manifest import scan_dir
+    out = {}
+    for folder in set(os.path.dirname(p) for p in paths):
+        try:
+            _, files = scan_dir(folder or os.curdir)
+        except OSError:
+            continue
+        for name, size, mtime in files:
+            out[os.path.join(folder, name)] = (size, mtime)
+    return out
+
+class Partials(object):
+    """
+    The results of an interrogation file by file, and the call that made it
+
+    :param path: Path to the corpus or subcorpus interrogated
+    :type path: `str`
+
+    :param level: Level of the corpus, ``'c'`` or ``'s'``
+    :type level: `str`
+
+    :param datatype: Datatype of the corpus
+    :type datatype: `str`
+
+    :param search: Search criteria, as given to the interrogation
+    :type search: `dict`
+
+    :param args: Other positional arguments to the interrogation
+    :type args: `tuple`
+
+    :param kwargs: Keyword arguments to the interrogation
+    :type kwargs: `dict`
+    """
+
+    def __init__(self, path, level, datatype, search, args, kwargs):
+        self.path = path
+        self.level = level
+        self.datatype = datatype
+        self.search = search
+        self.args = tuple(args)
+        self.kwargs = {k: v for k, v in kwargs.items() if k not in RUN_ONLY}
+        # stamp, counts and concordance lines of each file
+        self.files = {}
+        # counts of all files, and how many files have counts for each key
+        self.totals = {}
+        self.members = Counter()
+        # paths of the files in the order they are searched
+        self.order = []
+        self.report = {}
+        self._stamps = {}
+
+    def start(self, to_iterate_over):
+        """
+        Begin a pass over the corpus. Unchanged files are left out of
+        `to_iterate_over`, and what changed and deleted files found before
+        is taken off the totals. The stamps of changed files are kept for
+        :meth:`put`, so that a file changed while being searched is searched
+        again next time.
+
+        :param to_iterate_over: ``(name, path): files`` for each subcorpus,
+                                changed in place
+        :type to_iterate_over: `dict`
+        """
+        paths = [f.path for files in to_iterate_over.values()
+                 if isinstance(files, list) for f in files]
+        now = stamps(paths)
+        self.order = []
+        self._stamps = {}
+        reused = 0
+        for key, files in sorted(to_iterate_over.items()):
+            if not isinstance(files, list):
+                continue
+            changed = []
+            for f in files:
+                self.order.append(f.path)
+                known = self.files.get(f.path)
+                if known is not None and known[0] == now.get(f.path):
+                    reused += 1
+                    continue
+                self.forget(f.path)
+                self._stamps[f.path] = now.get(f.path)
+                changed.append(f)
+            to_iterate_over[key] = changed
+        seen = set(self.order)
+        gone = [p for p in self.files if p not in seen]
+        for path in gone:
+            self.forget(path)
+        self.report = {'searched': 0, 'reused': reused, 'removed': len(gone)}
+
+    def add(self, counts, sign=1):
+        """
+        Add a file's counts to the totals, or take them off with ``sign=-1``.
+        Counts are a `Counter` of results, or a number in count mode.
+        """
+        for key, value in counts.items():
+            if sign > 0:
+                if key in self.totals:
+                    self.totals[key] = self.totals[key] + value
+                else:
+                    self.totals[key] = value.copy() if hasattr(value, 'copy') else value
+                self.members[key] += 1
+            else:
+                self.totals[key] = self.totals[key] - value
+                self.members[key] -= 1
+                if not self.members[key]:
+                    del self.totals[key], self.members[key]
+
+    def forget(self, path):
+        """
+        Drop what a file found, taking its counts off the totals
+        """
+        known = self.files.pop(path, None)
+        if known is not None:
+            self.add(known[1], sign=-1)
+
+    def put(self, path, counts, lines):
+        """
+        Keep what a file has just been found to contain, adding it to the totals
+
+        :param counts: What the file added to the results, by subcorpus or
+                       metadata value
+        :type counts: `dict`
+
+        :param lines: ``(key, line)`` for each concordance line of the file
+        :type lines: `list`
+        """
+        self.files[path] = (self._stamps.get(path) or stamp(path), counts, lines)
+        self.add(counts)
+        self.report['searched'] += 1
+
+    def finish(self):
+        """
+        End a pass over the corpus
+
+        :returns: `dict` with the number of files searched, reused and removed
+        """
+        self._stamps = {}
+        return self.report
+
+    def concordance(self, maxconc=False):
+        """
+        Concordance lines of every file, in the order the files are searched
+
+        :returns: `dict` of lists of lines, by subcorpus or metadata value
+        """
+        from collections import defaultdict
+        out = defaultdict(list)
+        numconc = 0
+        for path in self.order:
+            known = self.files.get(path)
+            if known is None:
+                continue
+            for key, line in known[2]:
+                if maxconc is False or numconc < maxconc:
+                    out[key].append(line)
+                numconc += 1
+        return out
+
+    def corpus(self):
+        """
+        Make the corpus or subcorpus this interrogation searches
+        """
+        from corpkit.corpus import Corpus, Subcorpus
+        if self.level == 's':
+            return Subcorpus(self.path, self.datatype)
+        return Corpus(self.path, print_info=False)
+
+    def __len__(self):
+        return len(self.files)
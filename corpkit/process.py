@@ -112,11 +112,7 @@ def tregex_engine(corpus=False,
                 filenaming = True
 
         # append list of options to query 
-        if options:
-            if '-s' not in options and '-t' not in options:
-                options.append('-s')
-        else:
-            options = ['-o', '-t']
+        options = tregex_options(options)
         for opt in options:
             tregex_command.append(opt)       
         if query:
@@ -138,7 +134,18 @@ def tregex_engine(corpus=False,
         if filtermode:
             tregex_command.append('-filter')
 
-        if not filtermode:
+        # trees given as text can go to the long-running tregex process
+        res = None
+        if filtermode and not check_query and not check_for_trees \
+           and isinstance(corpus, STRINGTYPE) and not os.path.exists(corpus):
+            res = kwargs.get('server_output')
+            if res is None:
+                from corpkit.tregexserver import batch_search
+                res = (batch_search(corpus, [(query, options)]) or [None])[0]
+
+        if res is not None:
+            pass
+        elif not filtermode:
             res = subprocess.check_output(tregex_command, stderr=send_stderr_to)
             res = res.decode(encoding='UTF-8').splitlines()
         else:
@@ -252,6 +259,108 @@ def tregex_engine(corpus=False,
         res = make_tuples
     return res
 
+def tregex_options(options):
+    """
+    Fill in the default output options for a Tregex query
+    """
+    if not options:
+        return ['-o', '-t']
+    options = list(options)
+    if '-s' not in options and '-t' not in options:
+        options.append('-s')
+    return options
+
+def tregex_batch(corpus, queries, **kwargs):
+    """
+    Run several Tregex queries over the same trees. They are sent to the
+    Tregex server in one go where possible, and otherwise run one at a time.
+
+    :param corpus: Bracketed trees, one per line
+    :type corpus: `str`
+
+    :param queries: ``(query, options)`` pairs, or ``(query, options, kwargs)``
+                    with extra arguments for :func:`tregex_engine`
+    :type queries: `list`
+
+    :param index: Index of the file the trees are from, used instead of
+                  Tregex for the queries it can answer
+    :type index: :class:`corpkit.treeindex.TreeIndex`
+
+    :param sent_ids: Ids of the sentences in `corpus`, in order, if using
+                     `index`
+    :type sent_ids: `list`
+
+    :returns: a :func:`tregex_engine` result for each query
+    """
+    from corpkit.tregexserver import batch_search
+    index = kwargs.pop('index', None)
+    sent_ids = kwargs.pop('sent_ids', None)
+    queries = [tuple(q) if len(q) == 3 else tuple(q) + ({},) for q in queries]
+    full = [(getattr(q, 'pattern', q), tregex_options(ops)) for q, ops, _ in queries]
+    output = [None] * len(full)
+    if index is not None:
+        output = [index.tregex_output(q, ops, sent_ids) for q, ops in full]
+    todo = [i for i, lines in enumerate(output) if lines is None]
+    raw = batch_search(corpus, [full[i] for i in todo]) if todo and corpus.strip() else None
+    if raw is not None:
+        for i, lines in zip(todo, raw):
+            output[i] = lines
+    out = []
+    for i, (query, _, extra) in enumerate(queries):
+        kw = dict(kwargs, **extra)
+        if output[i] is not None:
+            kw['server_output'] = output[i]
+        out.append(tregex_engine(query=query, options=list(full[i][1]), corpus=corpus, **kw))
+    return out
+
+def tregex_spans(corpus, query, options, preserve_case=False, index=None, sent_ids=None):
+    """
+    Run a Tregex query once for concordancing, getting every match along
+    with the number of its tree, its span of leaves and the whole sentence.
+    This needs the tree index or the Tregex server: the one-shot command
+    can't print spans.
+
+    :param corpus: Bracketed trees, one per line, or a file or directory
+    :type corpus: `str`
+
+    :param options: Tregex output options for the match, i.e. ``['-o', '-t']``
+    :type options: `list`
+
+    :param index: Index of the file the trees are from
+    :type index: :class:`corpkit.treeindex.TreeIndex`
+
+    :param sent_ids: Ids of the sentences in `corpus`, in order, if using
+                     `index`
+    :type sent_ids: `list`
+
+    :returns: `list` of ``(filename, tree number, start, end, match, words)``
+              tuples, where `words` is the whole sentence as a `list`, or
+              `None` if it can't be done
+    """
+    import os
+    from corpkit.tregexserver import batch_search
+    query = getattr(query, 'pattern', query)
+    options = [o for o in tregex_options(options) if o not in ('-w', '-n', '-f')] + ['-spans']
+    lines = None
+    if index is not None:
+        lines = index.tregex_output(query, options, sent_ids)
+    if lines is None:
+        paths = os.path.exists(corpus)
+        if not paths and not corpus.strip():
+            return []
+        res = batch_search([corpus] if paths else corpus, [(query, options)], paths=paths)
+        lines = res[0] if res else None
+    if lines is None:
+        return
+    out = []
+    for line in lines:
+        fname, num, start, end, match, whole = line.split('\t', 5)
+        if not preserve_case:
+            match = match.lower().replace('/', '-slash-')
+            whole = whole.lower().replace('/', '-slash-')
+        out.append((fname, int(num), int(start), int(end), match, whole.split(' ')))
+    return out
+
 def show(lines, index, show='thread'):
     """show lines.ix[index][link] as frame"""
     import corpkit
@@ -377,11 +486,8 @@ def determine_datatype(path):
         else:
             exts = ['.txt']
     else:
-        for (root, dirs, fs) in os.walk(path):
-            for f in fs:
-                if '.' in f:
-                    ext = os.path.splitext(f)[1]
-                    exts.append(ext)
+        from corpkit.manifest import get_manifest
+        exts = get_manifest(path).extensions()
     counted = Counter(exts)
     counted.pop('', None)
     try:
@@ -863,6 +969,53 @@ def show_tree_as_per_option(show, tree, sent=False, df=False,
 
     return ixs[0], start, middle, end
 
+# ParentedTrees for recently searched files, newest last
+TREE_CACHE = None
+TREE_CACHE_SIZE = 32
+
+def get_trees(path, metadata, ids=None):
+    """
+    Get constituency trees for sentences in a file, parsing each one only
+    once for as long as the file is unchanged and recently used. The trees
+    are shared by every search of the file, so must not be changed: copy
+    them before handing them out.
+
+    :param path: The CONLL file the sentences come from
+    :type path: `str`
+
+    :param metadata: Sentence metadata, with a `parse` for each sentence
+    :type metadata: `dict`
+
+    :param ids: Sentence ids to get (default: all, in order)
+    :type ids: `list`
+
+    :returns: `list` of `nltk.tree.ParentedTree`
+    """
+    import os
+    from collections import OrderedDict
+    from nltk.tree import ParentedTree
+    global TREE_CACHE
+    if ids is None:
+        ids = sorted(metadata)
+    if not path or not os.path.isfile(path):
+        return [ParentedTree.fromstring(metadata[i]['parse']) for i in ids]
+    if TREE_CACHE is None:
+        TREE_CACHE = OrderedDict()
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    trees = TREE_CACHE.pop(key, None)
+    if trees is None:
+        trees = {}
+    TREE_CACHE[key] = trees
+    while len(TREE_CACHE) > TREE_CACHE_SIZE:
+        TREE_CACHE.popitem(last=False)
+    out = []
+    for i in ids:
+        tree = trees.get(i)
+        if tree is None:
+            tree = trees[i] = ParentedTree.fromstring(metadata[i]['parse'])
+        out.append(tree)
+    return out
+
 def tgrep(parse_string, search):
     """
     Uses tgrep to search a parse tree string
@@ -1276,48 +1429,192 @@ def format_tregex(results,
     
     return done
 
+def is_sparse(data):
+    """
+    Determine if a pandas object is stored sparsely
+
+    :returns: `bool`
+    """
+    import pandas as pd
+    if data.__class__.__name__.startswith('Sparse'):
+        return True
+    sparse_dtype = getattr(pd, 'SparseDtype', None)
+    if sparse_dtype is None:
+        return False
+    if isinstance(data, pd.DataFrame):
+        if data.empty:
+            return False
+        return all(isinstance(dt, sparse_dtype) for dt in data.dtypes)
+    return isinstance(getattr(data, 'dtype', None), sparse_dtype)
+
+def sparse_to_matrix(df):
+    """
+    Get a scipy.sparse matrix from a sparse DataFrame, without densifying
+    """
+    try:
+        return df.sparse.to_coo().tocsr()
+    except AttributeError:
+        return df.to_coo().tocsr()
+
+def sparse_sum(df, axis=0):
+    """
+    Sum a sparse DataFrame along an axis, returning a dense Series
+    """
+    import numpy as np
+    from pandas import Series
+    mat = sparse_to_matrix(df)
+    summed = np.asarray(mat.sum(axis=axis)).ravel()
+    return Series(summed, index=df.columns if axis == 0 else df.index)
+
+def make_sparse_results(results):
+    """
+    Turn a dict of subcorpus name -> Counter into a sparse DataFrame,
+    with subcorpora as rows and results as columns, sorted by total.
+
+    The matrix is built directly from the counters, so no dense
+    intermediate representation is ever made.
+
+    :returns: sparse `DataFrame` and `Series` of row totals
+    """
+    import numpy as np
+    import pandas as pd
+    from scipy import sparse
+
+    index = sorted(results.keys())
+    vocab = {}
+    rows, cols, vals = [], [], []
+    for row, name in enumerate(index):
+        counted = results[name]
+        if not counted:
+            continue
+        ids = np.fromiter((vocab.setdefault(k, len(vocab)) for k in counted.keys()),
+                          dtype=np.int64, count=len(counted))
+        cols.append(ids)
+        vals.append(np.fromiter(counted.values(), dtype=np.int64, count=len(counted)))
+        rows.append(np.full(len(counted), row, dtype=np.int64))
+
+    if vocab:
+        rows, cols, vals = np.concatenate(rows), np.concatenate(cols), np.concatenate(vals)
+    else:
+        rows, cols, vals = [np.array([], dtype=np.int64)] * 3
+
+    mat = sparse.coo_matrix((vals, (rows, cols)),
+                            shape=(len(index), len(vocab)),
+                            dtype=np.int64).tocsc()
+
+    # order columns by total, most frequent first
+    words = np.empty(len(vocab), dtype=object)
+    for word, ix in vocab.items():
+        words[ix] = word
+    order = np.argsort(-np.asarray(mat.sum(axis=0)).ravel(), kind='mergesort')
+    mat = mat[:, order]
+    columns = list(words[order])
+
+    try:
+        df = pd.DataFrame.sparse.from_spmatrix(mat, index=index, columns=columns)
+    except AttributeError:
+        df = pd.SparseDataFrame(mat, index=index, columns=columns,
+                                default_fill_value=0)
+    totals = pd.Series(np.asarray(mat.sum(axis=1)).ravel(), index=index)
+    return df, totals
+
 def make_conc_lines_from_whole_mid(wholes,
                                    middle_column_result,
                                    show=False,
                                    category=False,
                                    filename=False):
     """
-    Create concordance line output from tregex output
+    Create concordance line output from tregex output, by finding each
+    match among the words of its whole sentence
     """
-    import re
     import os
+    from collections import OrderedDict
     if not wholes and not middle_column_result:
         return []
 
-    conc_lines = []
-    unique_wholes = []
-    unique_middle_column_result = []
-    duplicates = []
-
     word_index = show.index('w') if 'w' in show else 0
 
     metcat = category if category else ''
 
-    for (f, sk, whole), mid in list(zip(wholes, middle_column_result)):
-        mid = mid[-1]
-        joined = '-join-'.join([f, sk, whole, mid])
-        if joined not in duplicates:
-            duplicates.append(joined)
-            unique_wholes.append([f, sk, whole])
-            unique_middle_column_result.append(mid)
-
-    # split into start, middle and end, dealing with multiple occurrences
-    # this fails when multiple show values are given, because they are slash separated...
-    for (f, sk, whole), mid in list(zip(unique_wholes, unique_middle_column_result)):
-        mid = mid.split('/')[word_index]
-        reg = re.compile(r'([^a-zA-Z0-9-]|^)(' + re.escape(mid) + r')([^a-zA-Z0-9-]|$)', \
-                         re.IGNORECASE | re.UNICODE)
-        offsets = [(m.start(), m.end()) for m in re.finditer(reg, whole)]
-        for offstart, offend in offsets:
-            start, middle, end = whole[0:offstart].strip(), whole[offstart:offend].strip(), \
-                                 whole[offend:].strip()
-            # lin = [ix, category, fname, sname, start, mid, end]
-            conc_lines.append(['_,_', metcat, os.path.basename(f), sk, start, middle, end])
+    # identical matches in the same sentence are counted, and that many
+    # occurrences of the match text are used
+    counts = OrderedDict()
+    for (f, sk, whole), mid in zip(wholes, middle_column_result):
+        key = (f, sk, whole, mid[-1])
+        counts[key] = counts.get(key, 0) + 1
+
+    # match and sentence text get split once each
+    needles = {}
+    sentences = {}
+    conc_lines = []
+    for (f, sk, whole, mid), count in counts.items():
+        needle = needles.get(mid)
+        if needle is None:
+            # this fails when multiple show values are given, because they are slash separated...
+            needle = needles[mid] = mid.split('/')[word_index].lower().split()
+        if not needle:
+            continue
+        if whole not in sentences:
+            words = whole.split()
+            sentences[whole] = (words, [w.lower() for w in words])
+        words, lowered = sentences[whole]
+        width = len(needle)
+        start = 0
+        while count and start <= len(lowered) - width:
+            try:
+                start = lowered.index(needle[0], start, len(lowered) - width + 1)
+            except ValueError:
+                break
+            if lowered[start:start + width] == needle:
+                # lin = [ix, category, fname, sname, start, mid, end]
+                conc_lines.append(['_,_', metcat, os.path.basename(f), sk,
+                                   ' '.join(words[:start]),
+                                   ' '.join(words[start:start + width]),
+                                   ' '.join(words[start + width:])])
+                count -= 1
+                start += width
+            else:
+                start += 1
+    return conc_lines
+
+def format_tregex_spans(spans, show, **kwargs):
+    """
+    Format the matches from :func:`tregex_spans` with :func:`format_tregex`
+
+    :returns: the formatted matches, and the spans that weren't excluded
+    """
+    items = [(fname, '', match) for fname, _, _, _, match, _ in spans]
+    if not kwargs.get('exclude') or kwargs.get('countmode'):
+        return format_tregex(items, show, **kwargs) or [], spans
+    result, kept = [], []
+    for span, item in zip(spans, items):
+        done = format_tregex([item], show, **kwargs)
+        if done:
+            result.extend(done)
+            kept.append(span)
+    return result, kept
+
+def make_conc_lines_from_spans(spans, category=False, speaker_data=False):
+    """
+    Create concordance lines from :func:`tregex_spans` output, cutting each
+    sentence at the span of its match
+
+    :param speaker_data: Speaker of each tree, by tree number
+    :type speaker_data: `list`
+    """
+    import os
+    metcat = category if category else ''
+    conc_lines = []
+    seen = set()
+    for fname, num, start, end, _, words in spans:
+        key = (fname, num, start, end)
+        if key in seen:
+            continue
+        seen.add(key)
+        speaker = speaker_data[num - 1] if speaker_data else ''
+        conc_lines.append(['_,_', metcat, os.path.basename(fname), speaker,
+                           ' '.join(words[:start]), ' '.join(words[start:end]),
+                           ' '.join(words[end:])])
     return conc_lines
 
 def gettag(query, lemmatag=False):
@@ -1375,36 +1672,51 @@ def get_first_df(corpus):
 def make_dotfile(path, return_json=False, data_dict=False):
     """
     Generate a dotfile in the data directory containing corpus information
-    Right now, this information is the metadata fields and their values
+    Right now, this information is the metadata fields and their values,
+    and what was found in each file, so that only changed files need to be
+    read again when the dotfile is updated
     """
     path = getattr(path, 'path', path)
     import os
     import json
-    from corpkit.build import get_all_metadata_fields, get_speaker_names_from_parsed_corpus
+    from corpkit.build import scan_corpus_metadata, merge_metadata, typed_fields
     from corpkit.constants import OPENER
+    dotname = '.%s.json' % os.path.basename(path)
+    dotpath = os.path.join('data', dotname)
     if data_dict:
         json_data = data_dict
     else:
-        json_data = {'fields': {}}
-        fields = get_all_metadata_fields(path, include_speakers=True)
-        for field in fields:
-            vals = get_speaker_names_from_parsed_corpus(path, field)
-            json_data['fields'][field] = vals
-        df = get_first_df(path)
-        json_data['columns'] = ['s', 'i'] + list(df.columns)
-    dotname = '.%s.json' % os.path.basename(path)
-    with OPENER(os.path.join('data', dotname), 'w', encoding='utf-8') as fo:
+        json_data = {}
+        if os.path.isfile(dotpath):
+            with OPENER(dotpath, 'r') as fo:
+                try:
+                    json_data = json.loads(fo.read())
+                except ValueError:
+                    pass
+        previous = json_data.get('files')
+        records = scan_corpus_metadata(path, previous=previous)
+        # saved results are out of date if the files changed
+        if previous is not None and records != previous:
+            json_data = {k: v for k, v in json_data.items() if k == 'columns'}
+        json_data['files'] = records
+        json_data['fields'], json_data['types'] = typed_fields(merge_metadata(records))
+        if 'columns' not in json_data:
+            df = get_first_df(path)
+            json_data['columns'] = ['s', 'i'] + list(df.columns)
+    with OPENER(dotpath, 'w', encoding='utf-8') as fo:
         fo.write(json.dumps(json_data))
     if return_json:
         return json_data
     
 def get_corpus_metadata(path, generate=False):
     """
-    Return a dict containing corpus metadata, or None if not done yet
+    Return a dict containing corpus metadata, or None if not done yet. If
+    files have changed since it was made, it is updated.
     """
     import os
     import json
     from corpkit.corpus import Corpus
+    from corpkit.build import metadata_changed
     from corpkit.constants import OPENER
 
     if not isinstance(path, Corpus):
@@ -1427,14 +1739,71 @@ def get_corpus_metadata(path, generate=False):
         with OPENER(dotpath, 'r') as fo:
             data = fo.read()
             if data:
-                return json.loads(data)
-            else:
-                return make_dotfile(path, return_json=True)
+                data = json.loads(data)
+                if 'files' in data and not metadata_changed(path, data['files']):
+                    return data
+        return make_dotfile(path, return_json=True)
+
+def sentences_by_metadata(path, just_metadata=False, skip_metadata=False):
+    """
+    Use the sentence index in the corpus dotfile to find which sentences of
+    each file are kept by `just_metadata` and `skip_metadata`, without
+    parsing anything
+
+    :returns: `dict` of full file paths and `set` of sentence numbers, or
+              `None` if there is no index to use
+    """
+    import os
+    from corpkit.conll import metadata_matches, is_range, values_in_range
+    try:
+        data = get_corpus_metadata(path, generate=True)
+    except (IOError, OSError, ValueError):
+        return
+    records = (data or {}).get('files')
+    if not records:
+        return
+    filters = [(field, criteria, method)
+               for method, crit in [('just', just_metadata), ('skip', skip_metadata)]
+               for field, criteria in (crit or {}).items()]
+    # each distinct value only needs checking once
+    checked = [{} for _ in filters]
+    # ranges of numbers and dates are found in the field's sorted values
+    types = data.get('types', {})
+    for (field, criteria, method), seen in zip(filters, checked):
+        kind = types.get(field, 'str')
+        if kind != 'str' and is_range(criteria):
+            values = data['fields'].get(field, [])
+            inside = set(values_in_range(values, kind, criteria))
+            for value in values:
+                seen[value] = (value in inside) == (method == 'just')
+    out = {}
+    for rel, record in records.items():
+        everything = set(range(1, record['nsents'] + 1))
+        keep = everything
+        for (field, criteria, method), seen in zip(filters, checked):
+            passed = set()
+            labelled = set()
+            for value, ranges in record['sents'].get(field, {}).items():
+                ids = set(i for first, last in ranges for i in range(first, last + 1))
+                labelled |= ids
+                if value not in seen:
+                    seen[value] = metadata_matches(value, criteria, method=method)
+                if seen[value]:
+                    passed |= ids
+            # sentences without the field are treated as having 'none'
+            if 'none' not in seen:
+                seen['none'] = metadata_matches('none', criteria, method=method)
+            if seen['none']:
+                passed |= everything - labelled
+            keep = keep & passed
+        full = path if os.path.isfile(path) else os.path.join(path, *rel.split('/'))
+        out[full] = keep
+    return out
 
 def make_df_json_name(typ, subcorpora=False):
     if subcorpora:
-        if isinstance(subcorpora, list):
-            subcorpora = '-'.join(subcorpora)
+        if isinstance(subcorpora, (list, tuple)):
+            subcorpora = '-'.join(str(i) for i in subcorpora)
         return '%s-%s' % (typ, subcorpora)
     else:
         return typ
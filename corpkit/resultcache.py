@@ -0,0 +1,302 @@
+"""
+corpkit: a cache of interrogation results on disk, so that running the same
+query over the same files again doesn't mean searching them again
+
+The cache is only used when asked for: pass ``cache=True`` to
+:func:`~corpkit.corpus.Corpus.interrogate`, or set the
+``CORPKIT_RESULT_CACHE`` environment variable to a directory to cache every
+interrogation there. See :func:`cache_stats` for hits and misses.
+Interrogations given `on_subcorpus`, `progress` or `telemetry` always
+search, so that their callbacks are called, though what they find is still
+cached.
+
+Entries are keyed by a normalised form of the query: the search and exclude
+criteria as the interrogator reads them, `show`, every other argument that
+can change the result, and which corpus or files are searched. The name of
+each entry also holds a fingerprint of the directories searched, taken from
+the corpus manifest (see :mod:`corpkit.manifest`), so checking it is one
+`stat` per directory. Adding, removing or replacing a file changes its
+directory and throws the entry away, but a file edited in place without its
+directory changing is not noticed: use :func:`clear_cache` or ``cache=False``
+after editing files that way. The least recently used entries are deleted
+when the cache is bigger than `RESULT_CACHE_BYTES`.
+
+Results are kept in `~/.corpkit/results`, or wherever `CACHE_DIR` or the
+``CORPKIT_RESULT_CACHE`` environment variable points.
+"""
+
+from __future__ import print_function
+
+# bump when cached results would no longer match what an interrogation returns
+CACHE_VERSION = 1
+
+# the most disk space cached results can use, in bytes
+RESULT_CACHE_BYTES = 512 * 1024 * 1024
+
+# arguments that change how an interrogation runs or reports, not its result
+CACHE_IGNORED = {'multiprocess', 'workers', 'quiet', 'printstatus', 'print_info',
+                 'progress', 'telemetry', 'cancel', 'on_subcorpus', 'max_memory',
+                 'cluster', 'save', 'cache', 'partials'}
+
+# arguments asking to hear about the search as it runs, which a cached
+# result can't answer
+CACHE_BYPASSED = {'on_subcorpus', 'progress', 'telemetry'}
+
+# where to keep results instead of the default, e.g. for tests
+CACHE_DIR = None
+
+# what happened to lookups in this process
+CACHE_STATS = {'hits': 0, 'misses': 0, 'invalidated': 0, 'evicted': 0}
+
+def cache_dir():
+    """
+    Find a writable place for cached results
+    """
+    import os
+    import tempfile
+    chosen = CACHE_DIR or os.environ.get('CORPKIT_RESULT_CACHE')
+    if chosen:
+        places = [chosen]
+    else:
+        places = [os.path.join(os.path.expanduser('~'), '.corpkit', 'results'),
+                  os.path.join(tempfile.gettempdir(), 'corpkit-results')]
+    for path in places:
+        try:
+            if not os.path.isdir(path):
+                os.makedirs(path)
+            if os.access(path, os.W_OK):
+                return path
+        except OSError:
+            continue
+
+def normalise(obj):
+    """
+    Turn a query value into something with a stable `repr`: dicts and sets
+    are sorted, and compiled regular expressions become their pattern
+    """
+    if isinstance(obj, dict):
+        return tuple(sorted((repr(normalise(k)), normalise(v)) for k, v in obj.items()))
+    if isinstance(obj, (set, frozenset)):
+        return tuple(sorted(repr(normalise(i)) for i in obj))
+    if isinstance(obj, (list, tuple)):
+        return tuple(normalise(i) for i in obj)
+    if hasattr(obj, 'pattern') and hasattr(obj, 'flags'):
+        return ('regex', obj.pattern, obj.flags)
+    return obj
+
+def fingerprint(corpus):
+    """
+    Hash the listing of every directory searched, from the manifest of the
+    corpus, or the sizes and modification times of its files if it isn't a
+    corpus or subcorpus directory
+    """
+    import os
+    import hashlib
+    from corpkit.manifest import get_manifest, listing
+    digest = hashlib.sha1()
+    dirs = None
+    if corpus.level == 'c' and os.path.isdir(corpus.path):
+        dirs = get_manifest(corpus.path).dirs
+    elif corpus.level == 's' and os.path.isdir(corpus.path):
+        dirs = {'': listing(corpus.path)}
+    if dirs is not None:
+        for rel in sorted(dirs):
+            entry = dirs[rel]
+            digest.update(repr((rel, entry['mtime'], entry['files'], entry['sizes'],
+                                entry['mtimes'])).encode('utf-8'))
+        return digest.hexdigest()[:16]
+    for path in corpus.all_filepaths:
+        try:
+            stat = os.stat(path)
+            digest.update(('%s\t%d\t%r\n' % (path, stat.st_size, stat.st_mtime)).encode('utf-8'))
+        except OSError:
+            digest.update(('%s\tmissing\n' % path).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+def cache_key(corpus, search, args, kwargs):
+    """
+    Make the key and file fingerprint of an interrogation
+
+    :returns: ``(key, fingerprint)``, or `None` if the interrogation can't
+              be cached
+    """
+    import hashlib
+    import corpkit
+    from corpkit.process import searchfixer, fix_search
+    # random estimates are only repeatable with a seed
+    if kwargs.get('approx') and kwargs.get('approx_seed') is None:
+        return
+    try:
+        case_sensitive = kwargs.get('case_sensitive', False)
+        query = args[0] if args else kwargs.get('query', 'any')
+        search = fix_search(searchfixer(search, query), case_sensitive=case_sensitive)
+        exclude = fix_search(kwargs.get('exclude', False), case_sensitive=case_sensitive)
+        show = kwargs.get('show', args[1] if len(args) > 1 else 'w')
+        if not isinstance(show, list):
+            show = [show]
+        rest = {k: v for k, v in kwargs.items()
+                if k not in CACHE_IGNORED and k not in ['exclude', 'show', 'query']}
+        described = repr((CACHE_VERSION, corpkit.__version__, corpus.path, corpus.level,
+                          normalise(corpus.symbolic), normalise(corpus.just),
+                          normalise(corpus.skip), normalise(search), normalise(exclude),
+                          normalise([str(s).lower() for s in show]), normalise(args[2:]),
+                          normalise(rest)))
+        found = fingerprint(corpus)
+    except (AttributeError, TypeError, ValueError, OSError):
+        return
+    return hashlib.sha1(described.encode('utf-8')).hexdigest(), found
+
+def entries(where):
+    """
+    Cached results on disk, least recently used first
+
+    :returns: `list` of ``(path, size, last used)``
+    """
+    import os
+    out = []
+    for name in os.listdir(where):
+        if name.endswith('.pkl'):
+            try:
+                stat = os.stat(os.path.join(where, name))
+            except OSError:
+                continue
+            out.append((os.path.join(where, name), stat.st_size, stat.st_mtime))
+    return sorted(out, key=lambda x: x[2])
+
+def load(key, prints):
+    """
+    Get a cached result, or `None`. Entries for the same query made from
+    files that have since changed are deleted.
+    """
+    import os
+    import pickle
+    where = cache_dir()
+    if where is None:
+        return
+    wanted = '%s-%s.pkl' % key
+    found = None
+    for name in os.listdir(where):
+        if not name.startswith(key[0]):
+            continue
+        if name == wanted:
+            found = os.path.join(where, name)
+        else:
+            try:
+                os.remove(os.path.join(where, name))
+                CACHE_STATS['invalidated'] += 1
+            except OSError:
+                pass
+    if found is None:
+        CACHE_STATS['misses'] += 1
+        return
+    try:
+        with open(found, 'rb') as fo:
+            res = pickle.load(fo)
+        # the modification time of an entry is when it was last used
+        os.utime(found, None)
+    except Exception:
+        CACHE_STATS['misses'] += 1
+        return
+    CACHE_STATS['hits'] += 1
+    if prints:
+        from time import localtime, strftime
+        print('%s: Loaded result from cache.' % strftime("%H:%M:%S", localtime()))
+    return res
+
+def store(key, res):
+    """
+    Save a result, then delete the least recently used entries until the
+    cache fits in `RESULT_CACHE_BYTES`
+    """
+    import os
+    import pickle
+    where = cache_dir()
+    if where is None:
+        return
+    path = os.path.join(where, '%s-%s.pkl' % key)
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    try:
+        with open(tmp, 'wb') as fo:
+            pickle.dump(res, fo, protocol=2)
+        try:
+            os.replace(tmp, path)
+        except AttributeError:
+            if os.path.exists(path):
+                os.remove(path)
+            os.rename(tmp, path)
+    except Exception:
+        # unpicklable results, or a full disk
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return
+    evict(RESULT_CACHE_BYTES)
+
+def evict(budget):
+    """
+    Delete the least recently used results until the rest fit in `budget`
+    bytes
+    """
+    import os
+    where = cache_dir()
+    if where is None:
+        return
+    held = entries(where)
+    total = sum(size for _, size, _ in held)
+    for path, size, _ in held:
+        if total <= budget:
+            break
+        try:
+            os.remove(path)
+            CACHE_STATS['evicted'] += 1
+            total -= size
+        except OSError:
+            pass
+
+def cache_stats():
+    """
+    Hits, misses, invalidated and evicted entries in this process, and the
+    number and size of the results on disk
+
+    :returns: `dict`
+    """
+    where = cache_dir()
+    held = entries(where) if where else []
+    stats = dict(CACHE_STATS)
+    stats['entries'] = len(held)
+    stats['bytes'] = sum(size for _, size, _ in held)
+    return stats
+
+def clear_cache():
+    """
+    Delete every cached result
+    """
+    evict(0)
+
+def cached(fn):
+    """
+    Look up the results of :func:`~corpkit.corpus.Corpus.interrogate` in
+    the cache before searching, and cache what it returns
+    """
+    import functools
+
+    @functools.wraps(fn)
+    def interrogate(self, search='w', *args, **kwargs):
+        import os
+        key = None
+        use = kwargs.pop('cache', None)
+        if use is None:
+            use = bool(os.environ.get('CORPKIT_RESULT_CACHE'))
+        if use:
+            key = cache_key(self, search, args, kwargs)
+        # saving needs the interrogation to run, and so do callbacks
+        searching = kwargs.get('save') or any(kwargs.get(k) for k in CACHE_BYPASSED)
+        if key is not None and not searching:
+            prints = not kwargs.get('quiet') and kwargs.get('printstatus', True)
+            res = load(key, prints)
+            if res is not None:
+                return res
+        res = fn(self, search, *args, **kwargs)
+        if key is not None and res is not None:
+            store(key, res)
+        return res
+    return interrogate
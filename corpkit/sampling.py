@@ -0,0 +1,215 @@
+"""
+corpkit: stratified file samples, and interrogations estimated from them
+
+Subcorpora are the strata. Each file is weighted by its token count from
+the corpus manifest, or by its size where a subcorpus hasn't been counted.
+Counts are scaled up with a ratio estimator, and the 95% confidence
+interval of each cell comes from the spread of the per-file counts.
+"""
+
+from __future__ import print_function
+
+# normal quantile for 95% confidence intervals
+APPROX_Z = 1.96
+
+# share of each subcorpus searched in the first round of an estimate
+APPROX_START = 0.01
+
+# fewest files searched in a subcorpus, so that there is a spread to measure
+APPROX_MIN_FILES = 5
+
+# how many of the most common results must be within the target error
+APPROX_TOP = 10
+
+def strata(corpus):
+    """
+    The files of each subcorpus and their weights
+
+    :returns: `list` of ``(name, files, weights)``, with the corpus as the
+              only stratum if it has no subcorpora
+    """
+    from corpkit.manifest import listing
+    if corpus.level == 'c' and corpus.subcorpora:
+        parts = list(corpus.subcorpora)
+    else:
+        parts = [corpus]
+    out = []
+    for part in parts:
+        files = list(part.files)
+        entry = listing(part.path)
+        if all(t is not None for t in entry['tokens']):
+            lookup = dict(zip(entry['files'], entry['tokens']))
+        else:
+            lookup = dict(zip(entry['files'], entry['sizes']))
+        out.append((part.name, files, [max(lookup.get(f.name, 0), 1) for f in files]))
+    return out
+
+def allocate(n, weights, caps):
+    """
+    Split `n` between strata in proportion to their weights, by largest
+    remainder, giving no stratum more than its cap
+
+    :returns: `list` of `int`
+    """
+    n = min(n, sum(caps))
+    total = float(sum(weights)) or 1.0
+    shares = [n * w / total for w in weights]
+    out = [min(int(s), c) for s, c in zip(shares, caps)]
+    order = sorted(range(len(shares)), key=lambda i: int(shares[i]) - shares[i])
+    while sum(out) < n:
+        for i in order:
+            if sum(out) < n and out[i] < caps[i]:
+                out[i] += 1
+    return out
+
+def stratified_sample(corpus, n, seed=None):
+    """
+    Draw `n` files, from each subcorpus in proportion to its tokens
+
+    :returns: `list` of files
+    """
+    import random
+    rng = random.Random(seed)
+    parts = strata(corpus)
+    sizes = allocate(n, [sum(w) for _, _, w in parts], [len(f) for _, f, _ in parts])
+    out = []
+    for (_, files, _), size in zip(parts, sizes):
+        out.extend(sorted(rng.sample(files, size), key=lambda x: x.path))
+    return out
+
+def ratio_estimate(counts, weights, total_weight, total_files):
+    """
+    Estimate the totals of a stratum from a sample of its files
+
+    :param counts: Matches in each sampled file, one row per file
+    :type counts: `DataFrame`
+
+    :param weights: Weight of each sampled file, in the same order
+    :type weights: `list`
+
+    :returns: estimated totals and the half widths of their intervals, as
+              two `Series`
+    """
+    import numpy as np
+    import pandas as pd
+    n = len(counts)
+    w = np.asarray(weights, dtype=float)
+    ratio = counts.sum() / w.sum()
+    estimate = ratio * total_weight
+    if n >= total_files:
+        return estimate, pd.Series(0.0, index=counts.columns)
+    if n < 2:
+        return estimate, estimate.copy()
+    spread = counts.values - np.outer(w, ratio.values)
+    variance = (spread ** 2).sum(axis=0) / (n - 1)
+    variance *= total_files ** 2 * (1.0 - float(n) / total_files) / n
+    return estimate, pd.Series(APPROX_Z * np.sqrt(variance), index=counts.columns)
+
+def approx_interrogate(corpus, search, approx, seed=None, **kwargs):
+    """
+    Estimate an interrogation from a growing stratified sample of files.
+    Each round doubles the share of every subcorpus searched, until the
+    intervals of each subcorpus' total and of the most common results in
+    the whole corpus are within `approx` of them, or everything has been
+    searched.
+
+    :param approx: Target relative error, i.e. ``0.05``
+    :type approx: `float`
+
+    :returns: :class:`corpkit.interrogation.Interrogation`, with intervals
+              in its query as ``approx_interval``, a ``(lower, upper)`` pair
+              of `DataFrames`, the share of each subcorpus searched as
+              ``approx_fraction`` and the largest relative error of the
+              checked estimates as ``approx_rel_error``
+    """
+    import random
+    import pandas as pd
+    from collections import OrderedDict
+    from corpkit.corpus import Corpus, Datalist
+    from corpkit.interrogation import Interrogation
+
+    rng = random.Random(seed)
+    kwargs['conc'] = False
+    # each round is a different sample, so only the estimate is worth caching
+    kwargs['cache'] = False
+    kwargs.setdefault('quiet', True)
+    parts = []
+    for name, files, weights in strata(corpus):
+        order = list(range(len(files)))
+        rng.shuffle(order)
+        parts.append({'name': name, 'files': [files[i] for i in order],
+                      'weights': [weights[i] for i in order],
+                      'total': float(sum(weights)), 'done': 0, 'counts': []})
+
+    fraction = APPROX_START
+    series = False
+    query = None
+    while True:
+        for part in parts:
+            target = fraction * part['total']
+            upto, got = 0, 0.0
+            while upto < len(part['files']) and (got < target or upto < APPROX_MIN_FILES):
+                got += part['weights'][upto]
+                upto += 1
+            new = part['files'][part['done']:upto]
+            if not new:
+                continue
+            res = Corpus(Datalist(new), level='d', print_info=False,
+                         datatype='conll').interrogate(search, **kwargs)
+            if not isinstance(res, Interrogation):
+                raise ValueError('approx only works for a single query.')
+            query = res.query
+            found = res.results
+            show = query.get('show', [])
+            if 'c' in show or 'mc' in show:
+                series = True
+                found = found.to_frame(name='count')
+            elif isinstance(found, pd.Series):
+                # a single file's results
+                found = found.to_frame(name=new[0].name).T
+            part['counts'].append(found.reindex([f.name for f in new]).fillna(0))
+            part['done'] = upto
+
+        estimates, widths = OrderedDict(), OrderedDict()
+        fractions, checks = OrderedDict(), []
+        for part in parts:
+            n = part['done']
+            counts = pd.concat(part['counts']).fillna(0) if part['counts'] else pd.DataFrame()
+            weights = part['weights'][:n]
+            est, hw = ratio_estimate(counts, weights, part['total'], len(part['files']))
+            estimates[part['name']], widths[part['name']] = est, hw
+            checks.append(ratio_estimate(counts.sum(axis=1).to_frame(), weights,
+                                         part['total'], len(part['files'])))
+            fractions[part['name']] = sum(weights) / part['total'] if part['total'] else 1.0
+
+        # the most common results over the whole corpus. strata are sampled
+        # independently, so their variances add up
+        estimate = pd.DataFrame(estimates).T.fillna(0)
+        variance = (pd.DataFrame(widths).T.reindex_like(estimate).fillna(0) ** 2).sum()
+        top = estimate.sum().sort_values(ascending=False).index[:APPROX_TOP]
+        checks.append((estimate.sum()[top], variance[top] ** 0.5))
+        error = max([float((hw / est).fillna(0).max()) for est, hw in checks if len(est)] or [0.0])
+        if error <= approx or all(p['done'] >= len(p['files']) for p in parts):
+            break
+        fraction = min(fraction * 2, 1.0)
+
+    width = pd.DataFrame(widths).T.reindex_like(estimate).fillna(0)
+    sampled = pd.DataFrame(OrderedDict((p['name'], pd.concat(p['counts']).sum() if p['counts']
+                                        else pd.Series(dtype=float)) for p in parts))
+    sampled = sampled.T.reindex_like(estimate).fillna(0)
+    lower = (estimate - width).where(estimate - width > sampled, sampled)
+    upper = estimate + width
+    results = estimate.round().astype(int)
+    if series:
+        results, lower, upper = results['count'], lower['count'], upper['count']
+        totals = results.sum()
+    else:
+        totals = results.sum(axis=1)
+
+    query = dict(query or {})
+    query['corpus'] = corpus.path
+    query['approx'] = approx
+    query['approx_interval'] = (lower, upper)
+    query['approx_fraction'] = fractions
+    query['approx_rel_error'] = error
+    return Interrogation(results=results, totals=totals, query=query)
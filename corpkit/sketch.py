@@ -0,0 +1,88 @@
+"""corpkit: bounded-memory counting of frequent results"""
+
+from __future__ import print_function
+
+from collections import Counter
+
+class TopK(object):
+    """
+    A mergeable heavy-hitters summary (Misra-Gries / SpaceSaving) that keeps
+    at most ``2 * k`` distinct keys in memory.
+
+    Counts are lower bounds on the true frequencies. The true count of any
+    key, including keys no longer stored, is at most its stored count plus
+    ``self.error``, and ``self.error`` is never larger than ``total / (k + 1)``.
+    """
+
+    def __init__(self, k):
+        if k < 1:
+            raise ValueError('k must be a positive integer.')
+        self.k = int(k)
+        self.counts = Counter()
+        self.total = 0
+        self.error = 0
+
+    def update(self, counts):
+        """
+        Add exact counts for a chunk of data (i.e. one file)
+
+        :param counts: Result counts
+        :type counts: ``dict``/``Counter``
+        """
+        self.counts.update(counts)
+        self.total += sum(counts.values())
+        if len(self.counts) > 2 * self.k:
+            self._prune()
+        return self
+
+    def merge(self, other):
+        """
+        Merge another summary into this one. Errors of the two summaries add.
+
+        :param other: Summary built with the same `k`
+        :type other: :class:`corpkit.sketch.TopK`
+        """
+        self.counts.update(other.counts)
+        self.total += other.total
+        self.error += other.error
+        if len(self.counts) > 2 * self.k:
+            self._prune()
+        return self
+
+    def __iadd__(self, other):
+        if isinstance(other, TopK):
+            return self.merge(other)
+        return self.update(other)
+
+    def _prune(self):
+        """
+        Subtract the (k+1)th largest count from everything and drop what
+        falls to zero, leaving at most `k` keys
+        """
+        import heapq
+        if len(self.counts) <= self.k:
+            return
+        cut = heapq.nlargest(self.k + 1, self.counts.values())[-1]
+        self.error += cut
+        self.counts = Counter({w: c - cut for w, c in self.counts.items() if c > cut})
+
+    def most_common(self, n=None):
+        """
+        The `k` (or `n`) most frequent results and their lower-bound counts
+        """
+        self._prune()
+        return self.counts.most_common(n)
+
+    def result(self):
+        """
+        Get the summary as a ``Counter`` of at most `k` keys
+        """
+        self._prune()
+        return Counter(self.counts)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __repr__(self):
+        return "<%s: k=%d, %d stored, total=%d, error<=%d>" % \
+            (self.__class__.__name__, self.k, len(self.counts), self.total, self.error)
@@ -0,0 +1,194 @@
+"""corpkit: progress counters for parallel interrogations"""
+
+from __future__ import print_function
+
+FIELDS = ['total', 'files', 'tokens', 'matches', 'bytes']
+
+def count_matches(res):
+    """
+    Count the matches in a result from :func:`corpkit.conll.pipeline`
+    """
+    if isinstance(res, int):
+        return res
+    if isinstance(res, dict):
+        return sum(count_matches(v) for v in res.values())
+    try:
+        return len(res)
+    except TypeError:
+        return 0
+
+class TelemetryReporter(object):
+    """
+    Collect counters in a worker process, and post them to the parent in
+    batches, rather than drawing a progress bar after every file.
+
+    :param queue: Queue read by a :class:`Telemetry` in the parent
+    :type queue: `multiprocessing.Queue`
+
+    :param interval: Seconds to wait between posts
+    :type interval: `float`
+    """
+
+    def __init__(self, queue, interval=0.5):
+        import os
+        from time import time
+        self.queue = queue
+        self.interval = interval
+        self.source = os.getpid()
+        self.counts = dict.fromkeys(FIELDS, 0)
+        self.last = time()
+
+    def add(self, **counts):
+        """
+        Add to the counters, posting them if enough time has passed
+        """
+        from time import time
+        for k, v in counts.items():
+            self.counts[k] += v
+        if time() - self.last >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Post the counters collected so far
+        """
+        from time import time
+        self.last = time()
+        if not any(self.counts.values()):
+            return
+        self.queue.put((self.source, self.counts))
+        self.counts = dict.fromkeys(FIELDS, 0)
+
+class Telemetry(object):
+    """
+    Counters for a running interrogation: files (done and total), tokens,
+    matches and bytes. Counts come from :func:`~corpkit.telemetry.Telemetry.add`
+    or from workers through :attr:`queue`. A background thread draws a
+    single progress bar, at most `rate` times a second.
+
+    :param total: Number of files expected, if known
+    :type total: `int`
+
+    :param queue: Queue that workers post counters to
+    :type queue: `multiprocessing.Queue`
+
+    :param rate: Maximum updates per second
+    :type rate: `float`
+
+    :param callback: A function called with :func:`~corpkit.telemetry.Telemetry.snapshot`
+                     on every update
+    :type callback: `function`
+
+    :param show: Draw a progress bar in the terminal
+    :type show: `bool`
+
+    :param label: Text to show alongside the progress bar
+    :type label: `str`
+    """
+
+    def __init__(self, total=0, queue=None, rate=4.0, callback=None,
+                 show=True, label=''):
+        import threading
+        from time import time
+        self.counts = dict.fromkeys(FIELDS, 0)
+        self.counts['total'] = total
+        self.queue = queue
+        self.rate = rate
+        self.callback = callback
+        self.show = show
+        self.label = label
+        self.started = time()
+        self.bar = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._changed = False
+        self._thread = None
+
+    def add(self, **counts):
+        """
+        Add to the counters, i.e. ``add(files=1, matches=20)``
+        """
+        with self._lock:
+            for k, v in counts.items():
+                self.counts[k] += v
+            self._changed = True
+
+    def snapshot(self):
+        """
+        Get the current counters, plus elapsed time and files per second
+
+        :returns: `dict`
+        """
+        from time import time
+        with self._lock:
+            snap = dict(self.counts)
+        snap['elapsed'] = time() - self.started
+        snap['files_per_second'] = snap['files'] / snap['elapsed'] if snap['elapsed'] else 0.0
+        return snap
+
+    def _drain(self):
+        """
+        Read everything workers have posted
+        """
+        if self.queue is None:
+            return
+        try:
+            from queue import Empty
+        except ImportError:
+            from Queue import Empty
+        while True:
+            try:
+                _, counts = self.queue.get_nowait()
+            except (Empty, EOFError, IOError):
+                return
+            self.add(**counts)
+
+    def render(self):
+        """
+        Draw the progress bar and call the callback
+        """
+        from corpkit.textprogressbar import TextProgressBar
+        self._changed = False
+        snap = self.snapshot()
+        if self.callback:
+            self.callback(snap)
+        if not self.show:
+            return
+        text = '%s%s/%s files, %s tokens, %s matches' % \
+            (self.label, format(snap['files'], ','), format(snap['total'], ','),
+             format(snap['tokens'], ','), format(snap['matches'], ','))
+        if self.bar is None:
+            self.bar = TextProgressBar(max(snap['total'], 1), dirname=text)
+        self.bar.iterations = max(snap['total'], snap['files'], 1)
+        self.bar.update_iteration(snap['files'], text)
+        print(str(self.bar) + '\r', end='')
+
+    def _run(self):
+        while not self._stop.wait(1.0 / self.rate):
+            self._drain()
+            if self._changed:
+                self.render()
+
+    def start(self):
+        """
+        Start updating in a background thread
+        """
+        import threading
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop updating, after reading and showing the last counters
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self._drain()
+        self.render()
+        if self.show:
+            print()
+        return self.snapshot()
@@ -0,0 +1,786 @@
+"""
+corpkit: flat array indexes of constituency trees
+
+Each node of each tree in a CONLL file becomes a row of a few numpy arrays
+(label id, parent, token span, depth, children, sisters and head), so that
+the most common kinds of Tregex query can be answered without Java or NLTK.
+Queries using anything else (named nodes, numbered children, `..`, `@` and
+so on) are not supported, and callers fall back to Tregex.
+
+Indexes are saved in ``~/.corpkit/treeindex`` and rebuilt when their CONLL
+file changes. They aren't written into the corpus itself, because Tregex
+reads every file in the directories it searches.
+"""
+
+from __future__ import print_function
+
+# bump when the arrays change, so old indexes are rebuilt
+INDEX_VERSION = 1
+
+# indexes kept in memory, most recently used last
+INDEX_CACHE = None
+INDEX_CACHE_SIZE = 32
+
+# Tregex options the index can produce output for
+INDEX_OPTIONS = {'-o', '-n', '-t', '-u', '-w', '-s', '-spans'}
+
+# the head rules of Stanford's CollinsHeadFinder, which Tregex uses
+HEAD_RULES = {
+    'ADJP': [['left', 'NNS', 'QP', 'NN', '$', 'ADVP', 'JJ', 'VBN', 'VBG', 'ADJP',
+              'JJR', 'NP', 'JJS', 'DT', 'FW', 'RBR', 'RBS', 'SBAR', 'RB']],
+    'ADVP': [['right', 'RB', 'RBR', 'RBS', 'FW', 'ADVP', 'TO', 'CD', 'JJR', 'JJ',
+              'IN', 'NP', 'JJS', 'NN']],
+    'CONJP': [['right', 'CC', 'RB', 'IN']],
+    'FRAG': [['right']],
+    'INTJ': [['left']],
+    'LST': [['right', 'LS', ':']],
+    'NAC': [['left', 'NN', 'NNS', 'NNP', 'NNPS', 'NP', 'NAC', 'EX', '$', 'CD', 'QP',
+             'PRP', 'VBG', 'JJ', 'JJS', 'JJR', 'ADJP', 'FW']],
+    'PP': [['right', 'IN', 'TO', 'VBG', 'VBN', 'RP', 'FW']],
+    'PRN': [['left']],
+    'PRT': [['right', 'RP']],
+    'QP': [['left', '$', 'IN', 'NNS', 'NN', 'JJ', 'RB', 'DT', 'CD', 'NCD', 'QP',
+            'JJR', 'JJS']],
+    'RRC': [['right', 'VP', 'NP', 'ADVP', 'ADJP', 'PP']],
+    'S': [['left', 'TO', 'IN', 'VP', 'S', 'SBAR', 'ADJP', 'UCP', 'NP']],
+    'SBAR': [['left', 'WHNP', 'WHPP', 'WHADVP', 'WHADJP', 'IN', 'DT', 'S', 'SQ',
+              'SINV', 'SBAR', 'FRAG']],
+    'SBARQ': [['left', 'SQ', 'S', 'SINV', 'SBARQ', 'FRAG']],
+    'SINV': [['left', 'VBZ', 'VBD', 'VBP', 'VB', 'MD', 'VP', 'S', 'SINV', 'ADJP', 'NP']],
+    'SQ': [['left', 'VBZ', 'VBD', 'VBP', 'VB', 'MD', 'VP', 'SQ']],
+    'UCP': [['right']],
+    'VP': [['left', 'TO', 'VBD', 'VBN', 'MD', 'VBZ', 'VB', 'VBG', 'VBP', 'VP', 'ADJP',
+            'NN', 'NNS', 'NP']],
+    'WHADJP': [['left', 'CC', 'WRB', 'JJ', 'ADJP']],
+    'WHADVP': [['right', 'CC', 'WRB']],
+    'WHNP': [['left', 'WDT', 'WP', 'WP$', 'WHADJP', 'WHPP', 'WHNP']],
+    'WHPP': [['right', 'IN', 'TO', 'FW']],
+    'X': [['right']],
+    'NP': [['rightdis', 'NN', 'NNP', 'NNPS', 'NNS', 'NX', 'POS', 'JJR'],
+           ['left', 'NP'],
+           ['rightdis', '$', 'ADJP', 'PRN'],
+           ['right', 'CD'],
+           ['rightdis', 'JJ', 'JJS', 'RB', 'QP']],
+    'TYPO': [['left']],
+    'EDITED': [['left']],
+    'XS': [['right', 'IN']],
+}
+
+# for anything else, including ROOT, the first child is the head
+DEFAULT_HEAD_RULE = [['left']]
+
+PUNCTUATION_TAGS = {"''", '``', '-LRB-', '-RRB-', '.', ':', ','}
+
+def basic_category(label):
+    """
+    Strip functional tags, i.e. ``NP-SBJ`` to ``NP``, the way Tregex does
+    """
+    seen = None
+    for i, char in enumerate(label):
+        if char in '-=|#^~_':
+            if i == 0:
+                seen = char
+            elif seen == char:
+                seen = None
+            else:
+                return label[:i]
+    return label
+
+def find_head(category, kids, cats, punct):
+    """
+    Pick the head of a phrase using the Collins rules
+
+    :param category: Basic category of the phrase
+    :param kids: Child node indexes
+    :param cats: Basic category of each child
+    :param punct: Whether each child is a punctuation preterminal
+    :returns: the index of the head child
+    """
+    if len(kids) == 1:
+        return kids[0]
+    rules = HEAD_RULES.get(category, DEFAULT_HEAD_RULE)
+    found = None
+    for num, rule in enumerate(rules):
+        how, wanted = rule[0], rule[1:]
+        order = list(range(len(cats)))
+        if how.startswith('right'):
+            order.reverse()
+        if how.endswith('dis'):
+            found = next((i for i in order if cats[i] in wanted), None)
+        else:
+            found = next((i for w in wanted for i in order if cats[i] == w), None)
+        if found is None and num == len(rules) - 1:
+            found = order[0]
+        if found is not None:
+            break
+    # coordination: X CC Y has X as its head
+    if found >= 2 and cats[found - 1] in ('CC', 'CONJP'):
+        new = found - 2
+        while new >= 0 and punct[new]:
+            new -= 1
+        if new >= 0:
+            found = new
+    return kids[found]
+
+def index_trees(parses):
+    """
+    Turn bracketed trees into arrays
+
+    :param parses: ``(sentence id, bracketed tree)`` pairs
+    :type parses: `list`
+
+    :returns: `dict` of numpy arrays
+    """
+    import re
+    import numpy as np
+
+    tokens = re.compile(r'\(|\)|[^\s()]+')
+
+    vocab = {}
+    names = []
+    fields = ['label', 'parent', 'start', 'end', 'depth', 'stop', 'first',
+              'last', 'next', 'prev', 'head', 'sent', 'leaf']
+    cols = {name: [] for name in fields}
+    label, parent, start, end, stop = [cols[n] for n in ['label', 'parent', 'start', 'end', 'stop']]
+    first, last, nxt, prev = [cols[n] for n in ['first', 'last', 'next', 'prev']]
+    sent_ids, offsets = [], [0]
+
+    def add_node(text, sent_id, stack, tok, is_leaf):
+        num = len(label)
+        lab = vocab.get(text)
+        if lab is None:
+            lab = vocab[text] = len(names)
+            names.append(text)
+        par = stack[-1] if stack else -1
+        for name, value in [('label', lab), ('parent', par), ('start', tok),
+                            ('end', tok + int(is_leaf)), ('depth', len(stack)),
+                            ('stop', num + 1), ('first', -1), ('last', -1),
+                            ('next', -1), ('prev', -1), ('head', -1),
+                            ('sent', sent_id), ('leaf', is_leaf)]:
+            cols[name].append(value)
+        if par >= 0:
+            if first[par] < 0:
+                first[par] = num
+            else:
+                nxt[last[par]] = num
+                prev[num] = last[par]
+            last[par] = num
+        return num
+
+    for sent_id, text in parses:
+        base = len(label)
+        stack = []
+        tok = 0
+        opened = False
+        for piece in tokens.findall(text):
+            if piece == '(':
+                # a bracket with no label
+                if opened:
+                    stack.append(add_node('', sent_id, stack, tok, False))
+                opened = True
+            elif piece == ')':
+                if opened:
+                    stack.append(add_node('', sent_id, stack, tok, False))
+                    opened = False
+                if stack:
+                    node = stack.pop()
+                    end[node] = tok
+                    stop[node] = len(label)
+            elif opened:
+                stack.append(add_node(piece, sent_id, stack, tok, False))
+                opened = False
+            else:
+                add_node(piece, sent_id, stack, tok, True)
+                tok += 1
+        while stack:
+            node = stack.pop()
+            end[node] = tok
+            stop[node] = len(label)
+
+        cats = [basic_category(names[label[i]]) for i in range(base, len(label))]
+        for node in range(base, len(label)):
+            if first[node] < 0:
+                continue
+            kids = []
+            kid = first[node]
+            while kid >= 0:
+                kids.append(kid)
+                kid = nxt[kid]
+            punct = [first[k] >= 0 and cols['leaf'][first[k]] and names[label[k]] in PUNCTUATION_TAGS
+                     for k in kids]
+            cols['head'][node] = find_head(cats[node - base], kids,
+                                           [cats[k - base] for k in kids], punct)
+
+        sent_ids.append(sent_id)
+        offsets.append(len(label))
+
+    arrays = {name: np.array(cols[name], dtype=np.int32) for name in fields}
+    arrays['depth'] = arrays['depth'].astype(np.int16)
+    arrays['leaf'] = np.array(cols['leaf'], dtype=bool)
+    arrays['sent_ids'] = np.array(sent_ids, dtype=np.int32)
+    arrays['offsets'] = np.array(offsets, dtype=np.int32)
+    arrays['vocab'] = np.array(names, dtype=np.str_) if names else np.array([], dtype='U1')
+    return arrays
+
+def read_parses(path):
+    """
+    Get ``(sentence id, parse)`` pairs from a CONLL file, numbering sentences
+    the way :func:`corpkit.conll.parse_conll` does
+    """
+    import io
+    with io.open(path, 'r', encoding='utf-8') as fo:
+        data = fo.read().strip('\n')
+    out = []
+    for count, sent in enumerate(data.split('\n\n'), start=1):
+        for line in sent.split('\n'):
+            if line.startswith('#') and line.lstrip('# ').startswith('parse='):
+                out.append((count, line.lstrip('# ').split('=', 1)[1]))
+                break
+    return out
+
+class TreeIndex(object):
+    """
+    The trees of one CONLL file as arrays, indexed by node. Nodes are in
+    preorder, including leaves, and `parent`, `first`, `last`, `next`,
+    `prev` and `head` give the index of a related node, or -1.
+
+    :param arrays: from :func:`index_trees`
+    :type arrays: `dict`
+    """
+
+    def __init__(self, arrays):
+        for name, value in arrays.items():
+            setattr(self, name, value)
+        self.vocab = arrays['vocab'].tolist()
+        self.position = {int(s): i for i, s in enumerate(self.sent_ids)}
+        self.desc_cache = {}
+
+    def __len__(self):
+        return len(self.label)
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Index the trees in a CONLL file
+        """
+        return cls(index_trees(read_parses(path)))
+
+    def save(self, path, mtime):
+        """
+        Save as ``.npz``, noting the mtime of the file indexed
+        """
+        import os
+        import numpy as np
+        arrays = {n: getattr(self, n) for n in ['label', 'parent', 'start', 'end', 'depth',
+                                                'stop', 'first', 'last', 'next', 'prev',
+                                                'head', 'sent', 'leaf', 'sent_ids', 'offsets']}
+        arrays['vocab'] = np.array(self.vocab, dtype=np.str_) if self.vocab else np.array([], dtype='U1')
+        tmp = '%s.%d.tmp' % (path, os.getpid())
+        with open(tmp, 'wb') as fo:
+            np.savez_compressed(fo, version=INDEX_VERSION, mtime=mtime, **arrays)
+        try:
+            os.replace(tmp, path)
+        except AttributeError:
+            if os.path.exists(path):
+                os.remove(path)
+            os.rename(tmp, path)
+
+    @classmethod
+    def load(cls, path, mtime):
+        """
+        Load a saved index, or get `None` if it is missing or out of date
+        """
+        import numpy as np
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['version']) != INDEX_VERSION or float(data['mtime']) != mtime:
+                    return
+                return cls({name: data[name] for name in data.files
+                            if name not in ('version', 'mtime')})
+        except (IOError, OSError, KeyError, ValueError):
+            return
+
+    def sentences(self, ids):
+        """
+        Boolean mask of the nodes in some sentences, or `None` if any of them
+        are not indexed
+        """
+        import numpy as np
+        if ids is None:
+            return np.ones(len(self), dtype=bool)
+        if any(i not in self.position for i in ids):
+            return
+        return np.isin(self.sent, np.array(list(ids), dtype=np.int32))
+
+    def match(self, query):
+        """
+        Find the nodes matching a Tregex query
+
+        :returns: boolean mask over nodes, or `None` if the query uses
+                  something the index can't do
+        """
+        pattern = compile_query(query)
+        if pattern is None:
+            return
+        return self.evaluate(pattern)
+
+    def count(self, query, ids=None):
+        """
+        Count nodes matching `query` (as Tregex's `-o` would), optionally
+        only in some sentences
+
+        :returns: `int`, or `None` if the index can't answer the query
+        """
+        import numpy as np
+        mask = self.match(query)
+        sel = self.sentences(ids)
+        if mask is None or sel is None:
+            return
+        return int(np.count_nonzero(mask & sel))
+
+    def tregex_output(self, query, options, ids=None):
+        """
+        Get the lines Tregex would print for `query` with `options`, or
+        with ``-spans``, what TregexServer.java would
+
+        :param ids: sentences to search, in the order Tregex would see them
+        :type ids: `list`
+
+        :returns: `list` of `str`, or `None` if the index can't do it
+        """
+        import numpy as np
+        options = set(options)
+        if '-o' not in options or not options <= INDEX_OPTIONS:
+            return
+        if ids is None:
+            ids = [int(i) for i in self.sent_ids]
+        if any(i not in self.position for i in ids):
+            return
+        mask = self.match(query)
+        if mask is None:
+            return
+        spans = '-spans' in options
+        lines = []
+        for num, sent_id in enumerate(ids, start=1):
+            pos = self.position[sent_id]
+            begin = self.offsets[pos]
+            for node in np.nonzero(mask[begin:self.offsets[pos + 1]])[0] + begin:
+                shown = begin if '-w' in options and not spans else node
+                if '-u' in options:
+                    text = self.vocab[self.label[shown]]
+                elif '-t' in options:
+                    text = ' '.join(self.words(shown))
+                else:
+                    text = self.bracketed(shown)
+                if spans:
+                    lines.append('\t'.join(['', str(num), str(self.start[node]), str(self.end[node]),
+                                            text, ' '.join(self.words(begin))]))
+                else:
+                    lines.append('%d: %s' % (num, text) if '-n' in options else text)
+        return lines
+
+    def words(self, node):
+        """
+        The leaves under a node
+        """
+        span = slice(node, self.stop[node])
+        return [self.vocab[i] for i in self.label[span][self.leaf[span]]]
+
+    def bracketed(self, node):
+        """
+        A node as a one-line bracketed tree
+        """
+        if self.leaf[node]:
+            return self.vocab[self.label[node]]
+        kids = []
+        kid = self.first[node]
+        while kid >= 0:
+            kids.append(self.bracketed(kid))
+            kid = self.next[kid]
+        return '(%s)' % ' '.join([self.vocab[self.label[node]]] + kids)
+
+    def children_of(self, link):
+        """
+        For each node, its parent if `link` (`first`, `last` or `head`) of
+        the parent is that node
+        """
+        import numpy as np
+        out = np.full(len(self), -1, dtype=np.int32)
+        has = self.parent >= 0
+        idx = np.nonzero(has)[0]
+        own = link[self.parent[idx]] == idx
+        out[idx[own]] = self.parent[idx[own]]
+        return out
+
+    def step(self, mask, link):
+        """
+        Nodes whose `link` is in `mask`
+        """
+        out = link >= 0
+        out[out] = mask[link[out]]
+        return out
+
+    def follow(self, mask, link, through=None):
+        """
+        Nodes from which following `link` one or more times reaches `mask`,
+        only passing through `through` on the way
+        """
+        import numpy as np
+        out = np.zeros(len(self), dtype=bool)
+        idx = np.nonzero(link >= 0)[0]
+        cur = link[idx]
+        while idx.size:
+            hit = mask[cur]
+            out[idx[hit]] = True
+            more = ~hit & (link[cur] >= 0)
+            if through is not None:
+                more &= through[cur]
+            idx, cur = idx[more], link[cur[more]]
+        return out
+
+    def has_child(self, mask):
+        """
+        Nodes with a child in `mask`
+        """
+        import numpy as np
+        out = np.zeros(len(self), dtype=bool)
+        par = self.parent[mask]
+        out[par[par >= 0]] = True
+        return out
+
+    def dominating(self, mask):
+        """
+        Nodes with a descendant in `mask`
+        """
+        import numpy as np
+        out = np.zeros(len(self), dtype=bool)
+        nodes = self.parent[mask]
+        nodes = nodes[nodes >= 0]
+        while nodes.size:
+            nodes = np.unique(nodes)
+            nodes = nodes[~out[nodes]]
+            out[nodes] = True
+            nodes = self.parent[nodes]
+            nodes = nodes[nodes >= 0]
+        return out
+
+    def sisters(self, mask):
+        """
+        Nodes with a sister in `mask`
+        """
+        import numpy as np
+        has = self.parent >= 0
+        counts = np.bincount(self.parent[mask & has], minlength=len(self))
+        out = np.zeros(len(self), dtype=bool)
+        out[has] = (counts[self.parent[has]] - mask[has]) > 0
+        return out
+
+    def describe(self, desc):
+        """
+        Nodes matching a node description
+        """
+        import re
+        import numpy as np
+        negated, parts = desc
+        if not self.vocab:
+            return np.zeros(len(self), dtype=bool)
+        key = (negated, tuple(parts))
+        if key not in self.desc_cache:
+            ok = np.zeros(len(self.vocab), dtype=bool)
+            for kind, value in parts:
+                if kind == 'any':
+                    ok[:] = True
+                elif kind == 'literal':
+                    ok |= np.array([v == value for v in self.vocab], dtype=bool)
+                else:
+                    reg = re.compile(value)
+                    ok |= np.array([bool(reg.search(v)) for v in self.vocab], dtype=bool)
+            if negated:
+                ok = ~ok
+            self.desc_cache[key] = ok
+        return self.desc_cache[key][self.label]
+
+    def evaluate(self, node):
+        """
+        Nodes matching a compiled pattern
+        """
+        _, desc, rels = node
+        if desc[0] == 'sub':
+            mask = self.evaluate(desc[1])
+        else:
+            mask = self.describe(desc[1:])
+        if rels is not None:
+            mask = mask & self.relations(rels)
+        return mask
+
+    def relations(self, rels):
+        """
+        Nodes satisfying a relation, or a boolean combination of them
+        """
+        import numpy as np
+        kind = rels[0]
+        if kind == 'not':
+            return ~self.relations(rels[1])
+        if kind in ('and', 'or'):
+            parts = [self.relations(r) for r in rels[1]]
+            return np.logical_and.reduce(parts) if kind == 'and' else np.logical_or.reduce(parts)
+        _, op, path, target = rels
+        mask = self.evaluate(target)
+        if op == '<':
+            return self.has_child(mask)
+        if op == '<<':
+            return self.dominating(mask)
+        if op == '$':
+            return self.sisters(mask)
+        if op == '<+':
+            through = self.evaluate(path)
+            out = self.has_child(mask)
+            while True:
+                new = self.has_child(mask | (through & out))
+                if (new == out).all():
+                    return out
+                out = new
+        links = {',': self.first, '-': self.last, '#': self.head}
+        if op[0] == '<':
+            link = links[op[-1]]
+        elif op[0] == '>':
+            link = self.parent if op[-1] in '>+' else self.children_of(links[op[-1]])
+        else:
+            link = self.next if '+' in op else self.prev
+        through = self.evaluate(path) if path is not None else None
+        if op in ('<,', '<-', '<#', '>', '>,', '>-', '>#', '$+', '$-'):
+            return self.step(mask, link)
+        return self.follow(mask, link, through)
+
+class UnsupportedQuery(Exception):
+    pass
+
+# relations the index knows, longest first
+RELATIONS = ['<<,', '<<-', '<<#', '<<', '<,', '<-', '<#', '<+', '<',
+             '>>,', '>>-', '>>#', '>>', '>,', '>-', '>#', '>+', '>',
+             '$++', '$--', '$+', '$-', '$']
+
+class QueryParser(object):
+    """
+    Parse the part of the Tregex language the index can search. A pattern
+    is ``('node', description, relations)``, where the description is either
+    ``('desc', negated, [(kind, value), ...])`` or ``('sub', pattern)``.
+    """
+
+    IDENT = r'[^\s()\[\]{}/|@!#%&=~?\'"<>$;:,`]+'
+
+    def __init__(self, text):
+        import re
+        self.text = text
+        self.pos = 0
+        self.ident = re.compile(self.IDENT)
+
+    def peek(self):
+        while self.pos < len(self.text) and self.text[self.pos].isspace():
+            self.pos += 1
+        return self.text[self.pos] if self.pos < len(self.text) else ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise UnsupportedQuery(self.text)
+        self.pos += 1
+
+    def parse(self):
+        node = self.subnode()
+        if self.peek():
+            raise UnsupportedQuery(self.text)
+        return node
+
+    def subnode(self):
+        if self.peek() == '(':
+            self.pos += 1
+            desc = ('sub', self.subnode())
+            self.expect(')')
+        else:
+            desc = self.description()
+        rels = None
+        if self.peek() not in ('', ')', ']'):
+            rels = self.disjunction()
+        return ('node', desc, rels)
+
+    def disjunction(self):
+        parts = [self.conjunction()]
+        while self.peek() == '|':
+            self.pos += 1
+            parts.append(self.conjunction())
+        return parts[0] if len(parts) == 1 else ('or', parts)
+
+    def conjunction(self):
+        parts = [self.modified()]
+        while self.peek() not in ('', '|', ')', ']'):
+            if self.peek() == '&':
+                self.pos += 1
+            parts.append(self.modified())
+        return parts[0] if len(parts) == 1 else ('and', parts)
+
+    def modified(self):
+        if self.peek() == '!':
+            self.pos += 1
+            return ('not', self.modified())
+        if self.peek() == '[':
+            self.pos += 1
+            rels = self.disjunction()
+            self.expect(']')
+            return rels
+        return self.relation()
+
+    def relation(self):
+        self.peek()
+        op = next((r for r in RELATIONS if self.text.startswith(r, self.pos)), None)
+        if op is None:
+            raise UnsupportedQuery(self.text)
+        self.pos += len(op)
+        path = None
+        if op in ('<+', '>+'):
+            self.expect('(')
+            path = ('node', self.description(), None)
+            self.expect(')')
+        nextchar = self.text[self.pos:self.pos + 1]
+        if nextchar and (nextchar.isdigit() or nextchar in ':=.,-+<>'):
+            raise UnsupportedQuery(self.text)
+        if self.peek() == '(':
+            self.pos += 1
+            target = self.subnode()
+            self.expect(')')
+        else:
+            target = ('node', self.description(), None)
+        return ('rel', op, path, target)
+
+    def description(self):
+        negated = self.peek() == '!'
+        if negated:
+            self.pos += 1
+        parts = []
+        while True:
+            if self.text.startswith('/', self.pos):
+                end = self.pos + 1
+                while end < len(self.text) and self.text[end] != '/':
+                    end += 2 if self.text[end] == '\\' else 1
+                if end >= len(self.text):
+                    raise UnsupportedQuery(self.text)
+                parts.append(('regex', self.text[self.pos + 1:end].replace('\\/', '/')))
+                self.pos = end + 1
+            else:
+                match = self.ident.match(self.text, self.pos)
+                if not match:
+                    raise UnsupportedQuery(self.text)
+                value = match.group()
+                parts.append(('any', None) if value == '__' else ('literal', value))
+                self.pos = match.end()
+            if self.text.startswith('|', self.pos) and \
+               self.text[self.pos + 1:self.pos + 2] not in ('', ' ', '\t', '\n'):
+                self.pos += 1
+                continue
+            break
+        # named nodes, variables and so on
+        if self.text[self.pos:self.pos + 1] in ('=', '#', '~', ';', ':'):
+            raise UnsupportedQuery(self.text)
+        return ('desc', negated, parts)
+
+COMPILED = {}
+
+def compile_query(query):
+    """
+    Parse a Tregex query for the index
+
+    :returns: the parsed pattern, or `None` if the index can't do it
+    """
+    import re
+    from corpkit.constants import STRINGTYPE
+    query = getattr(query, 'pattern', query)
+    if not isinstance(query, STRINGTYPE):
+        return
+    if query not in COMPILED:
+        try:
+            pattern = QueryParser(query).parse()
+            check_regexes(pattern)
+        except (UnsupportedQuery, re.error):
+            pattern = None
+        COMPILED[query] = pattern
+    return COMPILED[query]
+
+def check_regexes(pattern):
+    """
+    Make sure the regular expressions in a pattern work in Python
+    """
+    import re
+    if isinstance(pattern, tuple):
+        if len(pattern) == 2 and pattern[0] == 'regex':
+            re.compile(pattern[1])
+            return
+        for part in pattern:
+            check_regexes(part)
+    elif isinstance(pattern, list):
+        for part in pattern:
+            check_regexes(part)
+
+def supported(query):
+    """
+    Whether the index can answer a Tregex query
+    """
+    return compile_query(query) is not None
+
+def index_dir():
+    """
+    Find a writable place for saved indexes
+    """
+    import os
+    import tempfile
+    for path in [os.path.join(os.path.expanduser('~'), '.corpkit', 'treeindex'),
+                 os.path.join(tempfile.gettempdir(), 'corpkit-treeindex')]:
+        try:
+            if not os.path.isdir(path):
+                os.makedirs(path)
+            if os.access(path, os.W_OK):
+                return path
+        except OSError:
+            continue
+
+def index_path(path):
+    """
+    Where the index for a CONLL file is saved, or `None` if nowhere
+    """
+    import os
+    import hashlib
+    where = index_dir()
+    if where is None:
+        return
+    digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+    return os.path.join(where, '%s-%s.npz' % (os.path.basename(path), digest[:16]))
+
+def get_index(path):
+    """
+    Get the tree index for a CONLL file, from memory or disk if it is up to
+    date, or by building (and saving) it
+
+    :returns: :class:`TreeIndex`, or `None` if `path` isn't a file
+    """
+    import os
+    from collections import OrderedDict
+    global INDEX_CACHE
+    if not path or not os.path.isfile(path):
+        return
+    if INDEX_CACHE is None:
+        INDEX_CACHE = OrderedDict()
+    mtime = os.path.getmtime(path)
+    key = (os.path.abspath(path), mtime)
+    index = INDEX_CACHE.pop(key, None)
+    if index is None:
+        saved = index_path(path)
+        index = TreeIndex.load(saved, mtime) if saved and os.path.isfile(saved) else None
+        if index is None:
+            index = TreeIndex.from_file(path)
+            if saved:
+                try:
+                    index.save(saved, mtime)
+                except (IOError, OSError):
+                    pass
+    INDEX_CACHE[key] = index
+    while len(INDEX_CACHE) > INDEX_CACHE_SIZE:
+        INDEX_CACHE.popitem(last=False)
+    return index
@@ -0,0 +1,201 @@
+"""
+corpkit: a long-running Tregex process, so that searching many small
+batches of trees doesn't mean starting Java every time
+
+The Java side is TregexServer.java, compiled when corpkit is installed, or
+by ``make tregexserver`` in a source checkout. Threads searching at once
+each get a server of their own, up to `MAX_SERVERS`. When Java or the
+compiled class is missing, or anything goes wrong, callers get `None` back
+and use the one-shot `tregex.sh` instead.
+"""
+
+from __future__ import print_function
+import threading
+
+# options TregexServer.java knows how to handle
+SERVER_OPTIONS = {'-o', '-t', '-u', '-s', '-w', '-n', '-C', '-f', '-spans'}
+
+# heap size for the server process
+SERVER_MEMORY = '250m'
+
+class TregexServer(object):
+    """
+    A Java process running many Tregex searches, speaking the line protocol
+    described in TregexServer.java
+
+    :param memory: Java heap size, i.e. ``'250m'``
+    :type memory: `str`
+    """
+
+    def __init__(self, memory=SERVER_MEMORY):
+        import os
+        import threading
+        self.memory = memory
+        self.here = os.path.dirname(os.path.abspath(__file__))
+        self.jar = os.path.join(self.here, 'stanford-tregex.jar')
+        self.process = None
+        self.pid = None
+        self.lock = threading.Lock()
+
+    def class_dir(self):
+        """
+        Find TregexServer.class, compiled when corpkit is installed, or
+        with ``make tregexserver``
+
+        :returns: directory holding the class
+        """
+        import os
+        source = os.path.join(self.here, 'TregexServer.java')
+        compiled = os.path.join(self.here, 'TregexServer.class')
+        if not os.path.isfile(compiled):
+            raise IOError('TregexServer.class not found: run `make tregexserver`.')
+        if os.path.isfile(source) and os.path.getmtime(compiled) < os.path.getmtime(source):
+            raise IOError('TregexServer.class is out of date: run `make tregexserver`.')
+        return self.here
+
+    def start(self):
+        """
+        Start the Java process, if it isn't running in this process already
+        """
+        import os
+        from subprocess import Popen, PIPE
+        if self.process is not None and self.pid == os.getpid() and self.process.poll() is None:
+            return self
+        classes = self.class_dir()
+        with open(os.devnull, 'w') as devnull:
+            self.process = Popen(['java', '-mx%s' % self.memory, '-cp',
+                                  os.pathsep.join([self.jar, classes]), 'TregexServer'],
+                                 stdin=PIPE, stdout=PIPE, stderr=devnull)
+        self.pid = os.getpid()
+        if self.process.stdout.readline().strip() != b'READY':
+            self.close()
+            raise IOError('TregexServer did not start.')
+        return self
+
+    def search(self, trees, queries, paths=False):
+        """
+        Run several patterns over the same trees
+
+        :param trees: Bracketed trees, one per line, or with `paths`, a list
+                      of files and directories to read trees from
+        :type trees: `str`/`list`
+
+        :param queries: ``(pattern, options)`` pairs
+        :type queries: `list`
+
+        :returns: a list of output lines for each pattern, or `None` for
+                  a pattern the server could not run
+        """
+        import os
+        if paths:
+            lines = [os.path.abspath(p) for p in trees]
+        else:
+            lines = trees.splitlines()
+        request = ['%s %d %d' % ('FILES' if paths else 'BATCH', len(queries), len(lines))]
+        for pattern, options in queries:
+            request.append('%s\t%s' % (' '.join(options), pattern))
+        request.extend(lines)
+        data = ('\n'.join(request) + '\n').encode('utf-8', errors='ignore')
+        with self.lock:
+            self.start()
+            try:
+                self.process.stdin.write(data)
+                self.process.stdin.flush()
+                out = []
+                for _ in queries:
+                    header = self.process.stdout.readline().decode('utf-8').rstrip('\n')
+                    if header.startswith('RESULT '):
+                        num = int(header.split(' ', 1)[1])
+                        out.append([self.process.stdout.readline().decode('utf-8').rstrip('\n')
+                                    for _ in range(num)])
+                    elif header.startswith('ERROR'):
+                        out.append(None)
+                    else:
+                        raise IOError('Bad reply from TregexServer: %s' % header)
+                if self.process.stdout.readline().strip() != b'DONE':
+                    raise IOError('Bad reply from TregexServer.')
+            except (IOError, OSError, ValueError):
+                # can't tell where the stream is up to any more
+                self.close()
+                raise
+        return out
+
+    def close(self):
+        """
+        Stop the Java process
+        """
+        import os
+        if self.process is not None and self.pid == os.getpid():
+            try:
+                self.process.stdin.close()
+                self.process.terminate()
+                self.process.wait()
+            except (IOError, OSError):
+                pass
+        self.process = None
+
+# most Java processes kept for searches running at once on threads
+MAX_SERVERS = 4
+
+SERVERS = []
+IDLE = []
+SERVER_BROKEN = False
+SERVER_FREED = threading.Condition()
+
+def get_server():
+    """
+    Take one of this process' servers that isn't busy, starting another if
+    fewer than `MAX_SERVERS` are running, or else waiting for one to be
+    given back with :func:`put_server`
+
+    :returns: :class:`TregexServer`, or `None` if servers can't be used
+    """
+    import atexit
+    with SERVER_FREED:
+        while not SERVER_BROKEN:
+            if IDLE:
+                return IDLE.pop()
+            if len(SERVERS) < MAX_SERVERS:
+                server = TregexServer()
+                SERVERS.append(server)
+                atexit.register(server.close)
+                return server
+            SERVER_FREED.wait()
+
+def put_server(server):
+    """
+    Give back a server taken with :func:`get_server`
+    """
+    with SERVER_FREED:
+        IDLE.append(server)
+        SERVER_FREED.notify()
+
+def batch_search(trees, queries, paths=False):
+    """
+    Search trees with several ``(pattern, options)`` queries using the
+    server. Options must already be complete, as they would be passed to
+    `tregex.sh`.
+
+    :param trees: Bracketed trees, or with `paths`, files and directories
+                  to read them from
+
+    :returns: a list of output lines (or `None`) for each query, or `None`
+              if the server can't be used, in which case the caller should
+              run the one-shot command
+    """
+    global SERVER_BROKEN
+    if not queries or any(not set(opts) <= SERVER_OPTIONS for _, opts in queries):
+        return
+    server = get_server()
+    if server is None:
+        return
+    try:
+        return server.search(trees, queries, paths=paths)
+    except (IOError, OSError, ValueError):
+        # no java or compiled class, or a bad jar: don't try again in this process
+        with SERVER_FREED:
+            SERVER_BROKEN = True
+            SERVER_FREED.notify_all()
+        return
+    finally:
+        put_server(server)
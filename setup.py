@@ -1,6 +1,7 @@
 import setuptools
 from setuptools import setup, find_packages
 from setuptools.command.install import install
+from setuptools.command.build_py import build_py
 import os
 from os.path import isfile, isdir, join, dirname
 
@@ -36,6 +37,23 @@ class CustomInstallCommand(install):
 
         nltk.data.path.append(nltkpath)
 
+class BuildTregexServer(build_py):
+    """
+    Customized build command, which also compiles the Java side of
+    the Tregex server if there is a Java compiler
+    """
+    def run(self):
+        import subprocess
+        build_py.run(self)
+        if self.dry_run:
+            return
+        try:
+            subprocess.check_call(['javac', '-cp', join('corpkit', 'stanford-tregex.jar'),
+                                   '-d', join(self.build_lib, 'corpkit'),
+                                   join('corpkit', 'TregexServer.java')])
+        except (OSError, subprocess.CalledProcessError):
+            print('Could not compile TregexServer.java, so Tregex will be started for every search.')
+
 setup(name='corpkit',
       version='2.3.8',
       description='A toolkit for working with linguistic corpora',
@@ -45,12 +63,13 @@ setup(name='corpkit',
       scripts=['corpkit/new_project', 'corpkit/parse',
                'corpkit/corpkit', 'corpkit/corpkit.1'],
       package_dir={'corpkit': 'corpkit'},
-      package_data={'corpkit': ['*.jar', 'corpkit/*.jar', '*.sh', 'corpkit/*.sh', 
+      package_data={'corpkit': ['*.jar', 'corpkit/*.jar', '*.sh', 'corpkit/*.sh', '*.java', '*.class',
                                 '*.ipynb', 'corpkit/*.ipynb', '*.p', 'dictionaries/*.p',
                                 '*.py', 'dictionaries/*.py']},
       author_email='mcdonaldd@unimelb.edu.au',
       license='MIT',
-      cmdclass={'install': CustomInstallCommand,},
+      cmdclass={'install': CustomInstallCommand,
+                'build_py': BuildTregexServer},
       keywords=['corpus', 'linguistics', 'nlp'],
       install_requires=["matplotlib>=1.4.3",
                         "nltk>=3.0.0",